@@ -14,11 +14,37 @@ Related (and dependent) packages:
 
 """
 
-from ocrd.processor.base import run_processor, run_cli, Processor
-from ocrd_models import OcrdMets, OcrdExif, OcrdFile, OcrdAgent
-from ocrd.resolver import Resolver
-from ocrd_validators import *
-from ocrd.workspace import Workspace
-from ocrd.workspace_backup import WorkspaceBackupManager
-from ocrd.resource_manager import OcrdResourceManager
-from ocrd.mets_server import OcrdMetsServer
+from ocrd_utils import lazy_attributes
+
+# Attributes are only imported on first access, so that
+# e.g. ``--help`` or ``--dump-json`` of a processor CLI does not need
+# to load numpy, OpenCV, the PAGE model or the network stack.
+_LAZY_ATTRIBUTES = {
+    'run_processor': 'ocrd.processor.base',
+    'run_cli': 'ocrd.processor.base',
+    'Processor': 'ocrd.processor.base',
+    'OcrdMets': 'ocrd_models',
+    'OcrdExif': 'ocrd_models',
+    'OcrdFile': 'ocrd_models',
+    'OcrdAgent': 'ocrd_models',
+    'Resolver': 'ocrd.resolver',
+    'ParameterValidator': 'ocrd_validators',
+    'WorkspaceValidator': 'ocrd_validators',
+    'PageValidator': 'ocrd_validators',
+    'OcrdToolValidator': 'ocrd_validators',
+    'OcrdResourceListValidator': 'ocrd_validators',
+    'OcrdZipValidator': 'ocrd_validators',
+    'XsdValidator': 'ocrd_validators',
+    'XsdMetsValidator': 'ocrd_validators',
+    'XsdPageValidator': 'ocrd_validators',
+    'ProcessingServerConfigValidator': 'ocrd_validators',
+    'OcrdNetworkMessageValidator': 'ocrd_validators',
+    'Workspace': 'ocrd.workspace',
+    'WorkspaceBackupManager': 'ocrd.workspace_backup',
+    'OcrdResourceManager': 'ocrd.resource_manager',
+    'OcrdMetsServer': 'ocrd.mets_server',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
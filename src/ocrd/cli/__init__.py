@@ -25,6 +25,10 @@ Variables:
 \b
 {config.describe('XDG_CONFIG_HOME')}
 \b
+{config.describe('XDG_CACHE_HOME')}
+\b
+{config.describe('OCRD_TOOL_JSON_CACHE')}
+\b
 {config.describe('XDG_DATA_HOME')}
 \b
 {config.describe('OCRD_DOWNLOAD_RETRIES')}
@@ -35,6 +39,20 @@ Variables:
 \b
 {config.describe('OCRD_MAX_PROCESSOR_CACHE')}
 \b
+{config.describe('OCRD_MAX_PROCESSOR_CACHE_RSS')}
+\b
+{config.describe('OCRD_MAX_IMAGE_CACHE')}
+\b
+{config.describe('OCRD_MAX_DERIVATION_CACHE')}
+\b
+{config.describe('OCRD_MAX_PYRAMID_CACHE')}
+\b
+{config.describe('OCRD_LAZY_IMAGE_SIZE')}
+\b
+{config.describe('OCRD_IMAGE_SAVE_OPTIONS')}
+\b
+{config.describe('OCRD_IMAGE_SAVE_THREADS')}
+\b
 {config.describe('OCRD_NETWORK_CLIENT_POLLING_SLEEP')}
 \b
 {config.describe('OCRD_NETWORK_CLIENT_POLLING_TIMEOUT')}
@@ -47,8 +65,12 @@ Variables:
 \b
 {config.describe('OCRD_NETWORK_RABBITMQ_CLIENT_CONNECT_ATTEMPTS')}
 \b
+{config.describe('OCRD_NETWORK_WORKER_PREFORK')}
+\b
 {config.describe('OCRD_PROFILE_FILE')}
 \b
+{config.describe('OCRD_PROFILE_PAGE_FILE')}
+\b
 {config.describe('OCRD_PROFILE', wrap_text=False)}
 \b
 {config.describe('OCRD_NETWORK_SOCKETS_ROOT_DIR')}
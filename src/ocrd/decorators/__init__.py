@@ -10,10 +10,8 @@ from ocrd_utils import (
     set_json_key_value_overrides,
     parse_json_string_or_file,
 )
-from ocrd_validators import WorkspaceValidator
-from ocrd_network import ProcessingWorker, ProcessorServer, AgentType
+from ocrd_network import AgentType
 
-from ..resolver import Resolver
 from ..processor.base import ResourceNotFoundError, run_processor
 
 from .loglevel_option import ocrd_loglevel
@@ -77,11 +75,15 @@ def ocrd_cli_wrap_processor(
     if 'parameter' in kwargs:
         # Disambiguate parameter file/literal, and resolve file
         # (but avoid entering processing context of constructor)
-        class DisposableSubclass(processorClass):
-            def show_version(self):
-                pass
-        disposable = DisposableSubclass(None, show_version=True)
+        # (only instantiate if a preset actually needs to be resolved)
+        disposable = None
         def resolve(name):
+            nonlocal disposable
+            if disposable is None:
+                class DisposableSubclass(processorClass):
+                    def show_version(self):
+                        pass
+                disposable = DisposableSubclass(None, show_version=True)
             try:
                 return disposable.resolve_resource(name)
             except ResourceNotFoundError:
@@ -99,6 +101,8 @@ def ocrd_cli_wrap_processor(
     #     raise ValueError('-I/--input-file-grp is required')
     # if not kwargs['output_file_grp']:
     #     raise ValueError('-O/--output-file-grp is required')
+    # only needed for actual processing
+    from ..resolver import Resolver
     resolver = Resolver()
     working_dir, mets, _, mets_server_url = \
             resolver.resolve_mets_arguments(working_dir, mets, None, mets_server_url)
@@ -123,6 +127,7 @@ def ocrd_cli_wrap_processor(
     # XXX While https://github.com/OCR-D/core/issues/505 is open, set 'overwrite_mode' globally on the workspace
     if overwrite:
         workspace.overwrite_mode = True
+    from ocrd_validators import WorkspaceValidator
     report = WorkspaceValidator.check_file_grp(workspace, kwargs['input_file_grp'], '' if overwrite else kwargs['output_file_grp'], page_id)
     if not report.is_valid:
         raise Exception("Invalid input/output file grps:\n\t%s" % '\n\t'.join(report.errors))
@@ -172,6 +177,8 @@ def check_and_run_network_agent(ProcessorClass, subcommand: str, address: str, d
         if not queue:
             raise ValueError(f"Option '--queue' required for subcommand {subcommand}")
 
+    # only load the network stack when actually running as network agent
+    from ocrd_network import ProcessingWorker, ProcessorServer
     processor = ProcessorClass(workspace=None)
     if subcommand == AgentType.PROCESSING_WORKER:
         processing_worker = ProcessingWorker(
@@ -181,10 +188,14 @@ def check_and_run_network_agent(ProcessorClass, subcommand: str, address: str, d
             ocrd_tool=processor.ocrd_tool,
             processor_class=ProcessorClass,
         )
-        # The RMQConsumer is initialized and a connection to the RabbitMQ is performed
-        processing_worker.connect_consumer()
-        # Start consuming from the queue with name `processor_name`
-        processing_worker.start_consuming()
+        if config.OCRD_NETWORK_WORKER_PREFORK > 1:
+            # Load the processor once, then fork consumers sharing its memory
+            processing_worker.start_forked_consuming(config.OCRD_NETWORK_WORKER_PREFORK)
+        else:
+            # The RMQConsumer is initialized and a connection to the RabbitMQ is performed
+            processing_worker.connect_consumer()
+            # Start consuming from the queue with name `processor_name`
+            processing_worker.start_consuming()
     elif subcommand == AgentType.PROCESSOR_SERVER:
         # TODO: Better validate that inside the ProcessorServer itself
         host, port = address.split(':')
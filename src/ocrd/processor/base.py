@@ -18,7 +18,7 @@ from pathlib import Path
 import sys
 import tarfile
 import io
-from ocrd.workspace import Workspace
+from typing import TYPE_CHECKING
 
 from ocrd_utils import (
     VERSION as OCRD_VERSION,
@@ -32,8 +32,9 @@ from ocrd_utils import (
     get_processor_resource_types,
     resource_filename,
 )
-from ocrd_validators import ParameterValidator
-from ocrd_models.ocrd_page import MetadataItemType, LabelType, LabelsType
+
+if TYPE_CHECKING:
+    from ocrd.workspace import Workspace
 
 # XXX imports must remain for backwards-compatibility
 from .helpers import run_cli, run_processor, generate_processor_help # pylint: disable=unused-import
@@ -63,7 +64,7 @@ class Processor():
 
     def __init__(
             self,
-            workspace : Workspace,
+            workspace : 'Workspace',
             ocrd_tool=None,
             parameter=None,
             input_file_grp=None,
@@ -162,7 +163,9 @@ class Processor():
         self.page_id = None if page_id == [] or page_id is None else page_id
         if parameter is None:
             parameter = {}
-        parameterValidator = ParameterValidator(ocrd_tool)
+        # (deferred import: not needed for --help, --dump-json etc.)
+        from ocrd_validators import get_parameter_validator
+        parameterValidator = get_parameter_validator(ocrd_tool)
         report = parameterValidator.validate(parameter)
         if not report.is_valid:
             raise Exception("Invalid parameters %s" % report.errors)
@@ -192,12 +195,36 @@ class Processor():
         """
         raise NotImplementedError()
 
+    def setup(self) -> None:
+        """
+        Prepare the processor for actual data processing,
+        prior to the first call of :py:meth:`process`.
+
+        This is the place to load models and other expensive resources
+        (which only depend on :py:attr:`parameter`), so they can be reused
+        for many workspaces when the instance is cached.
+
+        (Override this in subclasses if needed. The default does nothing.)
+        """
+        pass
+
+    def shutdown(self) -> None:
+        """
+        Release resources acquired in :py:meth:`setup`,
+        after the last call of :py:meth:`process`.
+
+        (Override this in subclasses if needed. The default does nothing.)
+        """
+        pass
+
 
     def add_metadata(self, pcgts):
         """
         Add PAGE-XML :py:class:`~ocrd_models.ocrd_page.MetadataItemType` ``MetadataItem`` describing
         the processing step and runtime parameters to :py:class:`~ocrd_models.ocrd_page.PcGtsType` ``pcgts``.
         """
+        # the PAGE model is only loaded when needed
+        from ocrd_models.ocrd_page import MetadataItemType, LabelType, LabelsType
         pcgts.get_Metadata().add_MetadataItem(
                 MetadataItemType(type_="processingStep",
                     name=self.ocrd_tool['steps'][0],
@@ -2,16 +2,22 @@
 Helper methods for running and documenting processors
 """
 from os import chdir, getcwd
+from math import ceil
+from pathlib import Path
 from time import perf_counter, process_time
-from functools import lru_cache
+from collections import OrderedDict, namedtuple
+from threading import RLock
+import gc
 import json
 import inspect
 from subprocess import run
-from typing import List
+from typing import List, TYPE_CHECKING
 
 from click import wrap_text
-from ocrd.workspace import Workspace
-from ocrd_utils import freeze_args, getLogger, config, setOverrideLogLevel, getLevelName, sparkline
+from ocrd_utils import getLogger, config, setOverrideLogLevel, getLevelName, sparkline
+
+if TYPE_CHECKING:
+    from ocrd.workspace import Workspace
 
 
 __all__ = [
@@ -61,8 +67,12 @@ def run_processor(
     - :py:attr:`output_file_grp`
     - :py:attr:`parameter` (after applying any :py:attr:`parameter_override` settings)
 
-    Warning: Avoid setting the `instance_caching` flag to True. It may have unexpected side effects.
-    This flag is used for an experimental feature we would like to adopt in future.
+    If :py:attr:`instance_caching` is true, then instead of instantiating anew, check out
+    a processor instance (with the same class and parameters) from the process-wide
+    :py:data:`processor_pool`, and return it there after processing (keeping it warm
+    for the next call, but possibly evicting others). Otherwise, call
+    :py:meth:`~ocrd.Processor.setup` before and :py:meth:`~ocrd.Processor.shutdown`
+    after processing.
 
     Run the processor on the workspace (creating output files in the filesystem).
 
@@ -93,73 +103,196 @@ def run_processor(
         output_file_grp=output_file_grp,
         instance_caching=instance_caching
     )
-    processor.workspace = workspace
-    chdir(processor.workspace.directory)
-
-    ocrd_tool = processor.ocrd_tool
-    name = '%s v%s' % (ocrd_tool['executable'], processor.version)
-    otherrole = ocrd_tool['steps'][0]
-    logProfile = getLogger('ocrd.process.profile')
-    log.debug("Processor instance %s (%s doing %s)", processor, name, otherrole)
-    t0_wall = perf_counter()
-    t0_cpu = process_time()
-    if any(x in config.OCRD_PROFILE for x in ['RSS', 'PSS']):
-        backend = 'psutil_pss' if 'PSS' in config.OCRD_PROFILE else 'psutil'
-        from memory_profiler import memory_usage
-        try:
-            mem_usage = memory_usage(proc=processor.process,
-                                     # only run process once
-                                     max_iterations=1,
-                                     interval=.1, timeout=None, timestamps=True,
-                                     # include sub-processes
-                                     multiprocess=True, include_children=True,
-                                     # get proportional set size instead of RSS
-                                     backend=backend)
-        except Exception as err:
-            log.exception("Failure in processor '%s'" % ocrd_tool['executable'])
-            raise err
-        finally:
-            chdir(old_cwd)
-        mem_usage_values = [mem for mem, _ in mem_usage]
-        mem_output = 'memory consumption: '
-        mem_output += sparkline(mem_usage_values)
-        mem_output += ' max: %.2f MiB min: %.2f MiB' % (max(mem_usage_values), min(mem_usage_values))
-        logProfile.info(mem_output)
-    else:
-        try:
-            processor.process()
-        except Exception as err:
-            log.exception("Failure in processor '%s'" % ocrd_tool['executable'])
-            raise err
-        finally:
-            chdir(old_cwd)
-
-    t1_wall = perf_counter() - t0_wall
-    t1_cpu = process_time() - t0_cpu
-    logProfile.info("Executing processor '%s' took %fs (wall) %fs (CPU)( [--input-file-grp='%s' --output-file-grp='%s' --parameter='%s' --page-id='%s']" % (
-        ocrd_tool['executable'],
-        t1_wall,
-        t1_cpu,
-        processor.input_file_grp or '',
-        processor.output_file_grp or '',
-        json.dumps(processor.parameter) or '',
-        processor.page_id or ''
-    ))
-    workspace.mets.add_agent(
-        name=name,
-        _type='OTHER',
-        othertype='SOFTWARE',
-        role='OTHER',
-        otherrole=otherrole,
-        notes=[({'option': 'input-file-grp'}, processor.input_file_grp or ''),
-               ({'option': 'output-file-grp'}, processor.output_file_grp or ''),
-               ({'option': 'parameter'}, json.dumps(processor.parameter or '')),
-               ({'option': 'page-id'}, processor.page_id or '')]
-    )
-    workspace.save_mets()
+    try:
+        processor.workspace = workspace
+        chdir(processor.workspace.directory)
+
+        ocrd_tool = processor.ocrd_tool
+        name = '%s v%s' % (ocrd_tool['executable'], processor.version)
+        otherrole = ocrd_tool['steps'][0]
+        logProfile = getLogger('ocrd.process.profile')
+        log.debug("Processor instance %s (%s doing %s)", processor, name, otherrole)
+        t0_wall = perf_counter()
+        t0_cpu = process_time()
+        if 'PAGE' in config.OCRD_PROFILE:
+            try:
+                _process_per_page(processor, logProfile)
+            except Exception as err:
+                log.exception("Failure in processor '%s'" % ocrd_tool['executable'])
+                raise err
+            finally:
+                chdir(old_cwd)
+        elif any(x in config.OCRD_PROFILE for x in ['RSS', 'PSS']):
+            backend = 'psutil_pss' if 'PSS' in config.OCRD_PROFILE else 'psutil'
+            from memory_profiler import memory_usage
+            try:
+                mem_usage = memory_usage(proc=processor.process,
+                                         # only run process once
+                                         max_iterations=1,
+                                         interval=.1, timeout=None, timestamps=True,
+                                         # include sub-processes
+                                         multiprocess=True, include_children=True,
+                                         # get proportional set size instead of RSS
+                                         backend=backend)
+            except Exception as err:
+                log.exception("Failure in processor '%s'" % ocrd_tool['executable'])
+                raise err
+            finally:
+                chdir(old_cwd)
+            mem_usage_values = [mem for mem, _ in mem_usage]
+            mem_output = 'memory consumption: '
+            mem_output += sparkline(mem_usage_values)
+            mem_output += ' max: %.2f MiB min: %.2f MiB' % (max(mem_usage_values), min(mem_usage_values))
+            logProfile.info(mem_output)
+        else:
+            try:
+                processor.process()
+            except Exception as err:
+                log.exception("Failure in processor '%s'" % ocrd_tool['executable'])
+                raise err
+            finally:
+                chdir(old_cwd)
+
+        t1_wall = perf_counter() - t0_wall
+        t1_cpu = process_time() - t0_cpu
+        logProfile.info("Executing processor '%s' took %fs (wall) %fs (CPU)( [--input-file-grp='%s' --output-file-grp='%s' --parameter='%s' --page-id='%s']" % (
+            ocrd_tool['executable'],
+            t1_wall,
+            t1_cpu,
+            processor.input_file_grp or '',
+            processor.output_file_grp or '',
+            json.dumps(processor.parameter) or '',
+            processor.page_id or ''
+        ))
+        workspace.mets.add_agent(
+            name=name,
+            _type='OTHER',
+            othertype='SOFTWARE',
+            role='OTHER',
+            otherrole=otherrole,
+            notes=[({'option': 'input-file-grp'}, processor.input_file_grp or ''),
+                   ({'option': 'output-file-grp'}, processor.output_file_grp or ''),
+                   ({'option': 'parameter'}, json.dumps(processor.parameter or '')),
+                   ({'option': 'page-id'}, processor.page_id or '')]
+        )
+        workspace.save_mets()
+    finally:
+        if instance_caching:
+            release_cached_processor(processor)
+            log.debug("Processor cache: %s", processor_pool.cache_info())
+        else:
+            processor.shutdown()
     return processor
 
 
+def _page_ids_to_process(processor):
+    """
+    Physical page IDs with files in any input fileGrp (restricted to :py:attr:`page_id`).
+
+    Raise an exception if some input files have no page ID (as these
+    cannot be processed page by page).
+    """
+    page_ids = []
+    pageless = []
+    for ifg in (processor.input_file_grp or '').split(','):
+        if not ifg:
+            continue
+        for ocrd_file in processor.workspace.mets.find_files(fileGrp=ifg, pageId=processor.page_id):
+            if not ocrd_file.pageId:
+                pageless.append(ocrd_file.ID)
+            elif ocrd_file.pageId not in page_ids:
+                page_ids.append(ocrd_file.pageId)
+    if pageless:
+        raise ValueError("Cannot process input files without pageId per page (OCRD_PROFILE=PAGE): %s" % pageless)
+    return page_ids
+
+def _file_bytes(workspace, file_grps, page_id):
+    """Size of all local files for ``page_id`` in ``file_grps`` (comma-separated)."""
+    size = 0
+    for file_grp in (file_grps or '').split(','):
+        if not file_grp:
+            continue
+        for ocrd_file in workspace.mets.find_files(fileGrp=file_grp, pageId=page_id):
+            if ocrd_file.local_filename and Path(ocrd_file.local_filename).exists():
+                size += Path(ocrd_file.local_filename).stat().st_size
+    return size
+
+def _prometheus_label(value):
+    """Escape ``value`` for a label in the Prometheus text format."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _percentile(values, q):
+    """Nearest-rank percentile ``q`` (in 0..100) of ``values``."""
+    values = sorted(values)
+    return values[max(0, ceil(q / 100 * len(values)) - 1)]
+
+def _process_per_page(processor, logProfile):
+    """
+    Call :py:meth:`~ocrd.Processor.process` for each page separately,
+    measuring wall and CPU time, peak memory, input and output bytes, and number
+    of images decoded per page. Write each page's metrics as a JSON line to
+    ``OCRD_PROFILE_PAGE_FILE`` (or Prometheus text if that ends in ``.prom``,
+    or on the ``ocrd.process.profile`` logger if unset), and log a summary.
+    """
+    from memory_profiler import memory_usage
+    backend = 'psutil_pss' if 'PSS' in config.OCRD_PROFILE else 'psutil'
+    executable = processor.ocrd_tool['executable']
+    workspace = processor.workspace
+    page_id = processor.page_id
+    metrics = []
+    try:
+        for page in _page_ids_to_process(processor):
+            processor.page_id = page
+            images_decoded = workspace.images_decoded
+            input_bytes = _file_bytes(workspace, processor.input_file_grp, page)
+            t0_wall = perf_counter()
+            t0_cpu = process_time()
+            peak_mem = memory_usage(proc=processor.process, max_iterations=1, max_usage=True,
+                                    interval=.1, timeout=None, multiprocess=True,
+                                    include_children=True, backend=backend)
+            metrics.append({
+                'processor': executable,
+                'page_id': page,
+                'wall': perf_counter() - t0_wall,
+                'cpu': process_time() - t0_cpu,
+                'peak_mem': peak_mem,
+                'input_bytes': input_bytes,
+                'output_bytes': _file_bytes(workspace, processor.output_file_grp, page),
+                'images_decoded': workspace.images_decoded - images_decoded,
+            })
+            if not config.OCRD_PROFILE_PAGE_FILE:
+                logProfile.info(json.dumps(metrics[-1]))
+            elif not config.OCRD_PROFILE_PAGE_FILE.endswith('.prom'):
+                with open(config.OCRD_PROFILE_PAGE_FILE, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(metrics[-1]) + '\n')
+    finally:
+        processor.page_id = page_id
+        # report the pages completed so far even if a page failed
+        if config.OCRD_PROFILE_PAGE_FILE.endswith('.prom'):
+            with open(config.OCRD_PROFILE_PAGE_FILE, 'w', encoding='utf-8') as f:
+                for key, unit in PAGE_METRICS.items():
+                    f.write('# TYPE ocrd_page_%s%s gauge\n' % (key, unit))
+                    for page_metrics in metrics:
+                        f.write('ocrd_page_%s%s{processor="%s",page_id="%s"} %s\n' % (
+                            key, unit, _prometheus_label(executable),
+                            _prometheus_label(page_metrics['page_id']), page_metrics[key]))
+        if metrics:
+            logProfile.info("Per-page metrics of processor '%s' for %d pages: %s", executable, len(metrics), ', '.join(
+                '%s p50=%g p95=%g max=%g (%s)' % (key, _percentile(values, 50), _percentile(values, 95), max(values),
+                                                  max(metrics, key=lambda m: m[key])['page_id'])
+                for key, values in ((key, [m[key] for m in metrics]) for key in PAGE_METRICS)))
+
+# per-page metrics and their units (as Prometheus metric name suffix)
+PAGE_METRICS = {
+    'wall': '_seconds',
+    'cpu': '_seconds',
+    'peak_mem': '_mebibytes',
+    'input_bytes': '',
+    'output_bytes': '',
+    'images_decoded': '',
+}
+
+
 def run_cli(
         executable,
         mets_url=None,
@@ -358,13 +491,129 @@ Options:
         pass
 
 
-# Taken from https://github.com/OCR-D/core/pull/884
-@freeze_args
-@lru_cache(maxsize=config.OCRD_MAX_PROCESSOR_CACHE)
+class ProcessorPool():
+    """
+    Pool of processor instances (including their loaded models),
+    keyed by processor class and runtime parameters.
+
+    Instances are checked out exclusively (so workspace, page_id and
+    fileGrps can be set on them without affecting concurrent jobs),
+    and must be checked in again after processing. Idle instances
+    are kept (warm) for the next job with the same class and parameters,
+    until the number of instances exceeds ``maxsize`` (cf. ``OCRD_MAX_PROCESSOR_CACHE``)
+    or the resident set size of the process exceeds ``max_rss`` MiB
+    (cf. ``OCRD_MAX_PROCESSOR_CACHE_RSS``) – then the least recently
+    used idle instances get shut down and evicted.
+    """
+
+    def __init__(self, maxsize=None, max_rss=None):
+        self.maxsize = maxsize
+        self.max_rss = max_rss
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # key -> idle instances, in order of recency (least recently used first)
+        self._idle = OrderedDict()
+        # id(instance) -> key, for all instances checked out
+        self._busy = {}
+        self._lock = RLock()
+        self.log = getLogger('ocrd.processor.helpers.ProcessorPool')
+
+    @staticmethod
+    def _key(processor_class, parameter):
+        return processor_class, json.dumps(dict(parameter) if parameter else {}, sort_keys=True)
+
+    def checkout(self, processor_class, parameter: dict = None):
+        """
+        Get an instance of ``processor_class`` for ``parameter`` for exclusive use,
+        either from the idle instances or newly instantiated (and set up).
+        """
+        key = self._key(processor_class, parameter)
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                processor = idle.pop()
+                if not idle:
+                    del self._idle[key]
+                self.hits += 1
+                self._busy[id(processor)] = key
+                return processor
+            self.misses += 1
+        self.log.debug("Instantiating %s for parameters %s", processor_class.__name__, key[1])
+        processor = processor_class(workspace=None, parameter=dict(parameter) if parameter else None)
+        processor.setup()
+        with self._lock:
+            self._busy[id(processor)] = key
+        return processor
+
+    def checkin(self, processor):
+        """
+        Return a checked out ``processor`` instance to the pool of idle instances,
+        then evict instances as needed to honour the size and memory limits.
+        """
+        with self._lock:
+            key = self._busy.pop(id(processor), None)
+            if key is None:
+                raise ValueError("Processor instance %s was not checked out from this pool" % processor)
+            processor.workspace = None
+            self._idle.setdefault(key, []).append(processor)
+            self._idle.move_to_end(key)
+            self._evict()
+
+    def _evict(self):
+        maxsize = config.OCRD_MAX_PROCESSOR_CACHE if self.maxsize is None else self.maxsize
+        while self._idle and self.currsize > maxsize:
+            self._evict_one()
+        max_rss = config.OCRD_MAX_PROCESSOR_CACHE_RSS if self.max_rss is None else self.max_rss
+        if max_rss > 0:
+            from psutil import Process
+            proc = Process()
+            while self._idle and proc.memory_info().rss > max_rss * 1024 ** 2:
+                self._evict_one()
+                gc.collect()
+
+    def _evict_one(self):
+        key = next(iter(self._idle))
+        idle = self._idle[key]
+        processor = idle.pop(0)
+        if not idle:
+            del self._idle[key]
+        self.evictions += 1
+        self.log.debug("Evicting %s for parameters %s", key[0].__name__, key[1])
+        try:
+            processor.shutdown()
+        except Exception as err:
+            self.log.exception("Failed to shut down evicted processor %s: %s", processor, err)
+
+    @property
+    def currsize(self):
+        """Number of instances in the pool (idle or checked out)."""
+        return sum(map(len, self._idle.values())) + len(self._busy)
+
+    def cache_info(self):
+        """Statistics on the pool's hits, misses, evictions and current size."""
+        with self._lock:
+            return ProcessorPoolInfo(self.hits, self.misses, self.evictions,
+                                     self.currsize, len(self._busy))
+
+    def clear(self):
+        """Shut down and remove all idle instances, and reset statistics."""
+        with self._lock:
+            while self._idle:
+                self._evict_one()
+            self.hits = self.misses = self.evictions = 0
+
+ProcessorPoolInfo = namedtuple('ProcessorPoolInfo', ['hits', 'misses', 'evictions', 'currsize', 'busy'])
+
+processor_pool = ProcessorPool()
+
 def get_cached_processor(parameter: dict, processor_class):
     """
     Call this function to get back an instance of a processor.
-    The results are cached based on the parameters.
+    The results are cached based on the parameters (and class).
+
+    The instance is checked out from :py:data:`processor_pool` for exclusive use
+    and must be returned with :py:func:`release_cached_processor` after processing.
     Args:
         parameter (dict): a dictionary of parameters.
         processor_class: the concrete `:py:class:~ocrd.Processor` class.
@@ -373,15 +622,21 @@ def get_cached_processor(parameter: dict, processor_class):
         Otherwise, an instance of the `:py:class:~ocrd.Processor` is returned.
     """
     if processor_class:
-        dict_params = dict(parameter) if parameter else None
-        return processor_class(workspace=None, parameter=dict_params)
+        return processor_pool.checkout(processor_class, parameter)
     return None
 
+def release_cached_processor(processor):
+    """
+    Return an instance obtained via :py:func:`get_cached_processor`
+    to the cache, so it can be reused (or evicted).
+    """
+    processor_pool.checkin(processor)
+
 
 def get_processor(
         processor_class,
         parameter: dict,
-        workspace: Workspace = None,
+        workspace: 'Workspace' = None,
         page_id: str = None,
         input_file_grp: List[str] = None,
         output_file_grp: List[str] = None,
@@ -398,11 +653,13 @@ def get_processor(
             cached_processor.input_file_grp = input_file_grp
             cached_processor.output_file_grp = output_file_grp
             return cached_processor
-        return processor_class(
+        processor = processor_class(
             workspace=workspace,
             page_id=page_id,
             input_file_grp=input_file_grp,
             output_file_grp=output_file_grp,
             parameter=parameter
         )
+        processor.setup()
+        return processor
     raise ValueError("Processor class is not known")
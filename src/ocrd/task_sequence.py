@@ -6,7 +6,7 @@ from ocrd_utils import getLogger, parse_json_string_or_file, set_json_key_value_
 # from collections import Counter
 from ocrd.processor.base import run_cli
 from ocrd.resolver import Resolver
-from ocrd_validators import ParameterValidator, WorkspaceValidator
+from ocrd_validators import get_parameter_validator, WorkspaceValidator
 from ocrd_models import ValidationReport
 
 class ProcessorTask():
@@ -67,7 +67,7 @@ class ProcessorTask():
         # for i, grp in enumerate(self.input_file_grps):
             # actual_input_grps[i] = grp
         # self.input_file_grps = actual_input_grps
-        param_validator = ParameterValidator(self.ocrd_tool_json)
+        param_validator = get_parameter_validator(self.ocrd_tool_json)
         report = param_validator.validate(self.parameters)
         if not report.is_valid:
             raise Exception(report.errors)
@@ -1,34 +1,41 @@
-import io
+from hashlib import sha1
 from os import makedirs, unlink, listdir, path
 from pathlib import Path
 from shutil import move, copyfileobj
 from re import sub
 from tempfile import NamedTemporaryFile
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from contextlib import contextmanager
-from typing import Optional, Union
+from threading import Lock
+import weakref
+from typing import Optional, Union, TYPE_CHECKING
 
-from cv2 import COLOR_GRAY2BGR, COLOR_RGB2BGR, cvtColor
 from PIL import Image
 import numpy as np
 from deprecated.sphinx import deprecated
-import requests
 
 from ocrd_models import OcrdMets, OcrdFile
 from ocrd_models.ocrd_file import ClientSideOcrdFile
-from ocrd_models.ocrd_page import parse, BorderType, to_xml
+from ocrd_models.ocrd_page import parse, BorderType, PageType, to_xml
 from ocrd_modelfactory import exif_from_filename, page_from_file
 from ocrd_utils import (
     atomic_write,
+    config,
     getLogger,
     image_from_polygon,
     coordinates_of_segment,
     adjust_canvas_to_rotation,
     adjust_canvas_to_transposition,
+    array_from_polygon,
     shift_coordinates,
     rotate_coordinates,
+    scale_coordinates,
     transform_coordinates,
     transpose_coordinates,
     crop_image,
+    decode_region,
+    region_decodable,
     rotate_image,
     transpose_image,
     bbox_from_polygon,
@@ -45,18 +52,188 @@ from ocrd_utils import (
 )
 
 from .workspace_backup import WorkspaceBackupManager
-from .mets_server import ClientSideOcrdMets
+if TYPE_CHECKING:
+    from .mets_server import ClientSideOcrdMets
 
 __all__ = ['Workspace']
 
+# keyword arguments to PIL.Image.save for each format in Workspace.save_image_file
+# (besides OCRD_IMAGE_SAVE_OPTIONS); OCR-D images must be encoded losslessly
+DEFAULT_IMAGE_SAVE_OPTIONS = {
+    'WEBP': {'lossless': True},
+}
+
 @contextmanager
 def download_temporary_file(url):
+    import requests
     with NamedTemporaryFile(prefix='ocrd-download-') as f:
         with requests.get(url) as r:
             f.write(r.content)
         yield f
 
 
+class ImageCache():
+    """
+    Memory-bounded LRU cache of decoded (and re-quantized) images,
+    keyed by absolute path, modification time and size of the image file.
+
+    Images are returned as copies, so callers may modify them freely.
+
+    Args:
+        maxsize (int): Maximum memory consumption of all cached images in MiB
+            (default: ``OCRD_MAX_IMAGE_CACHE``). If 0, nothing gets cached.
+    """
+
+    config_var = 'OCRD_MAX_IMAGE_CACHE'
+
+    def __init__(self, maxsize=None):
+        self._maxsize = maxsize
+        self.currsize = 0
+        self.hits = 0
+        self.misses = 0
+        self._images = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def maxsize(self):
+        """Maximum memory consumption in bytes (from :py:attr:`config_var` unless given explicitly)."""
+        maxsize = getattr(config, self.config_var) if self._maxsize is None else self._maxsize
+        return maxsize * 1024 ** 2
+
+    @staticmethod
+    def key(filename):
+        """Cache key for (the current state of) image file ``filename``."""
+        path = Path(filename).resolve()
+        path_stat = path.stat()
+        return str(path), path_stat.st_mtime_ns, path_stat.st_size
+
+    @staticmethod
+    def copy(image):
+        """Copy ``image`` including its ``filename`` and ``format`` attributes."""
+        image_copy = image.copy()
+        image_copy.format = image.format
+        image_copy.filename = getattr(image, 'filename', '')
+        return image_copy
+
+    @staticmethod
+    def nbytes(image):
+        """Approximate memory consumption of ``image`` in bytes."""
+        if isinstance(image, np.ndarray):
+            return image.nbytes
+        # PIL stores 1-bit and 8-bit pixels in 1 byte, 16-bit in 2 bytes,
+        # and everything else (including 2 or 3 bands) in 4 bytes
+        if image.mode in ('1', 'L', 'P'):
+            pixelsize = 1
+        elif image.mode.startswith('I;16'):
+            pixelsize = 2
+        else:
+            pixelsize = 4
+        return image.width * image.height * pixelsize
+
+    def get(self, key):
+        """Copy of the image cached under ``key``, or ``None``."""
+        with self._lock:
+            image = self._images.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self._images.move_to_end(key)
+            self.hits += 1
+        return self.copy(image)
+
+    def put(self, key, image):
+        """
+        Cache ``image`` under ``key``, evicting the least recently used images if necessary.
+
+        Return whether ``image`` is cached now (so callers must not modify it anymore).
+        """
+        size = self.nbytes(image)
+        if size > self.maxsize:
+            return False
+        with self._lock:
+            if key in self._images:
+                return self._images[key] is image
+            self._images[key] = image
+            self.currsize += size
+            while self.currsize > self.maxsize:
+                _, evicted = self._images.popitem(last=False)
+                self.currsize -= self.nbytes(evicted)
+            return key in self._images
+
+    def cache_info(self):
+        """Statistics on the cache's hits, misses and current size (in bytes)."""
+        with self._lock:
+            return ImageCacheInfo(self.hits, self.misses, self.maxsize, self.currsize, len(self._images))
+
+    def clear(self):
+        """Remove all cached images and reset statistics."""
+        with self._lock:
+            self._images.clear()
+            self.currsize = self.hits = self.misses = 0
+
+ImageCacheInfo = namedtuple('ImageCacheInfo', ['hits', 'misses', 'maxsize', 'currsize', 'images'])
+
+class DerivationCache(ImageCache):
+    """
+    Memory-bounded LRU cache of the images and coordinate transforms derived by
+    :py:meth:`Workspace.image_from_page` and :py:meth:`Workspace.image_from_segment`
+    (i.e. after cropping, masking, reflection and rotation), shared among
+    all workspaces (and thus processor steps) in the process.
+
+    Keys fingerprint everything a derivation depends on: the image files
+    (path, modification time and size), the segment (ID, coordinates,
+    orientation, AlternativeImages), the parent derivation (for segments),
+    and the arguments (fill, transparency, feature selector/filter, filename).
+
+    Images handed out are tracked as results of their derivation as long as they
+    are alive, so they can serve as parent key for nested segment extraction.
+    (Hence images passed as ``parent_image`` must not have been modified in-place.)
+
+    Args:
+        maxsize (int): Maximum memory consumption of all cached images in MiB
+            (default: ``OCRD_MAX_DERIVATION_CACHE``). If 0, nothing gets cached.
+    """
+
+    config_var = 'OCRD_MAX_DERIVATION_CACHE'
+
+    def __init__(self, maxsize=None):
+        super().__init__(maxsize)
+        # id(image) -> (weak reference to image, derivation key)
+        self._origins = {}
+
+    @staticmethod
+    def copy(entry):
+        """Copy the image and coordinates of a cache entry."""
+        image, coords = entry
+        return ImageCache.copy(image), {
+            name: value.copy() if isinstance(value, np.ndarray) else value
+            for name, value in coords.items()}
+
+    @staticmethod
+    def nbytes(entry):
+        return ImageCache.nbytes(entry[0])
+
+    def track(self, image, key):
+        """Remember ``image`` as the result of derivation ``key`` (while it is alive)."""
+        ident = id(image)
+        def forget(ref):
+            if self._origins.get(ident, (None,))[0] is ref:
+                self._origins.pop(ident, None)
+        self._origins[ident] = (weakref.ref(image, forget), key)
+
+    def origin(self, image):
+        """Derivation key of ``image`` if it was tracked, else ``None``."""
+        ref, key = self._origins.get(id(image), (None, None))
+        if ref is None or ref() is not image:
+            return None
+        return key
+
+    def clear(self):
+        super().clear()
+        self._origins.clear()
+
+derivation_cache = DerivationCache()
+
 class Workspace():
     """
     A workspace is a temporary directory set up for a processor. It's the
@@ -75,13 +252,18 @@ class Workspace():
             the filesystem directly.
         baseurl (string, None) : Base URL to prefix to relative URL.
         overwrite_mode (boolean, False) : Whether to force add operations on this workspace globally
+
+    Attributes:
+        image_save_options (dict) : keyword arguments to `PIL.Image.save` for each `PIL` format
+            in :py:meth:`save_image_file` (from ``OCRD_IMAGE_SAVE_OPTIONS``), e.g.
+            ``{'PNG': {'compress_level': 1}, 'TIFF': {'compression': 'tiff_lzw'}}``
     """
 
     def __init__(
         self,
         resolver,
         directory,
-        mets : Optional[Union[OcrdMets, ClientSideOcrdMets]] = None,
+        mets : Optional[Union[OcrdMets, 'ClientSideOcrdMets']] = None,
         mets_basename=DEFAULT_METS_BASENAME,
         automatic_backup=False,
         baseurl=None,
@@ -92,8 +274,20 @@ class Workspace():
         self.mets_target = str(Path(directory, mets_basename))
         self.overwrite_mode = False
         self.is_remote = bool(mets_server_url)
+        # number of images decoded by :py:meth:`_resolve_image_as_pil` (for profiling;
+        # including images kept undecoded for decoding regions, cf. OCRD_LAZY_IMAGE_SIZE)
+        self.images_decoded = 0
+        self.image_cache = ImageCache(config.OCRD_MAX_IMAGE_CACHE)
+        self.image_save_options = {name: dict(options) for name, options in DEFAULT_IMAGE_SAVE_OPTIONS.items()}
+        for name, options in config.OCRD_IMAGE_SAVE_OPTIONS.items():
+            self.image_save_options.setdefault(name.upper(), {}).update(options)
+        # images still being encoded in the background (cf. OCRD_IMAGE_SAVE_THREADS)
+        self._image_save_executor = None
+        self._image_save_futures = {}
         if mets is None:
             if self.is_remote:
+                # avoid loading the METS server stack unless needed
+                from .mets_server import ClientSideOcrdMets
                 mets = ClientSideOcrdMets(mets_server_url, self.directory)
                 if mets.workspace_path != self.directory:
                     raise ValueError(f"METS server {mets_server_url} workspace directory {mets.workspace_path} differs "
@@ -369,23 +563,23 @@ class Workspace():
             # change file paths in PAGE-XML imageFilename and filename attributes
             for page_file in self.mets.find_files(mimetype=MIMETYPE_PAGE, local_only=True):
                 log.debug("Renaming file references in PAGE-XML %s" % page_file)
-                pcgts = page_from_file(page_file)
+                pcgts = page_from_file(page_file, validate=False)
                 changed = False
                 for old_local_filename, new_local_filename in local_filename_replacements.items():
                     if pcgts.get_Page().imageFilename == old_local_filename:
                         changed = True
                         log.debug("Rename pc:Page/@imageFilename: %s -> %s" % (old_local_filename, new_local_filename))
-                        pcgts.get_Page().imageFilename = new_local_filename
+                        pcgts.get_Page().set_imageFilename(new_local_filename)
                 for ai in pcgts.get_Page().get_AllAlternativeImages():
                     for old_local_filename, new_local_filename in local_filename_replacements.items():
                         if ai.filename == old_local_filename:
                             changed = True
                             log.debug("Rename pc:Page/../AlternativeImage: %s -> %s" % (old_local_filename, new_local_filename))
-                            ai.filename = new_local_filename
+                            ai.set_filename(new_local_filename)
                 if changed:
                     log.debug("PAGE-XML changed, writing %s" % (page_file.local_filename))
                     with open(page_file.local_filename, 'w', encoding='utf-8') as f:
-                        f.write(to_xml(pcgts))
+                        f.write(to_xml(pcgts, incremental=True))
             # change the ``USE`` attribute of the fileGrp
             self.mets.rename_file_group(old, new)
             # Remove the old dir
@@ -450,6 +644,7 @@ class Workspace():
         Write out the current state of the METS file to the filesystem.
         """
         log = getLogger('ocrd.workspace.save_mets')
+        self.wait_image_files()
         if self.is_remote:
             self.mets.save()
         else:
@@ -472,6 +667,7 @@ class Workspace():
         if not image_url:
             # avoid "finding" just any file
             raise ValueError(f"'image_url' must be a non-empty string, not '{image_url}' ({type(image_url)})")
+        self.wait_image_files(image_url)
         try:
             f = next(self.mets.find_files(local_filename=str(image_url)))
             return exif_from_filename(f.local_filename)
@@ -504,18 +700,168 @@ class Workspace():
             # avoid "finding" just any file
             raise Exception("Cannot resolve empty image path")
         log = getLogger('ocrd.workspace._resolve_image_as_pil')
+        self.wait_image_files(image_url)
         with pushd_popd(self.directory):
             try:
                 f = next(self.mets.find_files(local_filename=str(image_url)))
-                pil_image = Image.open(f.local_filename)
+                pil_image = self._load_image_cached(f.local_filename, image_url)
             except StopIteration:
                 try:
                     f = next(self.mets.find_files(url=str(image_url)))
-                    pil_image = Image.open(self.download_file(f).local_filename)
+                    pil_image = self._load_image_cached(self.download_file(f).local_filename, image_url)
                 except StopIteration:
                     with download_temporary_file(image_url) as f:
-                        pil_image = Image.open(f.name)
-            pil_image.load() # alloc and give up the FD
+                        pil_image = self._load_image(f.name, image_url)
+
+        if coords is None:
+            return pil_image
+
+        # FIXME: remove or replace this by (image_from_polygon+) crop_image ...
+        log.debug("Converting PIL to OpenCV: %s", image_url)
+        from cv2 import COLOR_GRAY2BGR, COLOR_RGB2BGR, cvtColor
+        color_conversion = COLOR_GRAY2BGR if pil_image.mode in ('1', 'L') else  COLOR_RGB2BGR
+        pil_as_np_array = np.array(pil_image).astype('uint8') if pil_image.mode == '1' else np.array(pil_image)
+        cv2_image = cvtColor(pil_as_np_array, color_conversion)
+
+        poly = np.array(coords, np.int32)
+        log.debug("Cutting region %s from %s", coords, image_url)
+        region_cut = cv2_image[
+            np.min(poly[:, 1]):np.max(poly[:, 1]),
+            np.min(poly[:, 0]):np.max(poly[:, 0])
+        ]
+        return Image.fromarray(region_cut)
+
+    def _load_image_cached(self, filename, image_url):
+        """
+        Decode the image file ``filename`` (like :py:meth:`_load_image`),
+        or reuse the result of an earlier call from :py:attr:`image_cache`
+        if the file has not changed since.
+
+        Large images which allow decoding regions (cf. ``OCRD_LAZY_IMAGE_SIZE``)
+        are not decoded (or cached) here at all.
+        """
+        try:
+            key = self.image_cache.key(filename)
+        except OSError:
+            return self._load_image(filename, image_url)
+        pil_image = self.image_cache.get(key)
+        if pil_image is None:
+            pil_image = self._load_image(filename, image_url, lazy=True)
+            if getattr(pil_image, 'tile', None):
+                return pil_image
+            if self.image_cache.put(key, pil_image):
+                pil_image = ImageCache.copy(pil_image)
+        return pil_image
+
+    def _resolve_image_scaled(self, image_url, factor):
+        """
+        Resolve ``image_url`` like :py:meth:`_resolve_image_as_pil`, but resized by ``factor``.
+
+        When downscaling by a factor of 2 or more, start from the closest level of
+        the image pyramid (cf. :py:meth:`_load_pyramid_level`) instead of the full image.
+        """
+        level = 0
+        while factor * 2 ** (level + 1) <= 1:
+            level += 1
+        file_key = self._image_file_key(image_url) if level else None
+        if file_key is None:
+            pil_image = self._resolve_image_as_pil(image_url)
+            filename = getattr(pil_image, 'filename', '')
+            size = pil_image.size
+        else:
+            pil_image = self._load_pyramid_level(file_key, level, image_url)
+            filename = file_key[0]
+            with Image.open(filename) as full_image:
+                size = full_image.size
+        size = (int(size[0] * factor), int(size[1] * factor))
+        if pil_image.size != size:
+            # slowest, but highest quality:
+            pil_image = pil_image.resize(size, Image.BICUBIC)
+        pil_image.filename = filename
+        return pil_image
+
+    def _load_pyramid_level(self, file_key, level, image_url):
+        """
+        Decode the image file of ``file_key`` (cf. :py:meth:`_image_file_key`)
+        at a resolution reduced by ``2 ** level``, or reuse the result of an earlier
+        call from :py:attr:`image_cache` or from ``$XDG_CACHE_HOME/ocrd/pyramid``
+        (where each level gets stored once as PNG file, keyed by path, modification
+        time and size of the image file, until the least recently used files
+        exceed ``OCRD_MAX_PYRAMID_CACHE``).
+        """
+        log = getLogger('ocrd.workspace._resolve_image_as_pil')
+        key = file_key + (level,)
+        pil_image = self.image_cache.get(key)
+        if pil_image is not None:
+            return pil_image
+        max_size = config.OCRD_MAX_PYRAMID_CACHE * 1024 ** 2
+        cache_file = Path(config.XDG_CACHE_HOME, 'ocrd', 'pyramid',
+                          '%s.%d.png' % (sha1(repr(file_key).encode('utf-8')).hexdigest(), level))
+        pil_image = None
+        if max_size:
+            try:
+                with Image.open(cache_file) as cached_image:
+                    cached_image.load()
+                    pil_image = cached_image.copy()
+                # mark as recently used
+                cache_file.touch()
+                log.debug('Using pyramid level %d of image "%s"', level, image_url)
+            except OSError:
+                pass
+        if pil_image is None:
+            pil_image = self._load_image(file_key[0], image_url, reduce=level)
+            if max_size:
+                try:
+                    cache_file.parent.mkdir(parents=True, exist_ok=True)
+                    with NamedTemporaryFile(dir=cache_file.parent, suffix='.png', delete=False) as f:
+                        try:
+                            pil_image.save(f, format='PNG', compress_level=1)
+                        except OSError:
+                            unlink(f.name)
+                            raise
+                    Path(f.name).replace(cache_file)
+                    _prune_cache_dir(cache_file.parent, '*.*.png', max_size)
+                except OSError as e:
+                    log.debug('Cannot cache pyramid level %d of image "%s": %s', level, image_url, e)
+        if self.image_cache.put(key, pil_image):
+            pil_image = ImageCache.copy(pil_image)
+        return pil_image
+
+    def _load_image(self, filename, image_url, lazy=False, reduce=0):
+        """
+        Open and decode the image file ``filename``, re-quantizing to 8 bit if necessary.
+
+        If ``lazy`` and the image is larger than ``OCRD_LAZY_IMAGE_SIZE`` and
+        allows decoding regions (cf. :py:func:`ocrd_utils.region_decodable`),
+        then return it without decoding yet, so cropping via :py:meth:`image_from_segment`
+        (or :py:meth:`image_from_page` with a ``Border``) only needs to decode the
+        pixels of the segment (and any other operation decodes everything).
+        Such images do not keep their file open (it gets reopened for decoding).
+
+        If ``reduce``, then reduce the resolution by ``2 ** reduce`` (averaging
+        pixels), already while decoding where the format allows it (JPEG, JPEG 2000).
+        Bitonal and palette images become grayscale and RGB(A) images then.
+        """
+        log = getLogger('ocrd.workspace._resolve_image_as_pil')
+        pil_image = Image.open(Path(filename).resolve() if lazy else filename)
+        if reduce:
+            reduced_size = (-(-pil_image.width // 2 ** reduce),
+                            -(-pil_image.height // 2 ** reduce))
+            if pil_image.format == 'JPEG':
+                pil_image.draft(pil_image.mode, reduced_size)
+            elif pil_image.format == 'JPEG2000':
+                pil_image.reduce = reduce
+        if (lazy and 0 < config.OCRD_LAZY_IMAGE_SIZE * 1024 ** 2 <= ImageCache.nbytes(pil_image) and
+            not pil_image.mode.startswith(('I', 'F')) and region_decodable(pil_image)):
+            log.debug('Deferring decoding of image "%s"', image_url)
+            # give up the FD until decoding (decode_region opens the file itself)
+            pil_image.fp.close()
+            pil_image.fp = _ReopenedFile(pil_image.filename)
+            # (some or all of its pixels will get decoded when used)
+            self.images_decoded += 1
+            return pil_image
+        pil_image.load() # alloc and give up the FD
+        self.images_decoded += 1
 
         # Pillow does not properly support higher color depths
         # (e.g. 16-bit or 32-bit or floating point grayscale),
@@ -551,27 +897,22 @@ class Workspace():
                 arr_image *= 255
                 arr_image = arr_image.astype(np.uint8)
             pil_image = Image.fromarray(arr_image)
-
-        if coords is None:
-            return pil_image
-
-        # FIXME: remove or replace this by (image_from_polygon+) crop_image ...
-        log.debug("Converting PIL to OpenCV: %s", image_url)
-        color_conversion = COLOR_GRAY2BGR if pil_image.mode in ('1', 'L') else  COLOR_RGB2BGR
-        pil_as_np_array = np.array(pil_image).astype('uint8') if pil_image.mode == '1' else np.array(pil_image)
-        cv2_image = cvtColor(pil_as_np_array, color_conversion)
-
-        poly = np.array(coords, np.int32)
-        log.debug("Cutting region %s from %s", coords, image_url)
-        region_cut = cv2_image[
-            np.min(poly[:, 1]):np.max(poly[:, 1]),
-            np.min(poly[:, 0]):np.max(poly[:, 0])
-        ]
-        return Image.fromarray(region_cut)
+        if reduce:
+            if pil_image.mode in ('1', 'P'):
+                # not supported by Image.reduce
+                pil_image = pil_image.convert('L' if pil_image.mode == '1' else
+                                              'RGBA' if 'transparency' in pil_image.info else
+                                              'RGB')
+            factors = (max(1, round(pil_image.width / reduced_size[0])),
+                       max(1, round(pil_image.height / reduced_size[1])))
+            if factors != (1, 1):
+                pil_image = pil_image.reduce(factors)
+        return pil_image
 
     def image_from_page(self, page, page_id,
                         fill='background', transparency=False,
-                        feature_selector='', feature_filter='', filename=''):
+                        feature_selector='', feature_filter='', filename='',
+                        scale=None, dpi=None):
         """Extract an image for a PAGE-XML page from the workspace.
 
         Args:
@@ -583,6 +924,9 @@ class Workspace():
             feature_selector (string): a comma-separated list of `@comments` classes
             feature_filter (string): a comma-separated list of `@comments` classes
             filename (string): which file path to use
+            scale (float): factor to resize the image by (before cropping and rotating)
+            dpi (float): pixel density to resize the image to (instead of ``scale``,
+                relative to the pixel density annotated in the original image)
 
         Extract a `PIL.Image` from ``page``, either from its `AlternativeImage`
         (if it exists), or from its `@imageFilename` (otherwise). Also crop it,
@@ -625,6 +969,16 @@ class Workspace():
         before cropping and rotating. (Thus, unexposed/masked areas will be
         transparent afterwards for consumers that can interpret alpha channels).
 
+        If ``scale`` or ``dpi`` is given, then resize the chosen image accordingly
+        first, and add the feature `"scaled"`. For downscaling, this starts from
+        the closest level of an image pyramid (i.e. reductions by powers of 2),
+        which gets decoded at reduced resolution directly where the file format
+        allows it, and which is cached in memory and under ``$XDG_CACHE_HOME/ocrd/pyramid``,
+        so repeated calls (across processors, too) avoid decoding and resampling
+        the full image. (The `"transform"` also incorporates the scaling, so it can be
+        used with :py:meth:`image_from_segment` and :py:func:`ocrd_utils.coordinates_for_segment`
+        like before.)
+
         Returns:
             a tuple of
              * the extracted `PIL.Image`,
@@ -637,8 +991,9 @@ class Workspace():
                - `"angle"`: the rotation/reflection angle applied to the image so far,
                - `"features"`: the `AlternativeImage` `@comments` for the image, i.e.
                  names of all applied operations that lead up to this result,
+               - `"scale"`: the resize factor applied to the image (only if scaled),
              * an :py:class:`ocrd_models.ocrd_exif.OcrdExif` instance associated with
-               the original image.
+               the original image (i.e. without scaling).
 
         (The first two can be used to annotate a new `AlternativeImage`,
          or be passed down with :py:meth:`image_from_segment`.)
@@ -651,17 +1006,46 @@ class Workspace():
                     page, page_id,
                     feature_selector='deskewed,cropped',
                     feature_filter='binarized,grayscale_normalized')
+
+         * get a binarized image at 150 DPI for layout detection::
+
+                page_image, page_coords, page_image_info = workspace.image_from_page(
+                    page, page_id, feature_selector='binarized', dpi=150)
         """
         log = getLogger('ocrd.workspace.image_from_page')
         page_image_info = self.resolve_image_exif(page.imageFilename)
-        page_image = self._resolve_image_as_pil(page.imageFilename)
+        if dpi:
+            if scale:
+                raise ValueError("Cannot pass both 'scale' and 'dpi'")
+            resolution = page_image_info.resolution
+            if page_image_info.resolutionUnit == 'cm':
+                resolution = round(resolution * 2.54)
+            if resolution <= 1:
+                raise Exception("Cannot scale page '%s' to %s DPI: no pixel density annotated in image '%s'" % (
+                    page_id, dpi, page.imageFilename))
+            scale = dpi / resolution
+        if scale == 1:
+            scale = None
+        derivation_key = self._derivation_key(
+            page, repr(fill), transparency, feature_selector, feature_filter, filename, scale)
+        if derivation_key:
+            cached = derivation_cache.get(derivation_key)
+            if cached:
+                page_image, page_coords = cached
+                derivation_cache.track(page_image, derivation_key)
+                return page_image, page_coords, page_image_info
+        if scale:
+            page_image = self._resolve_image_scaled(page.imageFilename, scale)
+            # unscaled size (scaling gets applied to the transform below)
+            page_xywh = {'x': 0, 'y': 0,
+                         'w': page_image_info.width, 'h': page_image_info.height}
+        else:
+            page_image = self._resolve_image_as_pil(page.imageFilename)
+            page_xywh = {'x': 0, 'y': 0,
+                         'w': page_image.width, 'h': page_image.height}
         page_coords = dict()
         # use identity as initial affine coordinate transform:
         page_coords['transform'] = np.eye(3)
-        # interim bbox (updated with each change to the transform):
-        page_bbox = [0, 0, page_image.width, page_image.height]
-        page_xywh = {'x': 0, 'y': 0,
-                     'w': page_image.width, 'h': page_image.height}
 
         border = page.get_Border()
         # page angle: PAGE @orientation is defined clockwise,
@@ -710,8 +1094,17 @@ class Workspace():
                 log.debug("Using AlternativeImage %d %s for page '%s'",
                           alternative_images.index(best_image) + 1,
                           best_features, page_id)
-                page_image = self._resolve_image_as_pil(best_image.get_filename())
+                if scale:
+                    page_image = self._resolve_image_scaled(best_image.get_filename(), scale)
+                else:
+                    page_image = self._resolve_image_as_pil(best_image.get_filename())
                 page_coords['features'] = best_image.get_comments() # including duplicates
+        if scale:
+            # the image itself has already been resized, so only adjust the transform
+            # (before all other steps, which thus operate on the smaller image):
+            page_coords['features'] += ',scaled'
+            page_image, page_coords, page_xywh = _scale(
+                log, "page '%s'" % page_id, scale, page_image, page_coords, page_xywh)
 
         # adjust the coord transformation to the steps applied on the image,
         # and apply steps on the existing image in case it is missing there,
@@ -794,11 +1187,14 @@ class Workspace():
                             'filter="%s" in page "%s"' % (
                                 feature_filter, page_id))
         page_image.format = 'PNG' # workaround for tesserocr#194
+        if derivation_key:
+            page_image, page_coords = self._memoize_derivation(derivation_key, page_image, page_coords)
         return page_image, page_coords, page_image_info
 
     def image_from_segment(self, segment, parent_image, parent_coords,
                            fill='background', transparency=False,
-                           feature_selector='', feature_filter='', filename=''):
+                           feature_selector='', feature_filter='', filename='',
+                           as_array=False):
         """Extract an image for a PAGE-XML hierarchy segment from its parent's image.
 
         Args:
@@ -807,7 +1203,7 @@ class Workspace():
                 or :py:class:`~ocrd_models.ocrd_page.TextLineType` \
                 or :py:class:`~ocrd_models.ocrd_page.WordType` \
                 or :py:class:`~ocrd_models.ocrd_page.GlyphType`)
-            parent_image (`PIL.Image`): image of the `segment`'s parent
+            parent_image (`PIL.Image` or `numpy.ndarray`): image of the `segment`'s parent
             parent_coords (dict): a `dict` with information about `parent_image`:
 
                - `"transform"`: a `Numpy` array with an affine transform which
@@ -821,6 +1217,8 @@ class Workspace():
             transparency (boolean): whether to add an alpha channel for masking
             feature_selector (string): a comma-separated list of ``@comments`` classes
             feature_filter (string): a comma-separated list of ``@comments`` classes
+            filename (string): which file path to use
+            as_array (boolean): whether to return a `numpy.ndarray` instead of a `PIL.Image`
 
         Extract a `PIL.Image` from `segment`, either from ``AlternativeImage``
         (if it exists), or producing a new image via cropping from `parent_image`
@@ -855,6 +1253,14 @@ class Workspace():
         before cropping and rotating. (Thus, unexposed/masked areas will be
         transparent afterwards for consumers that can interpret alpha channels).
 
+        If ``as_array`` is true, then crop the (`PIL.Image` or `numpy.ndarray`)
+        `parent_image` to the segment's bounding box *before* masking it (cf.
+        :py:func:`ocrd_utils.array_from_polygon`), so only the pixels of the segment
+        are processed, and return the result as `numpy.ndarray` (of shape
+        `(height, width)` or `(height, width, bands)`, boolean for bitonal images).
+        This is much faster for many small segments on large pages. (Rotation
+        and reflection still use `PIL.Image`, but only on the cropped segment.)
+
         When cropping, compensate any ``@orientation`` angle annotated for the
         parent (from parent-level deskewing) by rotating the segment coordinates
         in an inverse transformation (i.e. translation to center, then passive
@@ -870,7 +1276,7 @@ class Workspace():
 
         Returns:
             a tuple of
-             * the extracted `PIL.Image`,
+             * the extracted `PIL.Image` (or `numpy.ndarray` if ``as_array``),
              * a `dict` with information about the extracted image:
 
                - `"transform"`: a `Numpy` array with an affine transform which
@@ -909,10 +1315,21 @@ class Workspace():
         # on some ad-hoc binarization method. Thus, it is preferable to use
         # a dedicated processor for this (which produces clipped AlternativeImage
         # or reduced polygon coordinates).
+        parent_key = not as_array and derivation_cache.origin(parent_image)
+        derivation_key = parent_key and self._derivation_key(
+            segment, parent_key, parent_coords['transform'].tobytes(),
+            parent_coords['angle'], parent_coords['features'],
+            repr(fill), transparency, feature_selector, feature_filter, filename)
+        if derivation_key:
+            cached = derivation_cache.get(derivation_key)
+            if cached:
+                segment_image, segment_coords = cached
+                derivation_cache.track(segment_image, derivation_key)
+                return segment_image, segment_coords
         segment_image, segment_coords, segment_xywh = _crop(
             log, "parent image for segment '%s'" % segment.id,
             segment, parent_image, parent_coords,
-            fill=fill, transparency=transparency)
+            fill=fill, transparency=transparency, as_array=as_array)
 
         # Semantics of missing @orientation at region level could be either
         # - inherited from page level: same as line or word level (no @orientation),
@@ -1014,12 +1431,13 @@ class Workspace():
             # FIXME we should enforce consistency here (i.e. split into transposition
             #       and minimal rotation, rotation always reshapes, rescaling never happens)
             # FIXME: inconsistency currently unavoidable with line-level dewarping (which increases height)
+            segment_width, segment_height = _size(segment_image)
             if (i == len(alternative_image_features) and
-                not (segment_xywh['w'] - 2 < segment_image.width < segment_xywh['w'] + 2 and
-                     segment_xywh['h'] - 2 < segment_image.height < segment_xywh['h'] + 2)):
+                not (segment_xywh['w'] - 2 < segment_width < segment_xywh['w'] + 2 and
+                     segment_xywh['h'] - 2 < segment_height < segment_xywh['h'] + 2)):
                 log.error('segment "%s" image (%s; %dx%d) has not been cropped properly (%dx%d)',
                           segment.id, segment_coords['features'],
-                          segment_image.width, segment_image.height,
+                          segment_width, segment_height,
                           segment_xywh['w'], segment_xywh['h'])
             name = "%s for segment '%s'" % ("AlternativeImage" if best_image
                                             else "parent image", segment.id)
@@ -1047,9 +1465,70 @@ class Workspace():
             raise Exception('Found no AlternativeImage that satisfies all requirements ' +
                             'filter="%s" in segment "%s"' % (
                                 feature_filter, segment.id))
+        if as_array:
+            return np.asarray(segment_image), segment_coords
         segment_image.format = 'PNG' # workaround for tesserocr#194
+        if derivation_key:
+            segment_image, segment_coords = self._memoize_derivation(derivation_key, segment_image, segment_coords)
         return segment_image, segment_coords
 
+    def _image_file_key(self, image_url):
+        """
+        Cache key for the local file of ``image_url`` (cf. :py:meth:`ImageCache.key`),
+        or ``None`` if it is not available locally.
+        """
+        with pushd_popd(self.directory):
+            f = next(self.mets.find_files(local_filename=str(image_url)), None)
+            if f is None:
+                f = next(self.mets.find_files(url=str(image_url)), None)
+            if f is None or not f.local_filename:
+                return None
+            try:
+                return ImageCache.key(f.local_filename)
+            except OSError:
+                return None
+
+    def _derivation_key(self, segment, *args):
+        """
+        Fingerprint of the derivation of an image for ``segment`` (a page or
+        segment object) with arguments ``args`` for :py:data:`derivation_cache`,
+        or ``None`` if caching is disabled or some image file is not available locally.
+        """
+        if not derivation_cache.maxsize:
+            return None
+        if isinstance(segment, PageType):
+            source = self._image_file_key(segment.imageFilename)
+            border = segment.get_Border()
+            coords = border.get_Coords() if border else None
+        else:
+            source = segment.id
+            coords = segment.get_Coords()
+        if source is None:
+            return None
+        alternative_images = []
+        for alternative_image in segment.get_AlternativeImage():
+            file_key = self._image_file_key(alternative_image.get_filename())
+            if file_key is None:
+                return None
+            alternative_images.append((alternative_image.get_comments(), file_key))
+        return (source, coords.points if coords else None,
+                getattr(segment, 'orientation', None),
+                tuple(alternative_images)) + args
+
+    @staticmethod
+    def _memoize_derivation(key, image, coords):
+        """
+        Store the result of derivation ``key`` in :py:data:`derivation_cache`,
+        and return a (tracked) copy of it (or itself, if it did not fit).
+        """
+        if getattr(image, 'tile', None):
+            # not decoded yet (cf. OCRD_LAZY_IMAGE_SIZE)
+            return image, coords
+        if derivation_cache.put(key, (image, coords)):
+            image, coords = derivation_cache.copy((image, coords))
+        derivation_cache.track(image, key)
+        return image, coords
+
     # pylint: disable=redefined-builtin
     def save_image_file(self, image,
                         file_id,
@@ -1069,16 +1548,22 @@ class Workspace():
             force (boolean): whether to replace any existing `file` with that `@ID`
 
         Serialize the image into the filesystem, and add a `file` for it in the METS.
-        Use a filename extension based on ``mimetype``.
+        Use a filename extension based on ``mimetype``, and encoding options
+        for that format from :py:attr:`image_save_options`.
+
+        If ``OCRD_IMAGE_SAVE_THREADS`` is set, then encode in a background thread
+        (on a copy of the image). The file will then be complete only after
+        :py:meth:`wait_image_files` (which :py:meth:`save_mets` and image
+        retrieval from the workspace call implicitly).
 
         Returns:
-            The (absolute) path of the created file.
+            The (relative) path of the created file.
         """
         log = getLogger('ocrd.workspace.save_image_file')
         if self.overwrite_mode:
             force = True
-        image_bytes = io.BytesIO()
-        image.save(image_bytes, format=MIME_TO_PIL[mimetype])
+        image_format = MIME_TO_PIL[mimetype]
+        options = self.image_save_options.get(image_format, {})
         file_path = str(Path(file_grp, '%s%s' % (file_id, MIME_TO_EXT[mimetype])))
         out = self.add_file(
             file_grp,
@@ -1086,12 +1571,74 @@ class Workspace():
             page_id=page_id,
             local_filename=file_path,
             mimetype=mimetype,
-            content=image_bytes.getvalue(),
             force=force)
+        # encode directly into the file (not via an in-memory copy)
+        # regardless of the current working directory:
+        local_path = self._image_save_path(file_path)
+        threads = config.OCRD_IMAGE_SAVE_THREADS
+        if threads > 0:
+            if self._image_save_executor is None:
+                self._image_save_executor = ThreadPoolExecutor(threads, thread_name_prefix='ocrd-save-image')
+            # limit the number of image copies in memory
+            pending = [future for _, future in self._image_save_futures.values() if not future.done()]
+            if len(pending) >= 2 * threads:
+                wait(pending, return_when=FIRST_COMPLETED)
+            self._image_save_futures[local_path] = (file_id, self._image_save_executor.submit(
+                image.copy().save, local_path, format=image_format, **options))
+        else:
+            try:
+                image.save(local_path, format=image_format, **options)
+            except Exception:
+                self._remove_unsaved_image(file_id, local_path)
+                raise
         log.info('created file ID: %s, file_grp: %s, path: %s',
                  file_id, file_grp, out.local_filename)
         return file_path
 
+    def wait_image_files(self, image_url=None):
+        """
+        Wait until images from :py:meth:`save_image_file` have been written
+        (when encoding in the background, cf. ``OCRD_IMAGE_SAVE_THREADS``),
+        re-raising any error from encoding (after removing the failed images
+        from the METS and the filesystem).
+
+        When waiting for all images, also shut down the encoding threads
+        (which will be started again on the next :py:meth:`save_image_file`).
+
+        Keyword Args:
+            image_url (string): path of the image to wait for (default: all of them),
+                absolute or relative to the workspace directory
+        """
+        if image_url is None:
+            futures, self._image_save_futures = self._image_save_futures, {}
+        else:
+            local_path = self._image_save_path(image_url)
+            futures = {}
+            if local_path in self._image_save_futures:
+                futures[local_path] = self._image_save_futures.pop(local_path)
+        errors = []
+        for local_path, (file_id, future) in futures.items():
+            try:
+                future.result()
+            except Exception as err:
+                self._remove_unsaved_image(file_id, local_path)
+                errors.append(err)
+        if image_url is None and self._image_save_executor is not None:
+            self._image_save_executor.shutdown()
+            self._image_save_executor = None
+        if errors:
+            raise errors[0]
+
+    def _image_save_path(self, image_url):
+        # normalized absolute path, as key for pending images
+        return path.abspath(path.join(self.directory, str(image_url)))
+
+    def _remove_unsaved_image(self, file_id, local_path):
+        getLogger('ocrd.workspace.save_image_file').error(
+            'failed to write image file ID: %s, removing it from the METS', file_id)
+        self.mets.remove_file(file_id)
+        Path(local_path).unlink(missing_ok=True)
+
     def find_files(self, *args, **kwargs):
         """
         Search ``mets:file`` entries in wrapped METS document and yield results.
@@ -1114,7 +1661,67 @@ class Workspace():
         with pushd_popd(self.directory):
             return self.mets.find_files(*args, **kwargs)
 
-def _crop(log, name, segment, parent_image, parent_coords, op='cropped', **kwargs):
+def _prune_cache_dir(directory, pattern, max_size):
+    """
+    Remove the least recently modified files matching ``pattern`` in ``directory``
+    until they take at most ``max_size`` bytes.
+    """
+    files = []
+    for file in Path(directory).glob(pattern):
+        try:
+            files.append((file.stat(), file))
+        except OSError:
+            pass # removed concurrently
+    size = sum(stat.st_size for stat, _ in files)
+    for stat, file in sorted(files, key=lambda entry: entry[0].st_mtime_ns):
+        if size <= max_size:
+            break
+        try:
+            file.unlink()
+        except OSError:
+            pass
+        size -= stat.st_size
+
+class _ReopenedFile():
+    """
+    Stand-in for the file object of a PIL image which has been opened but not decoded
+    (cf. ``OCRD_LAZY_IMAGE_SIZE``): opens ``filename`` only when PIL actually decodes
+    the full image (and closes it again afterwards), so handles kept around by callers
+    do not hold a file descriptor each.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = None
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.filename, 'rb')
+        return self._file
+
+    def read(self, size=-1):
+        return self._open().read(size)
+
+    def seek(self, offset, whence=0):
+        return self._open().seek(offset, whence)
+
+    def tell(self):
+        return self._open().tell()
+
+    def fileno(self):
+        return self._open().fileno()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+def _size(image):
+    if isinstance(image, np.ndarray):
+        return image.shape[1], image.shape[0]
+    return image.width, image.height
+
+def _crop(log, name, segment, parent_image, parent_coords, op='cropped', as_array=False, **kwargs):
     segment_coords = parent_coords.copy()
     # get polygon outline of segment relative to parent image:
     segment_polygon = coordinates_of_segment(segment, parent_image, parent_coords)
@@ -1132,10 +1739,28 @@ def _crop(log, name, segment, parent_image, parent_coords, op='cropped', **kwarg
         elif isinstance(segment, BorderType):
             log.debug("Cropping %s", name)
             segment_coords['features'] += ',' + op
-        # create a mask from the segment polygon:
-        segment_image = image_from_polygon(parent_image, segment_polygon, **kwargs)
-        # crop to bbox:
-        segment_image = crop_image(segment_image, box=segment_bbox)
+        if as_array:
+            # crop to bbox, then mask with the segment polygon:
+            segment_image = array_from_polygon(parent_image, segment_polygon, **kwargs)
+        elif (segment_bbox[0] >= 0 and segment_bbox[1] >= 0 and
+              segment_bbox[2] <= parent_image.width and
+              segment_bbox[3] <= parent_image.height):
+            # crop to bbox first (identical result, but only the
+            # segment's pixels need to be masked and measured -
+            # including the last row and column, which the mask fills):
+            mask_bbox = (segment_bbox[0], segment_bbox[1],
+                         min(segment_bbox[2] + 1, parent_image.width),
+                         min(segment_bbox[3] + 1, parent_image.height))
+            segment_image = image_from_polygon(
+                decode_region(parent_image, mask_bbox),
+                segment_polygon - np.array(segment_bbox[:2]), **kwargs)
+            segment_image = segment_image.crop(
+                (0, 0, segment_xywh['w'], segment_xywh['h']))
+        else:
+            # create a mask from the segment polygon:
+            segment_image = image_from_polygon(parent_image, segment_polygon, **kwargs)
+            # crop to bbox:
+            segment_image = crop_image(segment_image, box=segment_bbox)
     else:
         segment_image = parent_image
     # subtract offset from parent in affine coordinate transform:
@@ -1164,6 +1789,8 @@ def _reflect(log, name, orientation, segment_image, segment_coords, segment_xywh
     # transpose, if (still) necessary:
     if not 'rotated-%d' % orientation in segment_coords['features']:
         log.debug("Transposing %s by %d°", name, orientation)
+        if isinstance(segment_image, np.ndarray):
+            segment_image = Image.fromarray(segment_image)
         segment_image = transpose_image(segment_image, transposition)
         segment_coords['features'] += ',rotated-%d' % orientation
     return segment_image, segment_coords, segment_xywh
@@ -1181,6 +1808,8 @@ def _rotate(log, name, skew, segment, segment_image, segment_coords, segment_xyw
     # deskew, if (still) necessary:
     if not 'deskewed' in segment_coords['features']:
         log.debug("Rotating %s by %.2f°", name, skew)
+        if isinstance(segment_image, np.ndarray):
+            segment_image = Image.fromarray(segment_image)
         segment_image = rotate_image(segment_image, skew, **kwargs)
         segment_coords['features'] += ',deskewed'
         if (segment and
@@ -95,16 +95,16 @@ class WorkspaceBagger():
         bag_workspace = Workspace(self.resolver, directory=join(bagdir, 'data'), mets_basename=ocrd_mets)
         with pushd_popd(bag_workspace.directory):
             for page_file in bag_workspace.mets.find_files(mimetype=MIMETYPE_PAGE):
-                pcgts = page_from_file(page_file)
+                pcgts = page_from_file(page_file, validate=False)
                 changed = False
                 for old, new in changed_local_filenames.items():
                     if pcgts.get_Page().imageFilename == old:
-                        pcgts.get_Page().imageFilename = new
+                        pcgts.get_Page().set_imageFilename(new)
                         changed = True
                     # TODO replace AlternativeImage, recursively...
                 if changed:
                     with open(page_file.local_filename, 'w') as out:
-                        out.write(to_xml(pcgts))
+                        out.write(to_xml(pcgts, incremental=True))
                     #  log.info("Replace %s -> %s in %s" % (old, new, page_file))
 
             with pushd_popd(bagdir):
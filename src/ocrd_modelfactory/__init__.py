@@ -3,7 +3,13 @@
 Factory methods to create models for data, files, URLs.
 
 """
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from copy import copy
 from datetime import datetime
+from functools import lru_cache
+import gc
+import pickle
 from pathlib import Path
 from typing import Tuple, Union
 from yaml import safe_load, safe_dump
@@ -11,17 +17,19 @@ from yaml import safe_load, safe_dump
 from PIL import Image
 from lxml import etree as ET
 
-from ocrd_utils import VERSION, MIMETYPE_PAGE, guess_media_type
+from ocrd_utils import VERSION, MIMETYPE_PAGE, guess_media_type, image_header_from_file
 from ocrd_models import OcrdExif, OcrdFile, ClientSideOcrdFile
 from ocrd_models.ocrd_page import (
     PcGtsType, PageType, MetadataType,
     parse, parseEtree
 )
+from ocrd_models.ocrd_page_generateds import element_member_names_
 
 __all__ = [
     'exif_from_filename',
     'page_from_file',
     'page_from_image',
+    'pages_from_files',
 ]
 
 
@@ -30,12 +38,21 @@ def exif_from_filename(image_filename):
     Create :py:class:`~ocrd_models.ocrd_exif.OcrdExif`
     by opening an image file with PIL and reading its metadata.
 
+    Results are cached in-process as long as the file's path,
+    modification time and size are unchanged.
+
     Arguments:
         image_filename (str): Local image path name (relative to workspace).
     """
     if image_filename is None:
         raise Exception("Must pass 'image_filename' to 'exif_from_filename'")
-    with Image.open(image_filename) as pil_img:
+    path = Path(image_filename).resolve()
+    path_stat = path.stat()
+    return copy(_exif_from_file(str(path), path_stat.st_mtime_ns, path_stat.st_size))
+
+@lru_cache(maxsize=1024)
+def _exif_from_file(path, mtime, size):
+    with Image.open(path) as pil_img:
         ocrd_exif = OcrdExif(pil_img)
     return ocrd_exif
 
@@ -56,7 +73,8 @@ def page_from_image(input_file, with_tree=False):
         raise ValueError("input_file must have 'local_filename' property")
     if not Path(input_file.local_filename).exists():
         raise FileNotFoundError("File not found: '%s' (%s)" % (input_file.local_filename, input_file))
-    exif = exif_from_filename(input_file.local_filename)
+    # only the image size is needed, so avoid opening the image if possible
+    exif = image_header_from_file(input_file.local_filename) or exif_from_filename(input_file.local_filename)
     now = datetime.now()
     pcgts = PcGtsType(
         Metadata=MetadataType(
@@ -79,7 +97,7 @@ def page_from_image(input_file, with_tree=False):
     revmap = dict(((node, element) for element, node in mapping.items()))
     return pcgts, etree, mapping, revmap
 
-def page_from_file(input_file, with_tree=False) -> Union[PcGtsType, Tuple[PcGtsType, ET.Element, dict, dict]]:
+def page_from_file(input_file, with_tree=False, validate=True, depth=None, share_tree=False) -> Union[PcGtsType, Tuple[PcGtsType, ET.Element, dict, dict]]:
     """
     Create :py:class:`~ocrd_models.ocrd_page.OcrdPage`
     from an :py:class:`~ocrd_models.ocrd_file.OcrdFile` or a file path
@@ -91,6 +109,16 @@ def page_from_file(input_file, with_tree=False) -> Union[PcGtsType, Tuple[PcGtsT
     Keyword arguments:
         with_tree (boolean): whether to return XML node tree, element-node mapping \
             and reverse mapping, too (cf. :py:func:`ocrd_models.ocrd_page.parseEtree`)
+        validate (boolean): whether to check attribute values against their \
+            simple types while parsing (set ``False`` for faster loading of large \
+            files when no parser warnings are needed)
+        depth (str): segment level (``page``, ``region``, ``line``, ``word`` \
+            or ``glyph``) down to which to build the object tree right away; \
+            deeper levels are built on first access, or else written back verbatim \
+            by :py:func:`~ocrd_models.ocrd_page.to_xml` (ignored if ``with_tree``)
+        share_tree (boolean): whether to return the parsed XML node tree itself \
+            instead of an exported copy (if ``with_tree``), with the reverse mapping \
+            computed on first access (cf. :py:func:`ocrd_models.ocrd_page.parseEtree`)
     """
     if not isinstance(input_file, (OcrdFile, ClientSideOcrdFile)):
         mimetype = guess_media_type(input_file, application_xml=MIMETYPE_PAGE)
@@ -104,5 +132,71 @@ def page_from_file(input_file, with_tree=False) -> Union[PcGtsType, Tuple[PcGtsT
     if input_file.mimetype.startswith('image'):
         return page_from_image(input_file, with_tree=with_tree)
     if input_file.mimetype == MIMETYPE_PAGE:
-        return (parseEtree if with_tree else parse)(input_file.local_filename, silence=True)
+        if with_tree:
+            return parseEtree(input_file.local_filename, silence=True, validate=validate, share_tree=share_tree)
+        return parse(input_file.local_filename, silence=True, validate=validate, depth=depth)
     raise ValueError("Unsupported mimetype '%s'" % input_file.mimetype)
+
+def pages_from_files(input_files, workers=None, validate=True):
+    """
+    Create :py:class:`~ocrd_models.ocrd_page.OcrdPage` objects
+    from many :py:class:`~ocrd_models.ocrd_file.OcrdFile` or file paths,
+    like :py:func:`page_from_file`, but parsing in a pool of ``workers`` processes.
+
+    Parsed pages are sent back pickled (without their XML nodes), and yielded
+    in the same order as ``input_files``. At most ``2 * workers`` files are
+    parsed ahead of the consumer.
+
+    Arguments:
+        input_files (iterable of :py:class:`~ocrd_models.ocrd_file.OcrdFile` or `str`): \
+            files to open and produce a PAGE DOM for
+    Keyword arguments:
+        workers (int): number of processes (parse serially in this process if \
+            ``None`` or ``1``)
+        validate (boolean): whether to check attribute values against their \
+            simple types while parsing (cf. :py:func:`page_from_file`)
+    """
+    if not workers or workers <= 1:
+        for input_file in input_files:
+            yield page_from_file(input_file, validate=validate)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for input_file in input_files:
+            if isinstance(input_file, OcrdFile):
+                # OcrdFile wraps an lxml element, which cannot be pickled
+                input_file = ClientSideOcrdFile(None,
+                                                mimetype=input_file.mimetype,
+                                                pageId=input_file.pageId,
+                                                local_filename=input_file.local_filename,
+                                                url=input_file.url,
+                                                ID=input_file.ID)
+            pending.append(pool.submit(_pickled_page_from_file, input_file, validate))
+            if len(pending) >= 2 * workers:
+                yield _unpickle_page(pending.popleft().result())
+        while pending:
+            yield _unpickle_page(pending.popleft().result())
+
+def _pickled_page_from_file(input_file, validate):
+    pcgts = page_from_file(input_file, validate=validate)
+    # the XML nodes cannot be pickled (and are not needed anymore)
+    stack = [pcgts]
+    while stack:
+        obj = stack.pop()
+        obj.gds_elementtree_node_ = None
+        for name in element_member_names_(obj.__class__):
+            value = obj.__dict__.get(name)
+            if value is None:
+                continue
+            stack.extend(value if isinstance(value, list) else [value])
+    return pickle.dumps(pcgts, protocol=pickle.HIGHEST_PROTOCOL)
+
+def _unpickle_page(data):
+    # the garbage collector would needlessly traverse the many new objects
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return pickle.loads(data)
+    finally:
+        if enabled:
+            gc.enable()
@@ -1,9 +1,20 @@
 """
 APIs and schemas for various file formats in the OCR domain.
 """
-from .ocrd_agent import OcrdAgent, ClientSideOcrdAgent
-from .ocrd_exif import OcrdExif
-from .ocrd_file import OcrdFile, ClientSideOcrdFile
-from .ocrd_mets import OcrdMets
-from .ocrd_xml_base import OcrdXmlDocument
-from .report import ValidationReport
+from ocrd_utils import lazy_attributes
+
+# Attributes are only imported on first access
+_LAZY_ATTRIBUTES = {
+    'OcrdAgent': '.ocrd_agent',
+    'ClientSideOcrdAgent': '.ocrd_agent',
+    'OcrdExif': '.ocrd_exif',
+    'OcrdFile': '.ocrd_file',
+    'ClientSideOcrdFile': '.ocrd_file',
+    'OcrdMets': '.ocrd_mets',
+    'OcrdXmlDocument': '.ocrd_xml_base',
+    'ValidationReport': '.report',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
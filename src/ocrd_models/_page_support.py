@@ -0,0 +1,548 @@
+"""
+Hand-maintained additions to the generated PAGE API.
+
+The ``generate-page`` target of the Makefile appends a wildcard import
+of this module to :py:mod:`ocrd_models.ocrd_page_generateds` (and replaces
+the tag name matches there with :py:func:`get_local_name_`), so the names
+exported here become (or replace) globals of the generated module, which its
+classes and the user methods (cf. ``ocrd_page_user_methods``) then use.
+
+Do not import this module directly.
+"""
+# pylint: disable=invalid-name,unused-argument
+from collections.abc import Mapping
+from copy import deepcopy
+import gc
+from itertools import zip_longest
+import sys
+
+from lxml import etree
+
+from . import ocrd_page_generateds as gds_
+from .ocrd_page_generateds import (
+    GdsCollector_,
+    GeneratedsSuper,
+    Tag_pattern_,
+    get_required_ns_prefix_defs,
+    get_root_tag,
+    parsexml_,
+    parsexmlstring_,
+    PcGtsType,
+    ReadingOrderType,
+)
+
+__all__ = [
+    'DeferredElement_',
+    'element_member_names_',
+    'find_attr_value_',
+    'get_local_name_',
+    'index_children_',
+    'index_subtrees_',
+    'mark_changed_',
+    'parse',
+    'parseEtree',
+    'parseString',
+    'quote_attrib',
+    'quote_xml',
+    'replace_unchanged_',
+    'showIndent',
+]
+
+Tag_local_names_ = {}
+generated_find_attr_value_ = gds_.find_attr_value_
+generated_quote_xml = gds_.quote_xml
+generated_quote_attrib = gds_.quote_attrib
+
+
+def get_local_name_(tag):
+    '''Memoized Tag_pattern_ match (there are only a few distinct tags).'''
+    name = Tag_local_names_.get(tag)
+    if name is None:
+        name = Tag_local_names_[tag] = Tag_pattern_.match(tag).groups()[-1]
+    return name
+
+
+def find_attr_value_(attr_name, node):
+    if ':' not in attr_name:
+        # fast path for unprefixed attributes
+        return node.attrib.get(attr_name)
+    return generated_find_attr_value_(attr_name, node)
+
+
+def showIndent(outfile, level, pretty_print=True):
+    if pretty_print and level > 0:
+        outfile.write('    ' * level)
+
+
+def quote_xml(inStr):
+    if isinstance(inStr, str) and '&' not in inStr and '<' not in inStr and '>' not in inStr:
+        # nothing to escape (and no CDATA section)
+        return inStr
+    return generated_quote_xml(inStr)
+
+
+def quote_attrib(inStr):
+    if (isinstance(inStr, str) and '&' not in inStr and '<' not in inStr
+            and '>' not in inStr and '"' not in inStr):
+        return '"%s"' % inStr
+    return generated_quote_attrib(inStr)
+
+
+# attributes which are not part of the content
+# (links and caches, cf. GeneratedsSuper.__eq__)
+Uncompared_attributes_ = frozenset((
+    'parent_object_', 'gds_collector_', 'gds_id_index_',
+    'gds_points_array_', 'gds_changed_'))
+
+
+def generateds_super_eq_(self, other):
+    if type(self) != type(other):  # pylint: disable=unidiomatic-typecheck
+        return False
+    return all(x == y for x, y in zip_longest(
+        (item for item in self.__dict__.items() if item[0] not in Uncompared_attributes_),
+        (item for item in other.__dict__.items() if item[0] not in Uncompared_attributes_)))
+
+
+# names of all element types (i.e. complex types)
+Element_type_names_ = set(
+    name for name, class_ in list(vars(gds_).items())
+    if isinstance(class_, type) and issubclass(class_, GeneratedsSuper)
+    and class_ is not GeneratedsSuper)
+Element_member_names_ = {}
+
+
+def element_member_names_(class_):
+    '''Get the names of all members of class_ (including inherited
+    ones) with element types, i.e. of its child elements.'''
+    names = Element_member_names_.get(class_)
+    if names is None:
+        names = Element_member_names_[class_] = [
+            member.get_name()
+            for base in class_.__mro__
+            for member in base.__dict__.get('member_data_items_', [])
+            if member.get_data_type() in Element_type_names_]
+    return names
+
+
+def mark_changed_(obj):
+    '''Mark obj and its ancestors as changed since parsing
+    (cf. replace_unchanged_).'''
+    while obj is not None and not obj.__dict__.get('gds_changed_'):
+        obj.gds_changed_ = True
+        obj = obj.__dict__.get('parent_object_')
+
+
+def get_document_(obj):
+    '''Follow the parent_object_ links from obj up to the root.'''
+    parent = obj.__dict__.get('parent_object_')
+    while parent is not None:
+        obj = parent
+        parent = obj.__dict__.get('parent_object_')
+    return obj
+
+
+def index_subtrees_(ids, objs):
+    '''Add all objects in the trees below (and including) objs
+    to the ID index ids, and link their parent_object_s.'''
+    stack = list(objs)
+    while stack:
+        obj = stack.pop()
+        obj_id = obj.__dict__.get('id')
+        if obj_id:
+            ids.setdefault(obj_id, obj)
+        for name in element_member_names_(obj.__class__):
+            value = obj.__dict__.get(name)
+            if value is None:
+                continue
+            for child in value if isinstance(value, list) else [value]:
+                child.parent_object_ = obj
+                stack.append(child)
+
+
+def has_ids_(objs):
+    '''Whether any object in the trees below (and including) objs has an @id.'''
+    stack = list(objs)
+    while stack:
+        obj = stack.pop()
+        if obj.__dict__.get('id'):
+            return True
+        for name in element_member_names_(obj.__class__):
+            value = obj.__dict__.get(name)
+            if value is not None:
+                stack.extend(value if isinstance(value, list) else [value])
+    return False
+
+
+def index_children_(obj, children, removed=()):
+    '''Link the new children of obj to it, and update the ID index
+    of its document (cf. PcGtsType.get_by_id), if there is one:
+    add the children's subtrees, or drop the index if the removed
+    subtrees had IDs (so it gets rebuilt on the next lookup).'''
+    for child in children:
+        child.parent_object_ = obj
+    document = get_document_(obj)
+    ids = document.__dict__.get('gds_id_index_')
+    if ids is None:
+        return
+    kept = set(id(child) for child in children)
+    if has_ids_(child for child in removed if id(child) not in kept):
+        del document.gds_id_index_
+    else:
+        index_subtrees_(ids, children)
+
+
+def record_changes_(method, name=None, kind=None):
+    '''Wrap a setter method, so calling it marks the object as changed.
+    For setters of child elements (of member name, with kind "set", "add",
+    "insert" or "replace"), also link and mark the new children and update
+    the ID index. For setters of @id, drop the ID index.'''
+    def wrapper(self, *args, **kwargs):
+        mark_changed_(self)
+        if name is None:
+            return method(self, *args, **kwargs)
+        if name == 'id':
+            get_document_(self).__dict__.pop('gds_id_index_', None)
+            return method(self, *args, **kwargs)
+        removed = []
+        if kind == 'set':
+            removed = self.__dict__.get(name)
+        elif kind == 'replace':
+            index = args[0] if args else kwargs.get('index')
+            removed = self.__dict__.get(name)[index]
+        value = (args or tuple(kwargs.values()))[-1]
+        children = [child for child in (value if isinstance(value, list) else [value])
+                    if isinstance(child, GeneratedsSuper)]
+        for child in children:
+            child.parent_object_ = self
+            child.gds_changed_ = True
+        result = method(self, *args, **kwargs)
+        if removed is None:
+            removed = []
+        index_children_(self, children, removed if isinstance(removed, list) else [removed])
+        return result
+    wrapper.__name__ = method.__name__
+    wrapper.__qualname__ = method.__qualname__
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+def record_changes_in_classes_():
+    '''Wrap all setters (and invalidate_AlternativeImage).'''
+    for type_name in Element_type_names_:
+        class_ = getattr(gds_, type_name)
+        for member in class_.__dict__.get('member_data_items_', []):
+            name = member.get_name()
+            if name != 'id' and member.get_data_type() not in Element_type_names_:
+                name = None
+            for kind, method_name in (('set', 'set_%s'), ('add', 'add_%s'),
+                                      ('insert', 'insert_%s_at'), ('replace', 'replace_%s_at')):
+                method = class_.__dict__.get(method_name % member.get_name())
+                if method is not None:
+                    setattr(class_, method_name % member.get_name(), record_changes_(method, name, kind))
+        method = class_.__dict__.get('invalidate_AlternativeImage')
+        if method is not None:
+            setattr(class_, 'invalidate_AlternativeImage', record_changes_(method))
+
+
+Region_names_ = (
+    'TextRegion', 'ImageRegion', 'LineDrawingRegion', 'GraphicRegion',
+    'TableRegion', 'ChartRegion', 'MapRegion', 'SeparatorRegion',
+    'MathsRegion', 'ChemRegion', 'MusicRegion', 'AdvertRegion',
+    'NoiseRegion', 'UnknownRegion', 'CustomRegion')
+# for each depth of parse(): parent element names and their
+# child element names to defer (i.e. not build before first access)
+Deferred_children_ = {
+    'page': (('Page',), Region_names_),
+    'region': (Region_names_, ('TextLine',)),
+    'line': (('TextLine',), ('Word',)),
+    'word': (('Word',), ('Glyph',)),
+    'glyph': ((), ()),
+}
+
+
+def defer_children_(rootNode, depth):
+    '''Detach all child elements below the segment level depth
+    ("page", "region", "line", "word" or "glyph") from their parents,
+    so they will not be built.
+    Return a dictionary mapping parent nodes to dictionaries
+    mapping child element names to the detached child nodes.
+    '''
+    if depth not in Deferred_children_:
+        raise ValueError("depth must be one of %s, not %s" % (
+            ', '.join(Deferred_children_), repr(depth)))
+    parent_names, child_names = Deferred_children_[depth]
+    deferred = {}
+    if not parent_names:
+        return deferred
+    for parent in list(rootNode.iter(*['{*}' + name for name in parent_names])):
+        children = {}
+        for child in list(parent):
+            name = get_local_name_(child.tag)
+            if name in child_names:
+                if child.prefix is None:
+                    # detaching would replace the default namespace
+                    # by a generated prefix, so keep a copy instead
+                    children.setdefault(name, []).append(deepcopy(child))
+                else:
+                    children.setdefault(name, []).append(child)
+                parent.remove(child)
+        if children:
+            deferred[parent] = children
+    return deferred
+
+
+def attach_deferred_(rootObj, deferred):
+    '''Store the child nodes detached by defer_children_ on the objects
+    built from their parents, so they get built on first access
+    (cf. the __getattr__ user method). Return the list of these objects.
+    '''
+    objs = []
+    stack = [rootObj]
+    while stack:
+        obj = stack.pop()
+        children = deferred.get(obj.gds_elementtree_node_)
+        if children:
+            for name in children:
+                delattr(obj, name)
+            obj.gds_deferred_children_ = children
+            objs.append(obj)
+        for name, value in obj.__dict__.items():
+            if name == 'parent_object_':
+                continue
+            if isinstance(value, GeneratedsSuper):
+                stack.append(value)
+            elif isinstance(value, list):
+                stack.extend(item for item in value if isinstance(item, GeneratedsSuper))
+    return objs
+
+
+class DeferredElement_(object):
+    '''Stand-in for a deferred child element in export (or to_etree),
+    which writes the original XML verbatim instead of building it.
+    '''
+    def __init__(self, node):
+        self.node = node
+    def export(self, outfile, level, namespaceprefix_='', namespacedef_='', name_='', pretty_print=True):
+        xml = etree.tostring(self.node, encoding='unicode', with_tail=False)
+        prefix = self.node.prefix
+        if prefix and namespaceprefix_ == prefix + ':':
+            # already declared by the exporting document
+            xml = xml.replace(' xmlns:%s="%s"' % (prefix, self.node.nsmap[prefix]), '', 1)
+        parent = self.node.getparent()
+        if parent is not None and parent.nsmap.get('xsi') == 'http://www.w3.org/2001/XMLSchema-instance':
+            # inherited (serialized for a node still attached to its parent),
+            # and also declared by the exporting document
+            xml = xml.replace(' xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"', '', 1)
+        showIndent(outfile, level, pretty_print)
+        outfile.write(xml)
+        if pretty_print:
+            outfile.write('\n')
+    def to_etree(self, parent_element=None, name_='', mapping_=None, nsmap_=None):
+        element = deepcopy(self.node)
+        element.tail = None
+        if parent_element is not None:
+            parent_element.append(element)
+        return element
+
+
+
+def node_mapping_(rootObj):
+    '''Map the IDs of all objects in the tree below rootObj
+    to the nodes they were built from (cf. parseEtree(share_tree=True)).
+    '''
+    mapping = {}
+    stack = [rootObj]
+    while stack:
+        obj = stack.pop()
+        mapping[id(obj)] = obj.gds_elementtree_node_
+        for name, value in obj.__dict__.items():
+            if name == 'parent_object_':
+                continue
+            if isinstance(value, GeneratedsSuper):
+                stack.append(value)
+            elif isinstance(value, list):
+                stack.extend(item for item in value if isinstance(item, GeneratedsSuper))
+    return mapping
+
+
+class ReverseNodeMapping_(Mapping):
+    '''Read-only reverse of a node mapping (from nodes to object IDs),
+    which is only computed on first access.
+    '''
+    def __init__(self, mapping):
+        self.mapping = mapping
+        self.reverse_mapping = None
+    def get_reverse_mapping_(self):
+        if self.reverse_mapping is None:
+            self.reverse_mapping = GeneratedsSuper.gds_reverse_node_mapping(self.mapping)
+        return self.reverse_mapping
+    def __getitem__(self, node):
+        return self.get_reverse_mapping_()[node]
+    def __iter__(self):
+        return iter(self.get_reverse_mapping_())
+    def __len__(self):
+        return len(self.mapping)
+
+
+def replace_unchanged_(rootObj):
+    '''Replace all objects below rootObj which were built from a node
+    and not changed since (cf. record_changes_) by DeferredElement_
+    stand-ins for their nodes, so they get exported verbatim.
+    Return a list of (object, name, value) to restore after export.
+    '''
+    # objects which had children detached by defer_children_
+    # (and their ancestors) cannot be written verbatim
+    incomplete = set()
+    for obj in rootObj.__dict__.get('gds_deferred_objects_', []):
+        while obj is not None and id(obj) not in incomplete:
+            incomplete.add(id(obj))
+            obj = obj.__dict__.get('parent_object_')
+    replaced = []
+    stack = [rootObj]
+    while stack:
+        obj = stack.pop()
+        for name in element_member_names_(obj.__class__):
+            value = obj.__dict__.get(name)
+            if not value:
+                # empty, or deferred and not built yet
+                continue
+            children = value if isinstance(value, list) else [value]
+            stand_ins = []
+            for child in children:
+                node = child.__dict__.get('gds_elementtree_node_')
+                if not isinstance(child, GeneratedsSuper) or isinstance(child, ReadingOrderType):
+                    # already a stand-in (for deferred children), or
+                    # normalized on export (cf. exportChildren_GroupType)
+                    stand_ins.append(child)
+                elif (node is None or node.prefix != 'pc' or id(child) in incomplete
+                      or child.__dict__.get('gds_changed_')):
+                    stand_ins.append(child)
+                    stack.append(child)
+                else:
+                    stand_ins.append(DeferredElement_(node))
+            if any(stand_in is not child for stand_in, child in zip(stand_ins, children)):
+                replaced.append((obj, name, value))
+                obj.__dict__[name] = stand_ins if isinstance(value, list) else stand_ins[0]
+    return replaced
+
+def build_root_(rootNode, validate=True, depth=None):
+    '''Build the object tree from rootNode.
+    Without validation (i.e. without a collector), also pause the cyclic
+    garbage collector: building creates lots of long-lived objects
+    (but no garbage), which would otherwise trigger repeated full scans.
+    Return the root object, its tag and the collector.
+    '''
+    gds_collector = GdsCollector_() if validate else None
+    rootTag, rootClass = get_root_tag(rootNode)
+    if rootClass is None:
+        rootTag = 'PcGts'
+        rootClass = PcGtsType
+    rootObj = rootClass.factory()
+    deferred = defer_children_(rootNode, depth) if depth else None
+    pause_gc = not validate and gc.isenabled()
+    if pause_gc:
+        gc.disable()
+    try:
+        rootObj.build(rootNode, gds_collector_=gds_collector)
+    finally:
+        if pause_gc:
+            gc.enable()
+    if deferred:
+        rootObj.gds_deferred_objects_ = attach_deferred_(rootObj, deferred)
+    return rootObj, rootTag, gds_collector
+
+
+def write_warnings_(gds_collector):
+    if gds_collector is None or not gds_collector.get_messages():
+        return
+    separator = ('-' * 50) + '\n'
+    sys.stderr.write(separator)
+    sys.stderr.write('----- Warnings -- count: {} -----\n'.format(
+        len(gds_collector.get_messages()), ))
+    gds_collector.write_messages(sys.stderr)
+    sys.stderr.write(separator)
+
+
+def parse(inFileName, silence=False, print_warnings=True, validate=True,
+          depth=None):
+    '''Parse a file, create the object tree, and return its root.
+
+    Arguments:
+    - inFileName -- A file name or file object.
+    - validate -- A boolean.  If False, do not check attribute values
+      against their simple types (patterns, enumerations, ranges)
+      while building. This makes parsing large (word or glyph level)
+      documents considerably faster. The resulting object tree is
+      the same, but no warnings are collected for invalid values.
+    - depth -- A string.  If given, only build the object tree down to
+      the segment level "page", "region", "line", "word" or "glyph".
+      Deeper levels get built on first access (and validated then,
+      with warnings only added to the root's gds_collector_), or
+      (if not accessed) exported verbatim.
+    Returns -- The root object in the tree.
+    '''
+    rootNode = parsexml_(inFileName, None).getroot()
+    rootObj, _, gds_collector = build_root_(rootNode, validate, depth)
+    if validate:
+        gds_.CapturedNsmap_, _ = get_required_ns_prefix_defs(rootNode)
+    else:
+        # avoid visiting all nodes again, only capture the root's namespaces
+        gds_.CapturedNsmap_ = {prefix: uri for prefix, uri in rootNode.nsmap.items()
+                               if prefix is not None}
+    if print_warnings:
+        write_warnings_(gds_collector)
+    return rootObj
+
+
+def parseEtree(inFileName, silence=False, print_warnings=True,
+               mapping=None, nsmap=None, validate=True, share_tree=False):
+    '''Parse a file, create the object tree, and return its root,
+    the node tree, and the mappings between objects and nodes.
+
+    Arguments:
+    - inFileName -- A file name or file object.
+    - validate -- A boolean.  If False, skip simple type validation
+      (see ``parse``).
+    - share_tree -- A boolean.  If True, return the parsed tree itself
+      instead of exporting a copy, mapping objects to the nodes they were
+      built from (with the reverse mapping computed on first access).
+    '''
+    rootNode = parsexml_(inFileName, None).getroot()
+    rootObj, rootTag, gds_collector = build_root_(rootNode, validate)
+    if mapping is None:
+        mapping = {}
+    if share_tree:
+        rootElement = rootNode
+        mapping.update(node_mapping_(rootObj))
+        reverse_mapping = ReverseNodeMapping_(mapping)
+    else:
+        rootElement = rootObj.to_etree(
+            None, name_=rootTag, mapping_=mapping, nsmap_=nsmap)
+        reverse_mapping = rootObj.gds_reverse_node_mapping(mapping)
+    if print_warnings:
+        write_warnings_(gds_collector)
+    return rootObj, rootElement, mapping, reverse_mapping
+
+
+def parseString(inString, silence=False, print_warnings=True, validate=True,
+                depth=None):
+    '''Parse a string, create the object tree, and return its root.
+
+    Arguments:
+    - inString -- A string.  This XML fragment should not start
+      with an XML declaration containing an encoding.
+    - validate -- A boolean.  If False, skip simple type validation
+      (see ``parse``).
+    - depth -- A string.  If given, build only down to that segment
+      level (see ``parse``).
+    Returns -- The root object in the tree.
+    '''
+    rootNode = parsexmlstring_(inString, None)
+    rootObj, _, gds_collector = build_root_(rootNode, validate, depth)
+    if print_warnings:
+        write_warnings_(gds_collector)
+    return rootObj
+
+
+record_changes_in_classes_()
+GeneratedsSuper.__eq__ = generateds_super_eq_
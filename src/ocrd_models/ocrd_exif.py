@@ -38,12 +38,50 @@ class OcrdExif():
         self.height = img.height
         self.photometricInterpretation = img.mode
         self.n_frames = img.n_frames if 'n_frames' in img.__dict__ else 1
-        if which('identify'):
+        if img.format in ('TIFF', 'PNG', 'JPEG', 'JPEG2000'):
+            self.run_tags(img)
+        elif which('identify'):
             self.run_identify(img)
         else:
             getLogger('ocrd.exif').warning("ImageMagick 'identify' not available, Consider installing ImageMagick for more robust pixel density estimation")
             self.run_pil(img)
 
+    def run_tags(self, img):
+        """
+        Read pixel density from the image file headers already parsed by PIL
+        (TIFF tags, PNG ``pHYs`` chunk, JPEG ``JFIF`` segment or ``EXIF`` tags,
+        JPEG 2000 resolution box) in the same way as ImageMagick's ``identify``,
+        but without running a subprocess for each image.
+        """
+        for prop in ['compression', 'photometric_interpretation']:
+            setattr(self, prop, img.info[prop] if prop in img.info else None)
+        xres, yres, unit = 0, 0, 'inches'
+        if img.format == 'TIFF':
+            tags = img.tag_v2
+            xres, yres = tags.get(282, 0), tags.get(283, 0)
+            unit = 'cm' if tags.get(296) == 3 else 'inches'
+        elif img.format == 'PNG':
+            if 'dpi' in img.info:
+                # PIL converts from pixels per meter, identify reports pixels per centimeter
+                xres, yres = (round(dpi / 0.0254) / 100 for dpi in img.info['dpi'])
+                unit = 'cm'
+            elif 'aspect' in img.info:
+                xres, yres = img.info['aspect']
+        elif img.format == 'JPEG':
+            if 'jfif_density' in img.info:
+                xres, yres = img.info['jfif_density']
+                unit = 'cm' if img.info['jfif_unit'] == 2 else 'inches'
+            else:
+                exif = img.getexif()
+                xres, yres = exif.get(282, 0), exif.get(283, 0)
+                unit = 'cm' if exif.get(296) == 3 else 'inches'
+        elif 'dpi' in img.info:
+            xres, yres = img.info['dpi']
+        self.xResolution = max(int(float(xres)), 1)
+        self.yResolution = max(int(float(yres)), 1)
+        self.resolutionUnit = unit
+        self.resolution = round(sqrt(self.xResolution * self.yResolution))
+
     def run_identify(self, img):
         for prop in ['compression', 'photometric_interpretation']:
             setattr(self, prop, img.info[prop] if prop in img.info else None)
@@ -72,6 +72,9 @@ from .ocrd_page_generateds import (
     parseEtree,
     parseString,
 
+    DeferredElement_,
+    replace_unchanged_,
+
     AdvertRegionType,
     AlternativeImageType,
     BaselineType,
@@ -138,6 +141,14 @@ parse.__doc__ = (
         inFileName (str) -- Path to the PAGE-XML file.
         print_warnings (boolean) -- If true, write parser \
                                     warnings to stderr.
+        validate (boolean) -- If false, skip checking attribute values \
+                              against their simple types (faster).
+        depth (str) -- If given, only build the tree down to this \
+                       segment level (``page``, ``region``, ``line``, \
+                       ``word`` or ``glyph``), deferring deeper \
+                       levels until first access (where their parser \
+                       warnings are added to ``gds_collector_`` of the \
+                       root instead of being written to stderr).
 
     Returns:
         The root object in the tree.
@@ -151,6 +162,14 @@ parseEtree.__doc__ = (
         inFileName (str) -- Path to the PAGE-XML file.
         print_warnings (boolean) -- If true, write parser \
                                     warnings to stderr.
+        validate (boolean) -- If false, skip checking attribute values \
+                              against their simple types (faster).
+        share_tree (boolean) -- If true, return the parsed node tree \
+                                itself (which the objects were built from) \
+                                instead of exporting a copy, and compute \
+                                the reverse mapping on first access (less \
+                                memory, but the tree keeps the original \
+                                serialization, e.g. namespace prefixes).
 
     Returns:
         A tuple of
@@ -168,6 +187,14 @@ parseString.__doc__ = (
     Arguments:
         inString (str) -- This XML fragment should not start \
                           with an XML declaration containing an encoding.
+        validate (boolean) -- If false, skip checking attribute values \
+                              against their simple types (faster).
+        depth (str) -- If given, only build the tree down to this \
+                       segment level (``page``, ``region``, ``line``, \
+                       ``word`` or ``glyph``), deferring deeper \
+                       levels until first access (where their parser \
+                       warnings are added to ``gds_collector_`` of the \
+                       root instead of being written to stderr).
 
     Returns:
         The root object in the tree.
@@ -177,25 +204,46 @@ parseString.__doc__ = (
 # add alias for DOM root
 OcrdPage = PcGtsType
 
-def to_xml(el, skip_declaration=False):
+def to_xml(el, skip_declaration=False, incremental=False):
     """
     Serialize ``pc:PcGts`` document as string.
+
+    If ``incremental``, then write all elements which were parsed from a file
+    and have not been changed since verbatim (as parsed). Only changes made
+    via the setter methods (``set_*``, ``add_*``, ``insert_*_at``,
+    ``replace_*_at``, which also mark all ancestors as changed) are recorded,
+    not direct assignments to attributes or changes to the lists of children.
     """
     # XXX remove potential empty ReadingOrder
     if hasattr(el, 'prune_ReadingOrder'):
         el.prune_ReadingOrder()
+    # write children not built yet (by a partial parse) verbatim
+    # (unless they use a different namespace prefix, then build them)
+    deferred = [(obj, name)
+                for obj in getattr(el, 'gds_deferred_objects_', [])
+                for name, nodes in obj.__dict__.get('gds_deferred_children_', {}).items()
+                if name not in obj.__dict__
+                and all(node.prefix == 'pc' for node in nodes)]
+    for obj, name in deferred:
+        obj.__dict__[name] = [DeferredElement_(node) for node in obj.gds_deferred_children_[name]]
+    replaced = replace_unchanged_(el) if incremental else []
     sio = StringIO()
-    el.export(
-            outfile=sio,
-            level=0,
-            name_='PcGts',
-            namespaceprefix_='pc:',
-            namespacedef_='xmlns:pc="%s" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:schemaLocation="%s %s/pagecontent.xsd"' % (
-                NAMESPACES['page'],
-                NAMESPACES['page'],
-                NAMESPACES['page']
-            ))
-    ret = sio.getvalue()
     if not skip_declaration:
-        ret = '<?xml version="1.0" encoding="UTF-8"?>\n' + ret
-    return ret
+        sio.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    try:
+        el.export(
+                outfile=sio,
+                level=0,
+                name_='PcGts',
+                namespaceprefix_='pc:',
+                namespacedef_='xmlns:pc="%s" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:schemaLocation="%s %s/pagecontent.xsd"' % (
+                    NAMESPACES['page'],
+                    NAMESPACES['page'],
+                    NAMESPACES['page']
+                ))
+    finally:
+        for obj, name, value in replaced:
+            obj.__dict__[name] = value
+        for obj, name in deferred:
+            del obj.__dict__[name]
+    return sio.getvalue()
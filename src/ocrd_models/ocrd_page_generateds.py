@@ -1207,7 +1207,7 @@ class PcGtsType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -1247,40 +1247,48 @@ class PcGtsType(GeneratedsSuper):
         Returns:
             a list of image filename strings
         """
-        from .constants import NAMESPACES, PAGE_REGION_TYPES # pylint: disable=relative-beyond-top-level,import-outside-toplevel
-        from io import StringIO  # pylint: disable=import-outside-toplevel
-        ret = []
-        # XXX Since we're only interested in the **paths** of the images,
-        # export, parse and xpath are less convoluted than traversing
-        # the generateDS API. Quite possibly not as efficient as could be.
-        sio = StringIO()
-        self.export(
-                outfile=sio,
-                level=0,
-                name_='PcGts',
-                namespaceprefix_='pc:',
-                namespacedef_='xmlns:pc="%s" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:schemaLocation="%s %s/pagecontent.xsd"' % (
-                    NAMESPACES['page'],
-                    NAMESPACES['page'],
-                    NAMESPACES['page']
-                ))
-        doc = parsexmlstring_(sio.getvalue())  # pylint: disable=undefined-variable
+        from .constants import PAGE_REGION_TYPES # pylint: disable=relative-beyond-top-level,import-outside-toplevel
+        # traverse the segment hierarchy in document order,
+        # collecting (element name, filename) pairs
+        images = []
+        child_names = {}
+        def collect(obj, name):
+            images.extend((name, image.filename) for image in obj.AlternativeImage)
+            class_ = obj.__class__
+            if class_ not in child_names:
+                child_names[class_] = [
+                    member.get_name()
+                    for base in reversed(class_.__mro__)
+                    for member in base.__dict__.get('member_data_items_', [])
+                    if member.get_name().endswith('Region')
+                    or member.get_name() in ('TextLine', 'Word', 'Glyph')]
+            deferred = obj.__dict__.get('gds_deferred_children_', {})
+            for child_name in child_names[class_]:
+                if child_name in deferred and child_name not in obj.__dict__:
+                    # not built yet (cf. parse(depth=...)), so search the nodes
+                    for node in deferred[child_name]:
+                        for image in node.iter('{*}AlternativeImage'):
+                            images.append((get_local_name_(image.getparent().tag), image.get('filename'))) # pylint: disable=undefined-variable
+                else:
+                    for child in getattr(obj, child_name):
+                        collect(child, child_name)
+        collect(self.get_Page(), 'Page')
+        images = [(name, filename) for name, filename in images if filename is not None]
         # shortcut
         if page and region and line and word and glyph:
-            ret += doc.xpath('//page:AlternativeImage/@filename', namespaces=NAMESPACES)
-        else:
-            if page:
-                ret += doc.xpath('/page:PcGts/page:Page/page:AlternativeImage/@filename', namespaces=NAMESPACES)
-            if region:
-                for class_ in PAGE_REGION_TYPES:
-                    ret += doc.xpath('//page:%sRegion/page:AlternativeImage/@filename' % class_, namespaces=NAMESPACES)
-            if line:
-                ret += doc.xpath('//page:TextLine/page:AlternativeImage/@filename', namespaces=NAMESPACES)
-            if word:
-                ret += doc.xpath('//page:Word/page:AlternativeImage/@filename', namespaces=NAMESPACES)
-            if glyph:
-                ret += doc.xpath('//page:Glyph/page:AlternativeImage/@filename', namespaces=NAMESPACES)
-    
+            return [filename for _, filename in images]
+        ret = []
+        if page:
+            ret += [filename for name, filename in images if name == 'Page']
+        if region:
+            for class_ in PAGE_REGION_TYPES:
+                ret += [filename for name, filename in images if name == '%sRegion' % class_]
+        if line:
+            ret += [filename for name, filename in images if name == 'TextLine']
+        if word:
+            ret += [filename for name, filename in images if name == 'Word']
+        if glyph:
+            ret += [filename for name, filename in images if name == 'Glyph']
         return ret
     def prune_ReadingOrder(self):
         """
@@ -1300,6 +1308,34 @@ class PcGtsType(GeneratedsSuper):
                 ug = None
             if not og and not ug:
                 self.get_Page().set_ReadingOrder(None)
+    # pylint: disable=line-too-long,invalid-name,missing-module-docstring,undefined-variable
+    def get_by_id(self, id_):
+        """
+        Get the element (segment or group) with ``@id`` equal to `id_`,
+        or ``None`` if there is none.
+
+        Uses an index of all elements in this document by ID, which is built
+        on first use (also linking each element's ``parent_object_``). The
+        generated setters (``set_*``, ``add_*``, ``insert_*_at``, ``replace_*_at``)
+        add new elements to the index (or drop it when elements with IDs get
+        removed or IDs change, so it is rebuilt on the next lookup), but
+        changes to the lists of children themselves are not tracked.
+        """
+        ids = self.__dict__.get('gds_id_index_')
+        if ids is None:
+            ids = self.gds_id_index_ = {}
+            index_subtrees_(ids, [self])
+        if id_ not in ids:
+            # maybe not built yet (cf. parse(depth=...))
+            deferred = [(obj, name)
+                        for obj in self.__dict__.get('gds_deferred_objects_', [])
+                        for name in obj.__dict__.get('gds_deferred_children_', {})
+                        if name not in obj.__dict__]
+            if deferred:
+                for obj, name in deferred:
+                    getattr(obj, name)
+                return self.get_by_id(id_)
+        return ids.get(id_)
 # end class PcGtsType
 
 
@@ -1498,7 +1534,7 @@ class MetadataType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -1698,7 +1734,7 @@ class MetadataItemType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -1884,7 +1920,7 @@ class LabelsType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -2033,7 +2069,7 @@ class LabelType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -2911,7 +2947,7 @@ class PageType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -3120,46 +3156,58 @@ class PageType(GeneratedsSuper):
             return self.pcGtsId or ''
         return self.imageFilename
     # pylint: disable=line-too-long,invalid-name,protected-access,missing-module-docstring
+    # dispatch table: names of the *Region members of each class (in PAGE_REGION_TYPES order)
+    region_member_names_ = {}
+    
     def _region_class(self, x): # pylint: disable=unused-argument
         return x.__class__.__name__.replace('RegionType', '')
     
-    def _get_recursive_regions(self, regions, level, classes=None):
-        from .constants import PAGE_REGION_TYPES  # pylint: disable=relative-beyond-top-level,import-outside-toplevel
-        if level == 1:
-            # stop recursion, filter classes
-            if classes:
-                return [r for r in regions if self._region_class(r) in classes]
-            if regions and regions[0].__class__.__name__ == 'PageType':
-                regions = regions[1:]
-            return regions
-        # find more regions recursively
-        more_regions = []
-        for region in regions:
-            more_regions.append([])
-            for class_ in PAGE_REGION_TYPES:
-                if class_ == 'Map' and not isinstance(region, PageType): # pylint: disable=undefined-variable
-                    # 'Map' is not recursive in 2019 schema
-                    continue
-                more_regions[-1] += getattr(region, 'get_{}Region'.format(class_))()
-        if not any(more_regions):
-            return self._get_recursive_regions(regions, 1, classes)
-        ret = []
-        for r, more in zip(regions, more_regions):
-            ret.append(r)
-            ret += self._get_recursive_regions(more, level - 1 if level else 0, classes)
-        return self._get_recursive_regions(ret, 1, classes)
+    def _get_child_regions(self, region):
+        class_ = region.__class__
+        names = self.region_member_names_.get(class_)
+        if names is None:
+            from .constants import PAGE_REGION_TYPES  # pylint: disable=relative-beyond-top-level,import-outside-toplevel
+            members = set(member.get_name()
+                          for base in class_.__mro__
+                          for member in base.__dict__.get('member_data_items_', []))
+            # 'Map' is not recursive in 2019 schema, so only a member of PageType
+            names = self.region_member_names_[class_] = [
+                '%sRegion' % type_ for type_ in PAGE_REGION_TYPES
+                if '%sRegion' % type_ in members]
+        return [child for name in names for child in getattr(region, name)]
+    
+    def _iter_regions(self, classes=None, depth=0):
+        # depth-first (pre-order) traversal without recursion
+        stack = [(region, 1) for region in reversed(self._get_child_regions(self))]
+        while stack:
+            region, level = stack.pop()
+            if not classes or self._region_class(region) in classes:
+                yield region
+            if not depth or level < depth:
+                stack.extend((child, level + 1) for child in reversed(self._get_child_regions(region)))
     
-    def _get_recursive_reading_order(self, rogroup):
-        if isinstance(rogroup, (OrderedGroupType, OrderedGroupIndexedType)): # pylint: disable=undefined-variable
-            elements = rogroup.get_AllIndexed()
-        if isinstance(rogroup, (UnorderedGroupType, UnorderedGroupIndexedType)): # pylint: disable=undefined-variable
-            elements = (rogroup.get_RegionRef() + rogroup.get_OrderedGroup() + rogroup.get_UnorderedGroup())
-        regionrefs = list()
-        for elem in elements:
-            regionrefs.append(elem.get_regionRef())
+    def _get_reading_order_positions(self):
+        reading_order = self.get_ReadingOrder()
+        if reading_order:
+            reading_order = reading_order.get_OrderedGroup() or reading_order.get_UnorderedGroup()
+        positions = {}
+        if not reading_order:
+            return positions
+        def elements(rogroup):
+            if isinstance(rogroup, (OrderedGroupType, OrderedGroupIndexedType)): # pylint: disable=undefined-variable
+                return iter(rogroup.get_AllIndexed())
+            return iter(rogroup.get_RegionRef() + rogroup.get_OrderedGroup() + rogroup.get_UnorderedGroup())
+        # depth-first (pre-order) traversal without recursion
+        stack = [elements(reading_order)]
+        while stack:
+            elem = next(stack[-1], None)
+            if elem is None:
+                stack.pop()
+                continue
+            positions.setdefault(elem.get_regionRef(), len(positions))
             if not isinstance(elem, (RegionRefType, RegionRefIndexedType)): # pylint: disable=undefined-variable
-                regionrefs.extend(self._get_recursive_reading_order(elem))
-        return regionrefs
+                stack.append(elements(elem))
+        return positions
     
     def get_AllRegions(self, classes=None, order='document', depth=0):
         """
@@ -3197,25 +3245,16 @@ class PageType(GeneratedsSuper):
             raise Exception("Argument 'order' must be either 'document', 'reading-order' or 'reading-order-only', not '{}'".format(order))
         if depth < 0:
             raise Exception("Argument 'depth' must be an integer greater-or-equal 0, not '{}'".format(depth))
-        ret = self._get_recursive_regions([self], depth + 1 if depth else 0, classes)
+        ret = list(self._iter_regions(classes, depth))
         if order.startswith('reading-order'):
-            reading_order = self.get_ReadingOrder()
-            if reading_order:
-                reading_order = reading_order.get_OrderedGroup() or reading_order.get_UnorderedGroup()
-            if reading_order:
-                reading_order = self._get_recursive_reading_order(reading_order)
-            if reading_order:
-                id2region = {region.id: region for region in ret}
-                in_reading_order = [id2region[region_id] for region_id in reading_order if region_id in id2region]
-                #  print("ret: {} / in_ro: {} / not-in-ro: {}".format(
-                #      len(ret),
-                #      len([id2region[region_id] for region_id in reading_order if region_id in id2region]),
-                #      len([r for r in ret if r not in in_reading_order])
-                #      ))
+            positions = self._get_reading_order_positions()
+            if positions:
+                in_reading_order = sorted((region for region in ret if region.id in positions),
+                                          key=lambda region: positions[region.id])
                 if order == 'reading-order-only':
                     ret = in_reading_order
                 else:
-                    ret = in_reading_order + [r for r in ret if r not in in_reading_order]
+                    ret = in_reading_order + [region for region in ret if region.id not in positions]
         return ret
     def get_AllAlternativeImages(self, page=True, region=True, line=True, word=True, glyph=True):
         """
@@ -3276,6 +3315,9 @@ class PageType(GeneratedsSuper):
             name = self.parent_object_.pcGtsId
         else:
             name = ''
+        if self.gds_collector_ is None:
+            # not parsed with validation (or constructed programmatically)
+            return
         for image in removed_images:
             self.gds_collector_.add_message('Removing AlternativeImage %s from "%s"' % (
                 image.get_comments() or '', name))
@@ -3305,13 +3347,14 @@ class PageType(GeneratedsSuper):
         """
         # TODO handle textLineOrder according to https://github.com/PRImA-Research-Lab/PAGE-XML/issues/26
         ret = []
+        page_lo = self.get_textLineOrder() or 'top-to-bottom'
         for reg in self.get_AllRegions(['Text'], order=region_order):
             lines = reg.get_TextLine()
             if not respect_textline_order:
                 ret += lines
             else:
-                lo = reg.get_textLineOrder() or self.get_textLineOrder() or 'top-to-bottom'
-                ret += lines if lo in ['top-to-bottom', 'left-to-right'] else list(reversed(lines))
+                lo = reg.get_textLineOrder() or page_lo
+                ret += lines if lo in ['top-to-bottom', 'left-to-right'] else lines[::-1]
         return ret
     
     def set_orientation(self, orientation):
@@ -3325,6 +3368,31 @@ class PageType(GeneratedsSuper):
             # PageType, RegionType:
             self.invalidate_AlternativeImage(feature_selector='deskewed')
         self.orientation = orientation
+    def __getattr__(self, name):
+        """
+        Build the child elements deferred by a partial parse
+        (cf. ``parse(depth=...)``) on first access.
+        Their warnings (if validating) are added to the document's
+        ``gds_collector_``.
+        """
+        deferred = self.__dict__.get('gds_deferred_children_')
+        if not deferred or name not in deferred:
+            raise AttributeError("'%s' object has no attribute '%s'" % (
+                self.__class__.__name__, name))
+        del self.gds_deferred_children_
+        children = []
+        for name_, nodes in deferred.items():
+            if name_ in self.__dict__:
+                # already replaced by the user
+                continue
+            setattr(self, name_, [])
+            for node in nodes:
+                self.buildChildren(node, self.gds_elementtree_node_, name_,
+                                   gds_collector_=self.gds_collector_)
+            children.extend(self.__dict__[name_])
+        # add to the ID index (cf. PcGtsType.get_by_id)
+        index_children_(self, children)
+        return getattr(self, name)
 # end class PageType
 
 
@@ -3461,7 +3529,7 @@ class CoordsType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -3482,7 +3550,9 @@ class CoordsType(GeneratedsSuper):
         return hash(self.id)
     def set_points(self, points):
         """
-        Set coordinate polygon by given string.
+        Set coordinate polygon by given string
+        (or by given numeric array of point pairs, which is then also
+        cached for :py:meth:`get_points_array`).
         Moreover, invalidate the parent's ``pc:AlternativeImage``s
         (because they will have been cropped with a bbox
         of the previous polygon).
@@ -3495,7 +3565,35 @@ class CoordsType(GeneratedsSuper):
             elif hasattr(parent, 'parent_object_') and hasattr(parent.parent_object_, 'invalidate_AlternativeImage'):
                 # BorderType:
                 parent.parent_object_.invalidate_AlternativeImage(feature_selector='cropped')
-        self.points = points
+        if isinstance(points, str):
+            self.points = points
+            return
+        import numpy as np # pylint: disable=import-outside-toplevel
+        array = np.array(points).reshape(-1, 2).astype(np.int32)
+        array.flags.writeable = False
+        self.points = " ".join("%i,%i" % (x, y) for x, y in array.tolist())
+        self.gds_points_array_ = (self.points, array)
+    def get_points_array(self):
+        """
+        Get the ``@points`` as a read-only numpy array of point pairs
+        (of ``int32``, or ``float64`` if the coordinates are not integers).
+        The array is parsed on first use and cached until ``@points`` changes.
+        """
+        cached = self.__dict__.get('gds_points_array_')
+        if cached is None or cached[0] is not self.points:
+            import numpy as np # pylint: disable=import-outside-toplevel
+            points = self.points
+            values = points.replace(',', ' ').split()
+            if not values or len(values) != 2 * points.count(','):
+                raise ValueError("Invalid points '%s'" % points)
+            try:
+                array = np.array(list(map(int, values)), dtype=np.int32)
+            except ValueError:
+                array = np.array(list(map(float, values)))
+            array = array.reshape(-1, 2)
+            array.flags.writeable = False
+            cached = self.gds_points_array_ = (points, array)
+        return cached[1]
 # end class CoordsType
 
 
@@ -3892,7 +3990,7 @@ class TextLineType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -4008,6 +4106,9 @@ class TextLineType(GeneratedsSuper):
             name = self.parent_object_.pcGtsId
         else:
             name = ''
+        if self.gds_collector_ is None:
+            # not parsed with validation (or constructed programmatically)
+            return
         for image in removed_images:
             self.gds_collector_.add_message('Removing AlternativeImage %s from "%s"' % (
                 image.get_comments() or '', name))
@@ -4025,6 +4126,31 @@ class TextLineType(GeneratedsSuper):
             # BorderType:
             self.parent_object_.invalidate_AlternativeImage(feature_selector='cropped')
         self.Coords = Coords
+    def __getattr__(self, name):
+        """
+        Build the child elements deferred by a partial parse
+        (cf. ``parse(depth=...)``) on first access.
+        Their warnings (if validating) are added to the document's
+        ``gds_collector_``.
+        """
+        deferred = self.__dict__.get('gds_deferred_children_')
+        if not deferred or name not in deferred:
+            raise AttributeError("'%s' object has no attribute '%s'" % (
+                self.__class__.__name__, name))
+        del self.gds_deferred_children_
+        children = []
+        for name_, nodes in deferred.items():
+            if name_ in self.__dict__:
+                # already replaced by the user
+                continue
+            setattr(self, name_, [])
+            for node in nodes:
+                self.buildChildren(node, self.gds_elementtree_node_, name_,
+                                   gds_collector_=self.gds_collector_)
+            children.extend(self.__dict__[name_])
+        # add to the ID index (cf. PcGtsType.get_by_id)
+        index_children_(self, children)
+        return getattr(self, name)
 # end class TextLineType
 
 
@@ -4393,7 +4519,7 @@ class WordType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -4500,6 +4626,9 @@ class WordType(GeneratedsSuper):
             name = self.parent_object_.pcGtsId
         else:
             name = ''
+        if self.gds_collector_ is None:
+            # not parsed with validation (or constructed programmatically)
+            return
         for image in removed_images:
             self.gds_collector_.add_message('Removing AlternativeImage %s from "%s"' % (
                 image.get_comments() or '', name))
@@ -4517,6 +4646,31 @@ class WordType(GeneratedsSuper):
             # BorderType:
             self.parent_object_.invalidate_AlternativeImage(feature_selector='cropped')
         self.Coords = Coords
+    def __getattr__(self, name):
+        """
+        Build the child elements deferred by a partial parse
+        (cf. ``parse(depth=...)``) on first access.
+        Their warnings (if validating) are added to the document's
+        ``gds_collector_``.
+        """
+        deferred = self.__dict__.get('gds_deferred_children_')
+        if not deferred or name not in deferred:
+            raise AttributeError("'%s' object has no attribute '%s'" % (
+                self.__class__.__name__, name))
+        del self.gds_deferred_children_
+        children = []
+        for name_, nodes in deferred.items():
+            if name_ in self.__dict__:
+                # already replaced by the user
+                continue
+            setattr(self, name_, [])
+            for node in nodes:
+                self.buildChildren(node, self.gds_elementtree_node_, name_,
+                                   gds_collector_=self.gds_collector_)
+            children.extend(self.__dict__[name_])
+        # add to the ID index (cf. PcGtsType.get_by_id)
+        index_children_(self, children)
+        return getattr(self, name)
 # end class WordType
 
 
@@ -4834,7 +4988,7 @@ class GlyphType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -4944,6 +5098,9 @@ class GlyphType(GeneratedsSuper):
             name = self.parent_object_.pcGtsId
         else:
             name = ''
+        if self.gds_collector_ is None:
+            # not parsed with validation (or constructed programmatically)
+            return
         for image in removed_images:
             self.gds_collector_.add_message('Removing AlternativeImage %s from "%s"' % (
                 image.get_comments() or '', name))
@@ -5169,7 +5326,7 @@ class TextEquivType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -5316,7 +5473,7 @@ class GridType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -5444,7 +5601,7 @@ class GridPointsType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -5564,7 +5721,7 @@ class PrintSpaceType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -5718,7 +5875,7 @@ class ReadingOrderType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -5845,7 +6002,7 @@ class RegionRefIndexedType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -6162,7 +6319,7 @@ class OrderedGroupIndexedType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -6632,7 +6789,7 @@ class UnorderedGroupIndexedType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -6799,7 +6956,7 @@ class RegionRefType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -7098,7 +7255,7 @@ class OrderedGroupType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -7550,7 +7707,7 @@ class UnorderedGroupType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -7721,7 +7878,7 @@ class BorderType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -7855,7 +8012,7 @@ class LayersType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -8007,7 +8164,7 @@ class LayerType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -8160,7 +8317,7 @@ class BaselineType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -8179,6 +8336,27 @@ class BaselineType(GeneratedsSuper):
         pass
     def __hash__(self):
         return hash(self.id)
+    def get_points_array(self):
+        """
+        Get the ``@points`` as a read-only numpy array of point pairs
+        (of ``int32``, or ``float64`` if the coordinates are not integers).
+        The array is parsed on first use and cached until ``@points`` changes.
+        """
+        cached = self.__dict__.get('gds_points_array_')
+        if cached is None or cached[0] is not self.points:
+            import numpy as np # pylint: disable=import-outside-toplevel
+            points = self.points
+            values = points.replace(',', ' ').split()
+            if not values or len(values) != 2 * points.count(','):
+                raise ValueError("Invalid points '%s'" % points)
+            try:
+                array = np.array(list(map(int, values)), dtype=np.int32)
+            except ValueError:
+                array = np.array(list(map(float, values)))
+            array = array.reshape(-1, 2)
+            array.flags.writeable = False
+            cached = self.gds_points_array_ = (points, array)
+        return cached[1]
 # end class BaselineType
 
 
@@ -8286,7 +8464,7 @@ class RelationsType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -8493,7 +8671,7 @@ class RelationType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -8896,7 +9074,7 @@ class TextStyleType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -9582,7 +9760,7 @@ class RegionType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -9737,6 +9915,9 @@ class RegionType(GeneratedsSuper):
             name = self.parent_object_.pcGtsId
         else:
             name = ''
+        if self.gds_collector_ is None:
+            # not parsed with validation (or constructed programmatically)
+            return
         for image in removed_images:
             self.gds_collector_.add_message('Removing AlternativeImage %s from "%s"' % (
                 image.get_comments() or '', name))
@@ -9754,6 +9935,31 @@ class RegionType(GeneratedsSuper):
             # BorderType:
             self.parent_object_.invalidate_AlternativeImage(feature_selector='cropped')
         self.Coords = Coords
+    def __getattr__(self, name):
+        """
+        Build the child elements deferred by a partial parse
+        (cf. ``parse(depth=...)``) on first access.
+        Their warnings (if validating) are added to the document's
+        ``gds_collector_``.
+        """
+        deferred = self.__dict__.get('gds_deferred_children_')
+        if not deferred or name not in deferred:
+            raise AttributeError("'%s' object has no attribute '%s'" % (
+                self.__class__.__name__, name))
+        del self.gds_deferred_children_
+        children = []
+        for name_, nodes in deferred.items():
+            if name_ in self.__dict__:
+                # already replaced by the user
+                continue
+            setattr(self, name_, [])
+            for node in nodes:
+                self.buildChildren(node, self.gds_elementtree_node_, name_,
+                                   gds_collector_=self.gds_collector_)
+            children.extend(self.__dict__[name_])
+        # add to the ID index (cf. PcGtsType.get_by_id)
+        index_children_(self, children)
+        return getattr(self, name)
 # end class RegionType
 
 
@@ -9884,7 +10090,7 @@ class AlternativeImageType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -10056,7 +10262,7 @@ class GraphemesType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -10273,7 +10479,7 @@ class GraphemeBaseType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -10417,7 +10623,7 @@ class GraphemeType(GraphemeBaseType):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -10513,7 +10719,7 @@ class NonPrintingCharType(GraphemeBaseType):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -10649,7 +10855,7 @@ class GraphemeGroupType(GraphemeBaseType):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -10773,7 +10979,7 @@ class UserDefinedType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -10913,7 +11119,7 @@ class UserAttributeType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -11079,7 +11285,7 @@ class TableCellRoleType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -11208,7 +11414,7 @@ class RolesType(GeneratedsSuper):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -11316,7 +11522,7 @@ class CustomRegionType(RegionType):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -11409,7 +11615,7 @@ class UnknownRegionType(RegionType):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -11500,7 +11706,7 @@ class NoiseRegionType(RegionType):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -11632,7 +11838,7 @@ class AdvertRegionType(RegionType):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -11785,7 +11991,7 @@ class MusicRegionType(RegionType):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -11913,7 +12119,7 @@ class MapRegionType(RegionType):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -12062,7 +12268,7 @@ class ChemRegionType(RegionType):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -12216,7 +12422,7 @@ class MathsRegionType(RegionType):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -12371,7 +12577,7 @@ class SeparatorRegionType(RegionType):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -12579,7 +12785,7 @@ class ChartRegionType(RegionType):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -12836,7 +13042,7 @@ class TableRegionType(RegionType):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -13053,7 +13259,7 @@ class GraphicRegionType(RegionType):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -13247,7 +13453,7 @@ class LineDrawingRegionType(RegionType):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -13455,7 +13661,7 @@ class ImageRegionType(RegionType):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -13918,7 +14124,7 @@ class TextRegionType(RegionType):
         self.ns_prefix_ = node.prefix
         self.buildAttributes(node, node.attrib, already_processed)
         for child in node:
-            nodeName_ = Tag_pattern_.match(child.tag).groups()[-1]
+            nodeName_ = get_local_name_(child.tag)
             self.buildChildren(child, node, nodeName_, gds_collector_=gds_collector_)
         return self
     def buildAttributes(self, node, attrs, already_processed):
@@ -14040,7 +14246,7 @@ def usage():
 
 
 def get_root_tag(node):
-    tag = Tag_pattern_.match(node.tag).groups()[-1]
+    tag = get_local_name_(node.tag)
     rootClass = GDSClassesMapping.get(tag)
     if rootClass is None:
         rootClass = globals().get(tag)
@@ -14270,3 +14476,6 @@ __all__ = [
     "UserDefinedType",
     "WordType"
 ]
+
+# hand-maintained additions (appended by the generate-page target of the Makefile)
+from ._page_support import *  # pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-position
@@ -1,7 +1,22 @@
-from .client import Client
-from .constants import AgentType, JobState
-from .processing_server import ProcessingServer
-from .processing_worker import ProcessingWorker
-from .processor_server import ProcessorServer
-from .param_validators import DatabaseParamType, ServerAddressParamType, QueueServerParamType
-from .server_cache import CacheLockedPages, CacheProcessingRequests
+from ocrd_utils import lazy_attributes
+
+# Attributes are only imported on first access, so that
+# processor CLIs do not need to load the server/database/queue stack
+# unless they actually run as network agent.
+_LAZY_ATTRIBUTES = {
+    'Client': '.client',
+    'AgentType': '.constants',
+    'JobState': '.constants',
+    'ProcessingServer': '.processing_server',
+    'ProcessingWorker': '.processing_worker',
+    'ProcessorServer': '.processor_server',
+    'DatabaseParamType': '.param_validators',
+    'ServerAddressParamType': '.param_validators',
+    'QueueServerParamType': '.param_validators',
+    'CacheLockedPages': '.server_cache',
+    'CacheProcessingRequests': '.server_cache',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
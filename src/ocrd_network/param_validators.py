@@ -1,8 +1,5 @@
 from click import ParamType
 
-from .database import verify_database_uri
-from .rabbitmq_utils import verify_and_parse_mq_uri
-
 
 class ServerAddressParamType(ParamType):
     name = "Server address string format"
@@ -24,6 +21,8 @@ class QueueServerParamType(ParamType):
     name = "Message queue server string format"
 
     def convert(self, value, param, ctx):
+        # avoid loading the queue client stack for CLI definition
+        from .rabbitmq_utils import verify_and_parse_mq_uri
         try:
             # perform validation check only
             verify_and_parse_mq_uri(value)
@@ -37,6 +36,8 @@ class DatabaseParamType(ParamType):
     name = "Database string format"
 
     def convert(self, value, param, ctx):
+        # avoid loading the database stack for CLI definition
+        from .database import verify_database_uri
         try:
             # perform validation check only
             verify_database_uri(value)
@@ -9,12 +9,17 @@ is a single OCR-D Processor instance.
 """
 
 from datetime import datetime
-from os import getpid
+import gc
+from os import _exit, fork, getpid, kill, waitpid, WNOHANG
+import signal
+from time import sleep
 from pika import BasicProperties
 from pika.adapters.blocking_connection import BlockingChannel
 from pika.spec import Basic
 
-from ocrd_utils import getLogger
+from ocrd.processor.helpers import get_cached_processor, release_cached_processor
+from ocrd_utils import config, getLogger
+from ocrd_validators import get_parameter_validator
 from .constants import JobState
 from .database import sync_initiate_database, sync_db_get_workspace, sync_db_update_processing_job, verify_database_uri
 from .logging_utils import (
@@ -48,6 +53,7 @@ class ProcessingWorker:
             self.log.exception(msg)
             raise ValueError(msg)
 
+        self.db_url = mongodb_addr
         sync_initiate_database(mongodb_addr)  # Database client
         self.ocrd_tool = ocrd_tool
         # The str name of the OCR-D processor instance to be started
@@ -136,6 +142,117 @@ class ProcessingWorker:
             self.log.exception(msg)
             raise Exception(msg)
 
+    def normalize_parameters(self, parameters: dict) -> dict:
+        """
+        Return a copy of ``parameters`` with the defaults from the ocrd-tool
+        filled in, so jobs which merely spell out some defaults share the
+        same processor cache entry (e.g. the preloaded one).
+
+        (Invalid parameters are returned as is, for the processor to report.)
+        """
+        normalized = dict(parameters) if parameters else {}
+        if self.ocrd_tool and get_parameter_validator(self.ocrd_tool).validate(normalized).is_valid:
+            return normalized
+        return parameters
+
+    def preload_processor(self) -> None:
+        """
+        Instantiate (and set up) the processor with default parameters,
+        so the instance (including its models) is kept in the processor cache.
+        """
+        if not self.processor_class:
+            return
+        self.log.info(f"Preloading processor {self.processor_name} with default parameters")
+        release_cached_processor(get_cached_processor(
+            parameter=self.normalize_parameters({}), processor_class=self.processor_class))
+
+    def start_forked_consuming(self, forks: int, report_interval: float = 60) -> None:
+        """
+        Preload the processor, then fork ``forks`` child processes, each connecting
+        to the queue and consuming from it. The children share the memory pages of the
+        preloaded processor (models and other resources) copy-on-write.
+
+        The parent only supervises: it waits for the children to exit,
+        respawns those which crashed (i.e. exited with non-zero status),
+        forwards SIGINT/SIGTERM to them, and (if ``OCRD_PROFILE`` contains ``RSS``
+        or ``PSS``) reports the memory consumption of all workers every
+        ``report_interval`` seconds.
+        """
+        self.preload_processor()
+        # avoid touching (and thus copying) the preloaded objects in the children's GC runs
+        gc.collect()
+        gc.freeze()
+        children = set(self._fork_consumer() for _ in range(forks))
+        self.log.info(f"Forked {forks} processing workers: {sorted(children)}")
+
+        stopping = False
+        def stop(signum, _frame):
+            nonlocal stopping
+            stopping = True
+            for pid in list(children):
+                kill(pid, signum)
+        handlers = {signum: signal.signal(signum, stop) for signum in [signal.SIGINT, signal.SIGTERM]}
+
+        log_profile = getLogger('ocrd.process.profile')
+        last_report = 0
+        try:
+            while children:
+                for pid in list(children):
+                    exited, status = waitpid(pid, WNOHANG)
+                    if not exited:
+                        continue
+                    children.remove(pid)
+                    if stopping:
+                        continue
+                    if status == 0:
+                        self.log.info(f"Processing worker {pid} exited")
+                        continue
+                    # (at most once per child and second, in case it keeps crashing)
+                    child = self._fork_consumer()
+                    children.add(child)
+                    self.log.warning(f"Processing worker {pid} exited with status {status}, respawned as {child}")
+                if any(x in config.OCRD_PROFILE for x in ['RSS', 'PSS']) and last_report >= report_interval:
+                    log_profile.info(self._memory_report(children))
+                    last_report = 0
+                sleep(1)
+                last_report += 1
+        finally:
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+
+    def _fork_consumer(self) -> int:
+        pid = fork()
+        if pid:
+            return pid
+        exit_code = 0
+        try:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            # connections must not be shared with the parent
+            sync_initiate_database(self.db_url)
+            self.connect_consumer()
+            self.start_consuming()
+        except BaseException as error:
+            self.log.exception(f"Processing worker {getpid()} failed: {error}")
+            exit_code = 1
+        finally:
+            _exit(exit_code)
+
+    def _memory_report(self, children) -> str:
+        from psutil import Process, NoSuchProcess
+        pss = 'PSS' in config.OCRD_PROFILE
+        usages = {}
+        for pid in [getpid()] + sorted(children):
+            try:
+                proc = Process(pid)
+                mem = proc.memory_full_info().pss if pss else proc.memory_info().rss
+            except NoSuchProcess:
+                continue
+            usages[pid] = mem / 1024 ** 2
+        return "memory consumption (%s) of pre-forked workers: total: %.2f MiB %s" % (
+            'PSS' if pss else 'RSS', sum(usages.values()),
+            ' '.join('%d: %.2f MiB' % (pid, mem) for pid, mem in usages.items()))
+
     # TODO: Better error handling required to catch exceptions
     def process_message(self, processing_message: OcrdProcessingMessage) -> None:
         # Verify that the processor name in the processing message
@@ -191,7 +308,7 @@ class ProcessingWorker:
                 output_file_grps=output_file_grps,
                 page_id=page_id,
                 log_filename=job_log_file,
-                parameters=processing_message.parameters,
+                parameters=self.normalize_parameters(processing_message.parameters),
                 mets_server_url=mets_server_url
             )
         except Exception as error:
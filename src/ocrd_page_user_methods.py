@@ -115,9 +115,12 @@ METHOD_SPECS = (
     _add_method(r'^(BorderType|RegionType|TextLineType|WordType|GlyphType)$', 'set_Coords'),
     _add_method(r'^(PageType)$', 'set_Border'),
     _add_method(r'^(CoordsType)$', 'set_points'),
+    _add_method(r'^(CoordsType|BaselineType)$', 'get_points_array'),
     _add_method(r'^(PageType)$', 'get_AllTextLines'),
     # for some reason, pagecontent.xsd does not declare @orientation at the abstract/base RegionType:
     _add_method(r'^(PageType|AdvertRegionType|MusicRegionType|MapRegionType|ChemRegionType|MathsRegionType|SeparatorRegionType|ChartRegionType|TableRegionType|GraphicRegionType|LineDrawingRegionType|ImageRegionType|TextRegionType)$', 'set_orientation'),
+    _add_method(r'^(PageType|RegionType|TextLineType|WordType)$', '__getattr__'),
+    _add_method(r'^(PcGtsType)$', 'get_by_id'),
     )
 
 
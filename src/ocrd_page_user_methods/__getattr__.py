@@ -0,0 +1,25 @@
+def __getattr__(self, name):
+    """
+    Build the child elements deferred by a partial parse
+    (cf. ``parse(depth=...)``) on first access.
+    Their warnings (if validating) are added to the document's
+    ``gds_collector_``.
+    """
+    deferred = self.__dict__.get('gds_deferred_children_')
+    if not deferred or name not in deferred:
+        raise AttributeError("'%s' object has no attribute '%s'" % (
+            self.__class__.__name__, name))
+    del self.gds_deferred_children_
+    children = []
+    for name_, nodes in deferred.items():
+        if name_ in self.__dict__:
+            # already replaced by the user
+            continue
+        setattr(self, name_, [])
+        for node in nodes:
+            self.buildChildren(node, self.gds_elementtree_node_, name_,
+                               gds_collector_=self.gds_collector_)
+        children.extend(self.__dict__[name_])
+    # add to the ID index (cf. PcGtsType.get_by_id)
+    index_children_(self, children)
+    return getattr(self, name)
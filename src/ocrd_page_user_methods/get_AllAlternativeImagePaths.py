@@ -12,38 +12,46 @@ def get_AllAlternativeImagePaths(self, page=True, region=True, line=True, word=T
     Returns:
         a list of image filename strings
     """
-    from .constants import NAMESPACES, PAGE_REGION_TYPES # pylint: disable=relative-beyond-top-level,import-outside-toplevel
-    from io import StringIO  # pylint: disable=import-outside-toplevel
-    ret = []
-    # XXX Since we're only interested in the **paths** of the images,
-    # export, parse and xpath are less convoluted than traversing
-    # the generateDS API. Quite possibly not as efficient as could be.
-    sio = StringIO()
-    self.export(
-            outfile=sio,
-            level=0,
-            name_='PcGts',
-            namespaceprefix_='pc:',
-            namespacedef_='xmlns:pc="%s" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:schemaLocation="%s %s/pagecontent.xsd"' % (
-                NAMESPACES['page'],
-                NAMESPACES['page'],
-                NAMESPACES['page']
-            ))
-    doc = parsexmlstring_(sio.getvalue())  # pylint: disable=undefined-variable
+    from .constants import PAGE_REGION_TYPES # pylint: disable=relative-beyond-top-level,import-outside-toplevel
+    # traverse the segment hierarchy in document order,
+    # collecting (element name, filename) pairs
+    images = []
+    child_names = {}
+    def collect(obj, name):
+        images.extend((name, image.filename) for image in obj.AlternativeImage)
+        class_ = obj.__class__
+        if class_ not in child_names:
+            child_names[class_] = [
+                member.get_name()
+                for base in reversed(class_.__mro__)
+                for member in base.__dict__.get('member_data_items_', [])
+                if member.get_name().endswith('Region')
+                or member.get_name() in ('TextLine', 'Word', 'Glyph')]
+        deferred = obj.__dict__.get('gds_deferred_children_', {})
+        for child_name in child_names[class_]:
+            if child_name in deferred and child_name not in obj.__dict__:
+                # not built yet (cf. parse(depth=...)), so search the nodes
+                for node in deferred[child_name]:
+                    for image in node.iter('{*}AlternativeImage'):
+                        images.append((get_local_name_(image.getparent().tag), image.get('filename'))) # pylint: disable=undefined-variable
+            else:
+                for child in getattr(obj, child_name):
+                    collect(child, child_name)
+    collect(self.get_Page(), 'Page')
+    images = [(name, filename) for name, filename in images if filename is not None]
     # shortcut
     if page and region and line and word and glyph:
-        ret += doc.xpath('//page:AlternativeImage/@filename', namespaces=NAMESPACES)
-    else:
-        if page:
-            ret += doc.xpath('/page:PcGts/page:Page/page:AlternativeImage/@filename', namespaces=NAMESPACES)
-        if region:
-            for class_ in PAGE_REGION_TYPES:
-                ret += doc.xpath('//page:%sRegion/page:AlternativeImage/@filename' % class_, namespaces=NAMESPACES)
-        if line:
-            ret += doc.xpath('//page:TextLine/page:AlternativeImage/@filename', namespaces=NAMESPACES)
-        if word:
-            ret += doc.xpath('//page:Word/page:AlternativeImage/@filename', namespaces=NAMESPACES)
-        if glyph:
-            ret += doc.xpath('//page:Glyph/page:AlternativeImage/@filename', namespaces=NAMESPACES)
-
+        return [filename for _, filename in images]
+    ret = []
+    if page:
+        ret += [filename for name, filename in images if name == 'Page']
+    if region:
+        for class_ in PAGE_REGION_TYPES:
+            ret += [filename for name, filename in images if name == '%sRegion' % class_]
+    if line:
+        ret += [filename for name, filename in images if name == 'TextLine']
+    if word:
+        ret += [filename for name, filename in images if name == 'Word']
+    if glyph:
+        ret += [filename for name, filename in images if name == 'Glyph']
     return ret
@@ -1,44 +1,56 @@
 # pylint: disable=line-too-long,invalid-name,protected-access,missing-module-docstring
+# dispatch table: names of the *Region members of each class (in PAGE_REGION_TYPES order)
+region_member_names_ = {}
+
 def _region_class(self, x): # pylint: disable=unused-argument
     return x.__class__.__name__.replace('RegionType', '')
 
-def _get_recursive_regions(self, regions, level, classes=None):
-    from .constants import PAGE_REGION_TYPES  # pylint: disable=relative-beyond-top-level,import-outside-toplevel
-    if level == 1:
-        # stop recursion, filter classes
-        if classes:
-            return [r for r in regions if self._region_class(r) in classes]
-        if regions and regions[0].__class__.__name__ == 'PageType':
-            regions = regions[1:]
-        return regions
-    # find more regions recursively
-    more_regions = []
-    for region in regions:
-        more_regions.append([])
-        for class_ in PAGE_REGION_TYPES:
-            if class_ == 'Map' and not isinstance(region, PageType): # pylint: disable=undefined-variable
-                # 'Map' is not recursive in 2019 schema
-                continue
-            more_regions[-1] += getattr(region, 'get_{}Region'.format(class_))()
-    if not any(more_regions):
-        return self._get_recursive_regions(regions, 1, classes)
-    ret = []
-    for r, more in zip(regions, more_regions):
-        ret.append(r)
-        ret += self._get_recursive_regions(more, level - 1 if level else 0, classes)
-    return self._get_recursive_regions(ret, 1, classes)
+def _get_child_regions(self, region):
+    class_ = region.__class__
+    names = self.region_member_names_.get(class_)
+    if names is None:
+        from .constants import PAGE_REGION_TYPES  # pylint: disable=relative-beyond-top-level,import-outside-toplevel
+        members = set(member.get_name()
+                      for base in class_.__mro__
+                      for member in base.__dict__.get('member_data_items_', []))
+        # 'Map' is not recursive in 2019 schema, so only a member of PageType
+        names = self.region_member_names_[class_] = [
+            '%sRegion' % type_ for type_ in PAGE_REGION_TYPES
+            if '%sRegion' % type_ in members]
+    return [child for name in names for child in getattr(region, name)]
+
+def _iter_regions(self, classes=None, depth=0):
+    # depth-first (pre-order) traversal without recursion
+    stack = [(region, 1) for region in reversed(self._get_child_regions(self))]
+    while stack:
+        region, level = stack.pop()
+        if not classes or self._region_class(region) in classes:
+            yield region
+        if not depth or level < depth:
+            stack.extend((child, level + 1) for child in reversed(self._get_child_regions(region)))
 
-def _get_recursive_reading_order(self, rogroup):
-    if isinstance(rogroup, (OrderedGroupType, OrderedGroupIndexedType)): # pylint: disable=undefined-variable
-        elements = rogroup.get_AllIndexed()
-    if isinstance(rogroup, (UnorderedGroupType, UnorderedGroupIndexedType)): # pylint: disable=undefined-variable
-        elements = (rogroup.get_RegionRef() + rogroup.get_OrderedGroup() + rogroup.get_UnorderedGroup())
-    regionrefs = list()
-    for elem in elements:
-        regionrefs.append(elem.get_regionRef())
+def _get_reading_order_positions(self):
+    reading_order = self.get_ReadingOrder()
+    if reading_order:
+        reading_order = reading_order.get_OrderedGroup() or reading_order.get_UnorderedGroup()
+    positions = {}
+    if not reading_order:
+        return positions
+    def elements(rogroup):
+        if isinstance(rogroup, (OrderedGroupType, OrderedGroupIndexedType)): # pylint: disable=undefined-variable
+            return iter(rogroup.get_AllIndexed())
+        return iter(rogroup.get_RegionRef() + rogroup.get_OrderedGroup() + rogroup.get_UnorderedGroup())
+    # depth-first (pre-order) traversal without recursion
+    stack = [elements(reading_order)]
+    while stack:
+        elem = next(stack[-1], None)
+        if elem is None:
+            stack.pop()
+            continue
+        positions.setdefault(elem.get_regionRef(), len(positions))
         if not isinstance(elem, (RegionRefType, RegionRefIndexedType)): # pylint: disable=undefined-variable
-            regionrefs.extend(self._get_recursive_reading_order(elem))
-    return regionrefs
+            stack.append(elements(elem))
+    return positions
 
 def get_AllRegions(self, classes=None, order='document', depth=0):
     """
@@ -76,23 +88,14 @@ def get_AllRegions(self, classes=None, order='document', depth=0):
         raise Exception("Argument 'order' must be either 'document', 'reading-order' or 'reading-order-only', not '{}'".format(order))
     if depth < 0:
         raise Exception("Argument 'depth' must be an integer greater-or-equal 0, not '{}'".format(depth))
-    ret = self._get_recursive_regions([self], depth + 1 if depth else 0, classes)
+    ret = list(self._iter_regions(classes, depth))
     if order.startswith('reading-order'):
-        reading_order = self.get_ReadingOrder()
-        if reading_order:
-            reading_order = reading_order.get_OrderedGroup() or reading_order.get_UnorderedGroup()
-        if reading_order:
-            reading_order = self._get_recursive_reading_order(reading_order)
-        if reading_order:
-            id2region = {region.id: region for region in ret}
-            in_reading_order = [id2region[region_id] for region_id in reading_order if region_id in id2region]
-            #  print("ret: {} / in_ro: {} / not-in-ro: {}".format(
-            #      len(ret),
-            #      len([id2region[region_id] for region_id in reading_order if region_id in id2region]),
-            #      len([r for r in ret if r not in in_reading_order])
-            #      ))
+        positions = self._get_reading_order_positions()
+        if positions:
+            in_reading_order = sorted((region for region in ret if region.id in positions),
+                                      key=lambda region: positions[region.id])
             if order == 'reading-order-only':
                 ret = in_reading_order
             else:
-                ret = in_reading_order + [r for r in ret if r not in in_reading_order]
+                ret = in_reading_order + [region for region in ret if region.id not in positions]
     return ret
@@ -15,12 +15,13 @@ def get_AllTextLines(self, region_order='document', respect_textline_order=True)
     """
     # TODO handle textLineOrder according to https://github.com/PRImA-Research-Lab/PAGE-XML/issues/26
     ret = []
+    page_lo = self.get_textLineOrder() or 'top-to-bottom'
     for reg in self.get_AllRegions(['Text'], order=region_order):
         lines = reg.get_TextLine()
         if not respect_textline_order:
             ret += lines
         else:
-            lo = reg.get_textLineOrder() or self.get_textLineOrder() or 'top-to-bottom'
-            ret += lines if lo in ['top-to-bottom', 'left-to-right'] else list(reversed(lines))
+            lo = reg.get_textLineOrder() or page_lo
+            ret += lines if lo in ['top-to-bottom', 'left-to-right'] else lines[::-1]
     return ret
 
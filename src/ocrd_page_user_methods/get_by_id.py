@@ -0,0 +1,28 @@
+# pylint: disable=line-too-long,invalid-name,missing-module-docstring,undefined-variable
+def get_by_id(self, id_):
+    """
+    Get the element (segment or group) with ``@id`` equal to `id_`,
+    or ``None`` if there is none.
+
+    Uses an index of all elements in this document by ID, which is built
+    on first use (also linking each element's ``parent_object_``). The
+    generated setters (``set_*``, ``add_*``, ``insert_*_at``, ``replace_*_at``)
+    add new elements to the index (or drop it when elements with IDs get
+    removed or IDs change, so it is rebuilt on the next lookup), but
+    changes to the lists of children themselves are not tracked.
+    """
+    ids = self.__dict__.get('gds_id_index_')
+    if ids is None:
+        ids = self.gds_id_index_ = {}
+        index_subtrees_(ids, [self])
+    if id_ not in ids:
+        # maybe not built yet (cf. parse(depth=...))
+        deferred = [(obj, name)
+                    for obj in self.__dict__.get('gds_deferred_objects_', [])
+                    for name in obj.__dict__.get('gds_deferred_children_', {})
+                    if name not in obj.__dict__]
+        if deferred:
+            for obj, name in deferred:
+                getattr(obj, name)
+            return self.get_by_id(id_)
+    return ids.get(id_)
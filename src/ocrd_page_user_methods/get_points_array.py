@@ -0,0 +1,21 @@
+def get_points_array(self):
+    """
+    Get the ``@points`` as a read-only numpy array of point pairs
+    (of ``int32``, or ``float64`` if the coordinates are not integers).
+    The array is parsed on first use and cached until ``@points`` changes.
+    """
+    cached = self.__dict__.get('gds_points_array_')
+    if cached is None or cached[0] is not self.points:
+        import numpy as np # pylint: disable=import-outside-toplevel
+        points = self.points
+        values = points.replace(',', ' ').split()
+        if not values or len(values) != 2 * points.count(','):
+            raise ValueError("Invalid points '%s'" % points)
+        try:
+            array = np.array(list(map(int, values)), dtype=np.int32)
+        except ValueError:
+            array = np.array(list(map(float, values)))
+        array = array.reshape(-1, 2)
+        array.flags.writeable = False
+        cached = self.gds_points_array_ = (points, array)
+    return cached[1]
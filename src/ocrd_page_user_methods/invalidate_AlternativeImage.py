@@ -26,6 +26,9 @@ def invalidate_AlternativeImage(self, feature_selector=None):
         name = self.parent_object_.pcGtsId
     else:
         name = ''
+    if self.gds_collector_ is None:
+        # not parsed with validation (or constructed programmatically)
+        return
     for image in removed_images:
         self.gds_collector_.add_message('Removing AlternativeImage %s from "%s"' % (
             image.get_comments() or '', name))
@@ -1,6 +1,8 @@
 def set_points(self, points):
     """
-    Set coordinate polygon by given string.
+    Set coordinate polygon by given string
+    (or by given numeric array of point pairs, which is then also
+    cached for :py:meth:`get_points_array`).
     Moreover, invalidate the parent's ``pc:AlternativeImage``s
     (because they will have been cropped with a bbox
     of the previous polygon).
@@ -13,4 +15,11 @@ def set_points(self, points):
         elif hasattr(parent, 'parent_object_') and hasattr(parent.parent_object_, 'invalidate_AlternativeImage'):
             # BorderType:
             parent.parent_object_.invalidate_AlternativeImage(feature_selector='cropped')
-    self.points = points
+    if isinstance(points, str):
+        self.points = points
+        return
+    import numpy as np # pylint: disable=import-outside-toplevel
+    array = np.array(points).reshape(-1, 2).astype(np.int32)
+    array.flags.writeable = False
+    self.points = " ".join("%i,%i" % (x, y) for x, y in array.tolist())
+    self.gds_points_array_ = (self.points, array)
@@ -12,13 +12,22 @@ Utility functions and constants usable in various circumstances.
     :py:meth:`ocrd.workspace.Workspace.image_from_page` and 
     :py:meth:`ocrd.workspace.Workspace.image_from_segment`.)
 
+* :py:func:`coordinates_of_segments`,
+  :py:func:`coordinates_for_segments`,
+  :py:func:`polygons_from_points`,
+  :py:func:`points_from_polygons`
+
+    These functions do the same for many segments (e.g. all glyphs of a page) at once,
+    parsing, transforming and formatting all of their points in single vectorized operations.
+
 * :py:func:`rotate_coordinates`, 
+  :py:func:`scale_coordinates`,
   :py:func:`shift_coordinates`,
   :py:func:`transpose_coordinates`,
   :py:func:`transform_coordinates`
 
-    These backend functions compose affine transformations for reflection, rotation
-    and offset correction of coordinates, or apply them to a set of points. They can be
+    These backend functions compose affine transformations for reflection, rotation,
+    scaling and offset correction of coordinates, or apply them to a set of points. They can be
     used to pass down the coordinate system along with images (both invariably sharing
     the same operations context) when traversing the element hierarchy top to bottom.
     (Used by :py:class:`ocrd.workspace.Workspace` methods
@@ -32,11 +41,27 @@ Utility functions and constants usable in various circumstances.
     These `PIL.Image` functions are safe replacements for the `rotate`, `crop`, and
     `transpose` methods.
 
+* :py:func:`decode_region`,
+  :py:func:`region_decodable`
+
+    These functions crop images opened from files without decoding all of their pixels
+    (where the file format allows it).
+
+* :py:func:`image_header_from_file`,
+  :py:func:`image_headers_from_files`
+
+    These functions read the pixel dimensions and density of TIFF, PNG, JPEG and JPEG 2000
+    files from their headers only (for one file or many files in parallel).
+
 * :py:func:`image_from_polygon`,
   :py:func:`polygon_mask`
 
     These functions apply polygon masks to `PIL.Image` objects.
 
+* :py:func:`array_from_polygon`
+
+    This function crops and masks `PIL.Image` or `numpy` arrays to a polygon, as `numpy` array.
+
 * :py:func:`xywh_from_points`,
   :py:func:`points_from_xywh`,
   :py:func:`polygon_from_points` etc.
@@ -126,38 +151,9 @@ from .deprecate import (
     rename_kwargs,
     deprecation_warning)
 
-from .image import (
-    adjust_canvas_to_rotation,
-    adjust_canvas_to_transposition,
-    bbox_from_points,
-    bbox_from_polygon,
-    bbox_from_xywh,
-    coordinates_for_segment,
-    coordinates_of_segment,
-    crop_image,
-    image_from_polygon,
-    points_from_bbox,
-    points_from_polygon,
-    points_from_x0y0x1y1,
-    points_from_xywh,
-    points_from_y0x0y1x1,
-    polygon_from_bbox,
-    polygon_from_points,
-    polygon_from_x0y0x1y1,
-    polygon_from_xywh,
-    polygon_mask,
-    rotate_coordinates,
-    rotate_image,
-    shift_coordinates,
-    transform_coordinates,
-    transpose_coordinates,
-    transpose_image,
-    xywh_from_bbox,
-    xywh_from_points,
-    xywh_from_polygon)
-
 from .introspect import (
     freeze_args,
+    lazy_attributes,
     set_json_key_value_overrides,
     membername,
     resource_filename,
@@ -209,3 +205,109 @@ from .str import (
     safe_filename)
 
 from .config import config
+
+# image functions depend on numpy and PIL, so they
+# are only imported on first access
+_LAZY_ATTRIBUTES = {name: '.image' for name in [
+    'adjust_canvas_to_rotation',
+    'adjust_canvas_to_transposition',
+    'array_from_polygon',
+    'bbox_from_points',
+    'bbox_from_polygon',
+    'bbox_from_xywh',
+    'coordinates_for_segment',
+    'coordinates_for_segments',
+    'coordinates_of_segment',
+    'coordinates_of_segments',
+    'crop_image',
+    'decode_region',
+    'image_from_polygon',
+    'image_header_from_file',
+    'image_headers_from_files',
+    'points_from_bbox',
+    'points_from_polygon',
+    'points_from_polygons',
+    'points_from_x0y0x1y1',
+    'points_from_xywh',
+    'points_from_y0x0y1x1',
+    'polygon_from_bbox',
+    'polygon_from_points',
+    'polygon_from_x0y0x1y1',
+    'polygon_from_xywh',
+    'polygon_mask',
+    'polygons_from_points',
+    'region_decodable',
+    'rotate_coordinates',
+    'rotate_image',
+    'scale_coordinates',
+    'shift_coordinates',
+    'transform_coordinates',
+    'transpose_coordinates',
+    'transpose_image',
+    'xywh_from_bbox',
+    'xywh_from_points',
+    'xywh_from_polygon',
+]}
+
+__all__ = [
+    'DEFAULT_METS_BASENAME',
+    'EXT_TO_MIME',
+    'MIMETYPE_PAGE',
+    'MIME_TO_EXT',
+    'MIME_TO_PIL',
+    'PIL_TO_MIME',
+    'REGEX_PREFIX',
+    'REGEX_FILE_ID',
+    'RESOURCE_LOCATIONS',
+    'LOG_FORMAT',
+    'LOG_TIMEFMT',
+    'VERSION',
+    'deprecated_alias',
+    'rename_kwargs',
+    'deprecation_warning',
+    'freeze_args',
+    'lazy_attributes',
+    'set_json_key_value_overrides',
+    'membername',
+    'resource_filename',
+    'resource_string',
+    'dist_version',
+    'tf_disable_interactive_logs',
+    'disableLogging',
+    'getLevelName',
+    'getLogger',
+    'get_logging_config_files',
+    'initLogging',
+    'setOverrideLogLevel',
+    'abspath',
+    'directory_size',
+    'get_processor_resource_types',
+    'get_ocrd_tool_json',
+    'get_moduledir',
+    'guess_media_type',
+    'list_all_resources',
+    'is_file_in_directory',
+    'list_resource_candidates',
+    'atomic_write',
+    'pushd_popd',
+    'unzip_file_to_dir',
+    'redirect_stderr_and_stdout_to_file',
+    'assert_file_grp_cardinality',
+    'concat_padded',
+    'generate_range',
+    'get_local_filename',
+    'is_local_filename',
+    'is_string',
+    'make_file_id',
+    'make_xml_id',
+    'nth_url_segment',
+    'partition_list',
+    'parse_json_string_or_file',
+    'parse_json_string_with_comments',
+    'sparkline',
+    'remove_non_path_from_url',
+    'safe_filename',
+    'config',
+] + list(_LAZY_ATTRIBUTES)
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
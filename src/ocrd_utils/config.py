@@ -7,6 +7,7 @@ OcrdEnvConfig is a base class to make this more streamlined, to be subclassed
 in the `ocrd` package for the actual values
 """
 
+from json import loads
 from os import environ
 from pathlib import Path
 from tempfile import gettempdir
@@ -105,11 +106,52 @@ config.add('OCRD_METS_CACHING',
     validator=lambda val: val in ('true', 'false', '0', '1'),
     parser=lambda val: val in ('true', '1'))
 
+config.add('OCRD_TOOL_JSON_CACHE',
+    description="Whether to cache the `--dump-json` output of processor executables under `XDG_CACHE_HOME` (invalidated when the executable, its distribution's version or its `ocrd-tool.json` changes).",
+    default=(True, True),
+    validator=lambda val: isinstance(val, bool) or str.lower(val) in ('true', 'false', '0', '1'),
+    parser=lambda val: val if isinstance(val, bool) else str.lower(val) in ('true', '1'))
+
 config.add('OCRD_MAX_PROCESSOR_CACHE',
     description="Maximum number of processor instances (for each set of parameters) to be kept in memory (including loaded models) for processing workers or processor servers.",
     parser=int,
     default=(True, 128))
 
+config.add('OCRD_MAX_PROCESSOR_CACHE_RSS',
+    description="Maximum resident set size (in MiB) of the process before idle cached processor instances get evicted (least recently used first). If 0, only `OCRD_MAX_PROCESSOR_CACHE` applies.",
+    parser=int,
+    default=(True, 0))
+
+config.add('OCRD_MAX_IMAGE_CACHE',
+    description="Maximum memory (in MiB) of decoded images to be kept for reuse in each workspace. If 0, images are decoded anew each time.",
+    parser=int,
+    default=(True, 0))
+
+config.add('OCRD_MAX_PYRAMID_CACHE',
+    description="Maximum disk space (in MiB) of downscaled images (for `image_from_page(scale=...)` / `image_from_page(dpi=...)`) to be kept under `XDG_CACHE_HOME` (least recently used first). If 0, downscaled images are not stored on disk.",
+    parser=int,
+    default=(True, 1024))
+
+config.add('OCRD_LAZY_IMAGE_SIZE',
+    description="Minimum size (in MiB, decoded) of images to keep undecoded until pixels are actually needed, so cropping segments only decodes their region (if the file format allows it, e.g. uncompressed TIFF). If 0, images are always decoded fully.",
+    parser=int,
+    default=(True, 0))
+
+config.add('OCRD_IMAGE_SAVE_OPTIONS',
+    description="Keyword arguments to `PIL.Image.save` for each image format in `Workspace.save_image_file`, as JSON object, e.g. `{\"PNG\": {\"compress_level\": 1}, \"TIFF\": {\"compression\": \"tiff_lzw\"}}` for faster encoding. (WebP is always encoded losslessly unless overridden.)",
+    parser=loads,
+    default=(True, '{}'))
+
+config.add('OCRD_IMAGE_SAVE_THREADS',
+    description="Number of threads to encode images from `Workspace.save_image_file` in the background (waited for when saving the METS). If 0, images are encoded synchronously.",
+    parser=int,
+    default=(True, 0))
+
+config.add('OCRD_MAX_DERIVATION_CACHE',
+    description="Maximum memory (in MiB) of images derived by `image_from_page` / `image_from_segment` (cropped, masked, rotated) to be kept for reuse across all workspaces of the process. If 0, images are derived anew each time. (Images passed down as parent image must not be modified in-place then.)",
+    parser=int,
+    default=(True, 0))
+
 config.add("OCRD_PROFILE",
     description="""\
 Whether to enable gathering runtime statistics
@@ -117,13 +159,20 @@ on the `ocrd.profile` logger (comma-separated):
 - `CPU`: yields CPU and wall-time,
 - `RSS`: also yields peak memory (resident set size)
 - `PSS`: also yields peak memory (proportional set size)
+- `PAGE`: process each page separately and yield per-page metrics
+  (wall and CPU time, peak memory, input and output bytes, images decoded);
+  fails if input files have no page ID
 """,
-  validator=lambda val : all(t in ('', 'CPU', 'RSS', 'PSS') for t in val.split(',')),
+  validator=lambda val : all(t in ('', 'CPU', 'RSS', 'PSS', 'PAGE') for t in val.split(',')),
   default=(True, ''))
 
 config.add("OCRD_PROFILE_FILE",
     description="If set, then the CPU profile is written to this file for later peruse with a analysis tools like snakeviz")
 
+config.add("OCRD_PROFILE_PAGE_FILE",
+    description="If set, then per-page metrics (with `OCRD_PROFILE=PAGE`) are appended to this file as JSON lines, or written in Prometheus text format if the file name ends in `.prom`. Otherwise they are logged on `ocrd.process.profile`.",
+    default=(True, ''))
+
 config.add("OCRD_DOWNLOAD_RETRIES",
     description="Number of times to retry failed attempts for downloads of workspace files.",
     validator=int,
@@ -168,6 +217,11 @@ config.add("OCRD_NETWORK_RABBITMQ_CLIENT_CONNECT_ATTEMPTS",
     parser=int,
     default=(True, 3))
 
+config.add("OCRD_NETWORK_WORKER_PREFORK",
+    description="Number of processes a Processing Worker forks to consume from its queue after loading the processor once (sharing its models copy-on-write). If 0 or 1, consume in a single process.",
+    parser=int,
+    default=(True, 0))
+
 config.add(name="OCRD_NETWORK_SOCKETS_ROOT_DIR",
            description="The root directory where all mets server related socket files are created",
            parser=lambda val: Path(val),
@@ -197,6 +251,11 @@ config.add("XDG_CONFIG_HOME",
     parser=lambda val: Path(val),
     default=(True, lambda: Path(config.HOME, '.config')))
 
+config.add("XDG_CACHE_HOME",
+    description="Directory to look for `./ocrd/ocrd-tool/*.json` (i.e. cached `--dump-json` output of processors) and `./ocrd/pyramid/*.png` (i.e. cached downscaled images for `image_from_page(scale=...)`, cf. `OCRD_MAX_PYRAMID_CACHE`)",
+    parser=lambda val: Path(val),
+    default=(True, lambda: Path(config.HOME, '.cache')))
+
 config.add("OCRD_LOGGING_DEBUG",
     description="Print information about the logging setup to STDERR",
     default=(True, False),
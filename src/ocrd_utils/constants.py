@@ -30,6 +30,7 @@ EXT_TO_MIME = {
     '.jpeg': 'image/jpeg',
     '.xml': MIMETYPE_PAGE,
     '.jp2': 'image/jp2',
+    '.webp': 'image/webp',
     '.pdf': 'application/pdf',
     '.ps': 'application/postscript',
     '.eps': 'application/postscript',
@@ -55,6 +56,7 @@ MIME_TO_EXT = {
     MIMETYPE_PAGE: '.xml',
     'application/alto+xml': '.xml',
     'image/jp2': '.jp2',
+    'image/webp': '.webp',
     'application/pdf': '.pdf',
     'application/postscript': '.ps',
     'application/oxps': '.xps',
@@ -84,6 +86,7 @@ PIL_TO_MIME = {
     'PNG':  'image/png',
     'PPM':  'image/x-portable-pixmap',
     'TIFF': 'image/tiff',
+    'WEBP': 'image/webp',
 }
 
 MIME_TO_PIL = {
@@ -95,6 +98,7 @@ MIME_TO_PIL = {
     'image/png': 'PNG',
     'image/x-portable-pixmap': 'PPM',
     'image/tiff': 'TIFF',
+    'image/webp': 'WEBP',
 }
 
 # Prefix to denote query is regular expression not fixed string
@@ -1,7 +1,10 @@
 import sys
+import struct
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
-from PIL import Image, ImageStat, ImageDraw, ImageChops
+from PIL import Image, ImageStat, ImageDraw, ImageChops, ImageColor
 
 from .logging import getLogger
 from .introspect import membername
@@ -13,14 +16,21 @@ Image.MAX_IMAGE_PIXELS = 40_000 ** 2
 __all__ = [
     'adjust_canvas_to_rotation',
     'adjust_canvas_to_transposition',
+    'array_from_polygon',
     'bbox_from_points',
     'bbox_from_polygon',
     'bbox_from_xywh',
     'coordinates_for_segment',
+    'coordinates_for_segments',
     'coordinates_of_segment',
+    'coordinates_of_segments',
+    'decode_region',
     'image_from_polygon',
+    'image_header_from_file',
+    'image_headers_from_files',
     'points_from_bbox',
     'points_from_polygon',
+    'points_from_polygons',
     'points_from_x0y0x1y1',
     'points_from_xywh',
     'points_from_y0x0y1x1',
@@ -29,6 +39,8 @@ __all__ = [
     'polygon_from_x0y0x1y1',
     'polygon_from_xywh',
     'polygon_mask',
+    'polygons_from_points',
+    'region_decodable',
     'rotate_coordinates',
     'shift_coordinates',
     'scale_coordinates',
@@ -133,11 +145,43 @@ def coordinates_of_segment(segment, parent_image, parent_coords):
     Return the rounded numpy array of the resulting polygon.
     """
     # get polygon:
-    polygon = np.array(polygon_from_points(segment.get_Coords().points))
+    polygon = segment.get_Coords().get_points_array()
     # apply affine transform:
     polygon = transform_coordinates(polygon, parent_coords['transform'])
     return np.round(polygon).astype(np.int32)
 
+def coordinates_of_segments(segments, parent_image, parent_coords):
+    """Extract the coordinates of many PAGE segment elements relative to their parent.
+
+    Batch version of :py:func:`coordinates_of_segment` for a sequence of
+    ``segments`` sharing the same ``parent_image`` (not used) and ``parent_coords``:
+    parse all their points at once, and apply the transform in a single
+    matrix multiplication.
+
+    Return a list of rounded numpy arrays of the resulting polygons.
+    """
+    polygons, lengths = polygons_from_points(
+        [segment.get_Coords().points for segment in segments])
+    polygons = transform_coordinates(polygons, parent_coords['transform'])
+    polygons = np.round(polygons).astype(np.int32)
+    return np.split(polygons, np.cumsum(lengths)[:-1]) if len(lengths) else []
+
+def polygons_from_points(points_list):
+    """
+    Convert a sequence of polygon coordinates in page representation to a
+    single numpy array of all their points (in numeric representation),
+    along with a numpy array of the number of points of each polygon.
+
+    (Use ``numpy.split(polygons, numpy.cumsum(lengths)[:-1])`` to get
+    the individual polygons.)
+    """
+    points_list = list(points_list)
+    lengths = np.array([points.count(',') for points in points_list], dtype=int)
+    polygons = np.fromstring(' '.join(points_list).replace(',', ' '), dtype=float, sep=' ')
+    if len(polygons) != 2 * lengths.sum():
+        raise ValueError("Invalid points in %s" % points_list)
+    return polygons.reshape(-1, 2), lengths
+
 def polygon_from_points(points):
     """
     Convert polygon coordinates in page representation to polygon coordinates in numeric list representation.
@@ -182,6 +226,27 @@ def coordinates_for_segment(polygon, parent_image, parent_coords):
     polygon = transform_coordinates(polygon, inv_transform)
     return np.round(polygon).astype(np.int32)
 
+def coordinates_for_segments(polygons, parent_image, parent_coords):
+    """Convert many relative coordinates to absolute.
+
+    Batch version of :py:func:`coordinates_for_segment` for a sequence
+    of ``polygons`` sharing the same ``parent_image`` (not used) and
+    ``parent_coords``: apply the inverse transform in a single
+    matrix multiplication.
+
+    Return a list of rounded numpy arrays of the resulting polygons.
+    """
+    lengths = [len(polygon) for polygon in polygons]
+    if not lengths:
+        return []
+    polygons = np.concatenate([np.array(polygon, dtype=np.float32).reshape(-1, 2)
+                               for polygon in polygons])
+    # apply inverse of affine transform:
+    inv_transform = np.linalg.inv(parent_coords['transform'])
+    polygons = transform_coordinates(polygons, inv_transform)
+    polygons = np.round(polygons).astype(np.int32)
+    return np.split(polygons, np.cumsum(lengths)[:-1])
+
 def polygon_mask(image, coordinates):
     """"Create a mask image of a polygon.
 
@@ -479,6 +544,224 @@ def crop_image(image, box=None):
     new_image.paste(image, (-xywh['x'], -xywh['y']))
     return new_image
 
+def region_decodable(image):
+    """Whether :py:func:`decode_region` can avoid decoding all of the (not yet loaded) PIL.Image ``image``.
+
+    This is the case for images opened from files storing pixels uncompressed
+    (e.g. uncompressed TIFF, BMP, PNM), where rows and tiles can be decoded individually.
+    """
+    tiles = getattr(image, 'tile', None)
+    return bool(tiles) and all(tile[0] == 'raw' for tile in tiles) and bool(getattr(image, 'filename', None))
+
+def decode_region(image, box):
+    """Crop an image to a rectangle, decoding as little as possible.
+
+    Given a PIL.Image ``image`` and a list ``box`` of the bounding
+    rectangle relative to the image, crop at the box coordinates
+    (like PIL.Image.crop, i.e. filling everything outside ``image``
+    with black).
+
+    If ``image`` has been opened from a file but not loaded yet, and
+    stores its pixels uncompressed (cf. :py:func:`region_decodable`),
+    then only decode those rows of the tiles or strips intersecting ``box``
+    (leaving ``image`` itself unloaded). Otherwise, decode the full image.
+
+    Return a new PIL.Image.
+    """
+    box = tuple(map(int, box))
+    if not region_decodable(image):
+        return image.crop(box)
+    tiles = []
+    for _, extents, offset, args in image.tile:
+        x0, y0, x1, y1 = extents
+        if not (x0 < box[2] and box[0] < x1 and y0 < box[3] and box[1] < y1):
+            continue
+        rawmode, stride, ystep = (args, 0, 1) if isinstance(args, str) else (tuple(args) + (0, 1))[:3]
+        top, bottom = max(y0, box[1]), min(y1, box[3])
+        if (top, bottom) != (y0, y1):
+            # skip the rows outside of box
+            try:
+                row_size = stride or len(Image.new(image.mode, (x1 - x0, 1)).tobytes('raw', rawmode))
+            except ValueError:
+                return image.crop(box)
+            offset += (top - y0 if ystep > 0 else y1 - bottom) * row_size
+        tiles.append(('raw', (x0, top, x1, bottom), offset, (rawmode, stride, ystep)))
+    if not tiles:
+        return Image.new(image.mode, (box[2] - box[0], box[3] - box[1]))
+    try:
+        region = Image.open(image.filename)
+    except OSError:
+        return image.crop(box)
+    if region.size != image.size or region.tile != image.tile:
+        return image.crop(box)
+    region.tile = tiles
+    # avoid memory-mapping the first tile as if it was the whole image:
+    region.filename = ''
+    # (only the decoded rows of the image's memory actually get used)
+    region.load()
+    return region.crop(box)
+
+def image_header_from_file(filename):
+    """Read the pixel dimensions and density of an image file from its header.
+
+    Given a path ``filename`` of a TIFF, PNG, JPEG or JPEG 2000 file,
+    parse only the first bytes of the file (and the few structures they
+    point to) without decoding pixels or creating a PIL.Image.
+
+    Return an :py:class:`ImageHeader` with ``width``, ``height``,
+    ``xResolution``, ``yResolution`` and ``resolutionUnit`` (consistent with
+    :py:class:`ocrd_models.ocrd_exif.OcrdExif`), or ``None`` if the format
+    is not supported or the header cannot be parsed.
+    """
+    try:
+        with open(filename, 'rb') as f:
+            magic = f.read(12)
+            f.seek(0)
+            if magic[:4] in (b'II*\0', b'MM\0*'):
+                header = _tiff_header(f)
+            elif magic[:8] == b'\x89PNG\r\n\x1a\n':
+                header = _png_header(f)
+            elif magic[:3] == b'\xff\xd8\xff':
+                header = _jpeg_header(f)
+            elif magic == b'\0\0\0\x0cjP  \r\n\x87\n':
+                header = _jp2_header(f)
+            else:
+                return None
+    except (OSError, struct.error, ValueError, ZeroDivisionError):
+        return None
+    if not header or not header[0] or not header[1]:
+        return None
+    width, height, xres, yres, unit = header
+    return ImageHeader(width, height, max(int(xres), 1), max(int(yres), 1), unit)
+
+def image_headers_from_files(filenames, max_workers=None):
+    """Read the headers of many image files in parallel.
+
+    Like :py:func:`image_header_from_file`, but for a list of paths ``filenames``,
+    using a pool of ``max_workers`` threads (as file access dominates).
+
+    Return a list of :py:class:`ImageHeader` (or ``None``) in the same order.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(image_header_from_file, filenames))
+
+ImageHeader = namedtuple('ImageHeader', ['width', 'height', 'xResolution', 'yResolution', 'resolutionUnit'])
+
+def _tiff_tags(f, start, wanted):
+    # parse the first IFD of a TIFF structure at start, return wanted tag values
+    f.seek(start)
+    order = '<' if f.read(2) == b'II' else '>'
+    magic, offset = struct.unpack(order + 'HI', f.read(6))
+    if magic != 42:
+        raise ValueError('not a classic TIFF')
+    f.seek(start + offset)
+    count, = struct.unpack(order + 'H', f.read(2))
+    entries = f.read(12 * count)
+    values = {}
+    for i in range(count):
+        tag, typ, num, value = struct.unpack(order + 'HHI4s', entries[12 * i:12 * i + 12])
+        if tag not in wanted:
+            continue
+        if typ == 3: # SHORT
+            values[tag] = struct.unpack(order + 'H', value[:2])[0]
+        elif typ == 4: # LONG
+            values[tag] = struct.unpack(order + 'I', value)[0]
+        elif typ in (5, 10): # (S)RATIONAL
+            f.seek(start + struct.unpack(order + 'I', value)[0])
+            num, den = struct.unpack(order + ('II' if typ == 5 else 'ii'), f.read(8))
+            values[tag] = num / den if den else 0
+    return values
+
+def _tiff_header(f):
+    tags = _tiff_tags(f, 0, (256, 257, 282, 283, 296))
+    return (tags.get(256), tags.get(257), tags.get(282, 0), tags.get(283, 0),
+            'cm' if tags.get(296) == 3 else 'inches')
+
+def _png_header(f):
+    f.seek(8)
+    width = height = None
+    xres, yres, unit = 0, 0, 'inches'
+    while True:
+        length, chunk = struct.unpack('>I4s', f.read(8))
+        if chunk == b'IHDR':
+            width, height = struct.unpack('>II', f.read(8))
+            length -= 8
+        elif chunk == b'pHYs':
+            xres, yres, meter = struct.unpack('>IIB', f.read(9))
+            length -= 9
+            if meter:
+                # pixels per meter, reported as pixels per centimeter
+                xres, yres, unit = xres / 100, yres / 100, 'cm'
+        elif chunk in (b'IDAT', b'IEND'):
+            break
+        f.seek(length + 4, 1) # skip data and CRC
+    return width, height, xres, yres, unit
+
+def _jpeg_header(f):
+    f.seek(2)
+    width = height = None
+    jfif = exif = None
+    while width is None:
+        marker, length = struct.unpack('>2sH', f.read(4))
+        if marker[0] != 0xff:
+            raise ValueError('invalid JPEG marker')
+        if marker[1] in (0xc0, 0xc1, 0xc2, 0xc3, 0xc5, 0xc6, 0xc7,
+                         0xc9, 0xca, 0xcb, 0xcd, 0xce, 0xcf): # SOFn
+            height, width = struct.unpack('>xHH', f.read(5))
+            break
+        data_start = f.tell()
+        if marker[1] == 0xe0 and jfif is None: # APP0
+            data = f.read(min(length - 2, 12))
+            if data[:5] == b'JFIF\0':
+                unit, xres, yres = struct.unpack('>BHH', data[7:12])
+                jfif = (xres, yres, 'cm' if unit == 2 else 'inches')
+        elif marker[1] == 0xe1 and exif is None: # APP1
+            if f.read(6) == b'Exif\0\0':
+                exif = f.tell()
+        elif marker[1] == 0xda: # SOS without SOF
+            break
+        f.seek(data_start + length - 2)
+    if jfif:
+        return (width, height) + jfif
+    if exif is not None:
+        tags = _tiff_tags(f, exif, (282, 283, 296))
+        return (width, height, tags.get(282, 0), tags.get(283, 0),
+                'cm' if tags.get(296) == 3 else 'inches')
+    return width, height, 0, 0, 'inches'
+
+def _jp2_header(f):
+    def boxes(end):
+        while f.tell() < end:
+            length, box = struct.unpack('>I4s', f.read(8))
+            start = f.tell()
+            if length == 1:
+                length, = struct.unpack('>Q', f.read(8))
+                start += 8
+                length -= 8
+            elif length == 0:
+                length = end - start + 8
+            yield box, start, start + length - 8
+            f.seek(start + length - 8)
+    width = height = None
+    xres = yres = 0
+    for box, start, end in boxes(float('inf')):
+        if box != b'jp2h':
+            continue
+        for subbox, _, subend in boxes(end):
+            if subbox == b'ihdr':
+                height, width = struct.unpack('>II', f.read(8))
+            elif subbox == b'res ':
+                for resbox, _, _ in boxes(subend):
+                    if resbox == b'resc':
+                        vrcn, vrcd, hrcn, hrcd, vrce, hrce = struct.unpack('>HHHHbb', f.read(10))
+                        if vrcn and vrcd and hrcn and hrcd:
+                            # pixels per meter (with exponent), as DPI
+                            xres = hrcn * 10 ** hrce / hrcd * 0.0254
+                            yres = vrcn * 10 ** vrce / vrcd * 0.0254
+                        break
+        break
+    return width, height, xres, yres, 'inches'
+
 def image_from_polygon(image, polygon, fill='background', transparency=False):
     """"Mask an image with a polygon.
 
@@ -500,12 +783,17 @@ def image_from_polygon(image, polygon, fill='background', transparency=False):
     
     Return a new PIL.Image.
     """
+    # only the pixels ImageDraw.polygon fills (i.e. the polygon's bounding box
+    # including its last row and column) need to be masked and measured:
+    polygon = np.asarray(polygon)
+    box = _polygon_mask_box(polygon, image.width, image.height)
+    box_image = decode_region(image, box)
+    box_mask = polygon_mask(box_image, polygon - box[:2])
     if fill == 'none' or fill is None:
         new_image = image.copy()
     else:
-        mask = polygon_mask(image, polygon)
         if fill == 'background':
-            background = ImageStat.Stat(image, mask=mask)
+            background = ImageStat.Stat(box_image, mask=box_mask)
             if len(background.bands) > 1:
                 background = tuple(background.median)
             else:
@@ -513,21 +801,125 @@ def image_from_polygon(image, polygon, fill='background', transparency=False):
         else:
             background = fill
         new_image = Image.new(image.mode, image.size, background)
-        new_image.paste(image, mask=mask)
+        new_image.paste(box_image, box[:2], mask=box_mask)
     # ensure no information is lost by a adding transparency channel
     # initialized to fully transparent outside the polygon mask
     # (so consumers do not have to rely on background estimation,
     #  which can fail on foreground-dominated segments, or white,
     #  which can be inconsistent on unbinarized images):
-    if image.mode in ['RGBA', 'LA']:
-        # ensure transparency maximizes (i.e. parent mask AND mask):
-        mask = ImageChops.darker(mask, image.getchannel('A')) # min opaque
-        new_image.putalpha(mask)
-    elif transparency and image.mode in ['RGB', 'L']:
+    if image.mode in ['RGBA', 'LA'] or (transparency and image.mode in ['RGB', 'L']):
+        mask = Image.new('L', image.size, 0)
+        mask.paste(box_mask, box[:2])
+        if image.mode in ['RGBA', 'LA']:
+            # ensure transparency maximizes (i.e. parent mask AND mask):
+            mask = ImageChops.darker(mask, image.getchannel('A')) # min opaque
         # introduce transparency:
         new_image.putalpha(mask)
     return new_image
 
+def _polygon_mask_box(polygon, width, height):
+    # bounding box of the pixels filled by ImageDraw.polygon (which includes
+    # the last row and column), clipped to the image
+    minx, miny, maxx, maxy = bbox_from_polygon(polygon)
+    x0, y0 = max(int(np.floor(minx)), 0), max(int(np.floor(miny)), 0)
+    x1 = max(min(int(np.ceil(maxx)) + 1, width), x0)
+    y1 = max(min(int(np.ceil(maxy)) + 1, height), y0)
+    return x0, y0, x1, y1
+
+def array_from_polygon(image, polygon, fill='background', transparency=False):
+    """"Crop and mask an image with a polygon, as numpy array.
+
+    Given a PIL.Image or numpy array ``image`` and a numpy array ``polygon``
+    of relative coordinates into the image, crop to the bounding box
+    of the polygon, and fill everything outside the polygon hull
+    according to ``fill`` and ``transparency`` (like :py:func:`image_from_polygon`
+    followed by :py:func:`crop_image` with the bounding box).
+
+    Unlike these, only pixels inside the polygon's mask (i.e. the bounding box
+    and its last row and column) are ever touched: the image is cropped first
+    (as a view, if it already is an array), and the background median is
+    computed on the cropped region only.
+
+    Return a new numpy array (of shape `(height, width)` for images with
+    one band, or `(height, width, bands)` otherwise, and boolean for bitonal images).
+    """
+    LOG = getLogger('ocrd.utils.array_from_polygon')
+    polygon = np.asarray(polygon)
+    if isinstance(image, Image.Image):
+        width, height = image.size
+    else:
+        height, width = image.shape[:2]
+    minx, miny, maxx, maxy = map(int, bbox_from_polygon(polygon))
+    x0, y0 = max(minx, 0), max(miny, 0)
+    x1, y1 = max(min(maxx, width), x0), max(min(maxy, height), y0)
+    # mask and measure the pixels filled by the polygon, but
+    # return the bounding box only (like crop_image):
+    _, _, x2, y2 = _polygon_mask_box(polygon, width, height)
+    if isinstance(image, Image.Image):
+        array = np.asarray(decode_region(image, (x0, y0, x2, y2)))
+    else:
+        array = image[y0:y2, x0:x2]
+    binary = array.dtype == bool
+    if binary:
+        array = array.astype(np.uint8) * 255
+    bands = 1 if array.ndim == 2 else array.shape[2]
+    mode = {1: 'L', 2: 'LA', 3: 'RGB', 4: 'RGBA'}[bands]
+    mask = Image.new('L', (x2 - x0, y2 - y0), 0)
+    ImageDraw.Draw(mask).polygon(list(map(tuple, polygon - [x0, y0])), outline=0, fill=255)
+    mask = np.asarray(mask)
+    if fill == 'none' or fill is None:
+        new_array = array.copy()
+    else:
+        if fill == 'background':
+            background = _median(array, mask)
+        else:
+            background = ImageColor.getcolor(fill, mode) if isinstance(fill, str) else fill
+        new_array = np.where(mask if bands == 1 else mask[:, :, np.newaxis],
+                             array, np.array(background, dtype=array.dtype))
+    if mode in ['RGBA', 'LA']:
+        # ensure transparency maximizes (i.e. parent mask AND mask):
+        new_array[:, :, -1] = np.minimum(mask, new_array[:, :, -1])
+    elif transparency and not binary:
+        # introduce transparency:
+        new_array = np.dstack([new_array, mask])
+    if (minx, miny, maxx, maxy) != (x0, y0, x1, y1):
+        # (It should be invalid in PAGE-XML to extend beyond parents.)
+        LOG.warning('crop coordinates (%s) exceed image (%dx%d)',
+                    str((minx, miny, maxx, maxy)), width, height)
+        # fill with median of the bounding box (as in crop_image)
+        mask = Image.new('L', (x2 - x0, y2 - y0), 0)
+        ImageDraw.Draw(mask).polygon(list(map(tuple, np.array(
+            polygon_from_bbox(minx, miny, maxx, maxy)) - [x0, y0])), outline=0, fill=255)
+        background = _median(new_array, np.asarray(mask))
+        cropped = new_array[:y1 - y0, :x1 - x0]
+        new_array = np.empty((maxy - miny, maxx - minx) + cropped.shape[2:], dtype=cropped.dtype)
+        new_array[...] = background
+        new_array[y0 - miny:y1 - miny, x0 - minx:x1 - minx] = cropped
+    else:
+        new_array = new_array[:y1 - y0, :x1 - x0]
+    if binary:
+        new_array = new_array > 0
+    return new_array
+
+def _median(array, mask=None):
+    """
+    Median color of an 8-bit numpy ``array`` under ``mask``
+    (with the same result as ``ImageStat.Stat.median``).
+    """
+    if array.ndim == 2:
+        array = array[:, :, np.newaxis]
+    if mask is None:
+        values = array.reshape(-1, array.shape[2])
+    else:
+        values = array[mask > 0]
+    median = []
+    for band in values.T:
+        cumhist = np.cumsum(np.bincount(band, minlength=256))
+        median.append(min(int(np.searchsorted(cumhist, len(band) // 2, side='right')), 255))
+    if len(median) > 1:
+        return tuple(median)
+    return median[0]
+
 def points_from_bbox(minx, miny, maxx, maxy):
     """Construct polygon coordinates in page representation from a numeric list representing a bounding box."""
     return "%i,%i %i,%i %i,%i %i,%i" % (
@@ -537,6 +929,23 @@ def points_from_polygon(polygon):
     """Convert polygon coordinates from a numeric list representation to a page representation."""
     return " ".join("%i,%i" % (x, y) for x, y in polygon)
 
+def points_from_polygons(polygons):
+    """
+    Convert a sequence of polygon coordinates from a numeric list representation
+    to a list of page representations (in a single formatting operation).
+
+    For example, to write back the results of :py:func:`coordinates_for_segments`::
+
+        for segment, points in zip(segments, points_from_polygons(polygons)):
+            segment.get_Coords().set_points(points)
+    """
+    lengths = [len(polygon) for polygon in polygons]
+    if not lengths:
+        return []
+    values = np.concatenate([np.reshape(polygon, (-1, 2)) for polygon in polygons])
+    template = "\n".join(" ".join(["%i,%i"] * length) for length in lengths)
+    return (template % tuple(values.ravel().tolist())).split("\n")
+
 def points_from_xywh(box):
     """
     Construct polygon coordinates in page representation from numeric dict representing a bounding box.
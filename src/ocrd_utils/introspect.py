@@ -3,6 +3,8 @@ Utility functions to simplify access to data structures.
 """
 import json
 from functools import wraps
+from importlib import import_module
+from importlib.util import find_spec
 from pathlib import Path
 from frozendict import frozendict
 import atexit
@@ -60,3 +62,26 @@ def resource_string(pkg : str, fname : str) -> str:
 
 def dist_version(module : str) -> str:
     return importlib_metadata.version(module)
+
+def lazy_attributes(module_name : str, attributes : dict):
+    """
+    Make the ``attributes`` of module ``module_name`` import on first access (PEP 562).
+
+    ``attributes`` maps each attribute name to the name of the module defining it
+    (which may be relative to ``module_name``'s package). Other names are imported
+    as submodules of ``module_name``, if they exist (like after an eager import).
+    Returns the module-level ``__getattr__`` and ``__dir__`` functions, to be assigned
+    by the caller.
+    """
+    module = sys.modules[module_name]
+    def __getattr__(name):
+        if name not in attributes:
+            if not name.startswith('__') and find_spec(f'{module_name}.{name}') is not None:
+                return import_module(f'{module_name}.{name}')
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        value = getattr(import_module(attributes[name], module.__package__), name)
+        setattr(module, name, value)
+        return value
+    def __dir__():
+        return sorted(set(vars(module)) | set(attributes))
+    return __getattr__, __dir__
@@ -17,9 +17,11 @@ __all__ = [
 
 from tempfile import TemporaryDirectory, gettempdir
 from functools import lru_cache
+from hashlib import sha1
+from importlib.util import find_spec
 from contextlib import contextmanager, redirect_stderr, redirect_stdout
 from shutil import which
-from json import loads
+from json import dumps, loads
 from json.decoder import JSONDecodeError
 from os import getcwd, chdir, stat, chmod, umask, environ
 from pathlib import Path
@@ -34,7 +36,7 @@ from atomicwrites import atomic_write as atomic_write_, AtomicWriter
 from .constants import EXT_TO_MIME
 from .config import config
 from .logging import getLogger
-from .introspect import resource_string
+from .introspect import resource_string, importlib_metadata
 
 def abspath(url):
     """
@@ -87,13 +89,86 @@ def get_ocrd_tool_json(executable):
         ocrd_tool = ocrd_all_tool[executable]
     except (JSONDecodeError, OSError, KeyError):
         try:
-            ocrd_tool = loads(run([executable, '--dump-json'], stdout=PIPE).stdout)
+            ocrd_tool = _dump_ocrd_tool_json(executable)
         except (JSONDecodeError, OSError) as e:
             getLogger('ocrd.utils.get_ocrd_tool_json').error(f'{executable} --dump-json produced invalid JSON: {e}')
     if 'resource_locations' not in ocrd_tool:
         ocrd_tool['resource_locations'] = ['data', 'cwd', 'system', 'module']
     return ocrd_tool
 
+def _dump_ocrd_tool_json(executable):
+    """
+    Run ``executable --dump-json``, but reuse earlier results cached under
+    ``$XDG_CACHE_HOME/ocrd/ocrd-tool`` (unless ``OCRD_TOOL_JSON_CACHE`` is false)
+    as long as the installation is unchanged (cf. :py:func:`_ocrd_tool_json_cache_key`).
+    """
+    cache_file = None
+    path = which(executable)
+    if path and config.OCRD_TOOL_JSON_CACHE:
+        key = _ocrd_tool_json_cache_key(executable, Path(path).resolve())
+        cache_file = Path(config.XDG_CACHE_HOME, 'ocrd', 'ocrd-tool',
+                          sha1(key.encode('utf-8')).hexdigest() + '.json')
+        try:
+            return loads(cache_file.read_text(encoding='utf-8'))
+        except (JSONDecodeError, OSError):
+            pass
+    ocrd_tool = loads(run([executable, '--dump-json'], stdout=PIPE).stdout)
+    if cache_file:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with atomic_write(cache_file) as f:
+                f.write(dumps(ocrd_tool))
+        except OSError as e:
+            getLogger('ocrd.utils.get_ocrd_tool_json').debug(f'Cannot cache ocrd-tool.json of {executable}: {e}')
+    return ocrd_tool
+
+def _ocrd_tool_json_cache_key(executable, path):
+    """
+    Identify the installation of ``executable`` at ``path``: the script itself
+    (resolved path, size and modification time) and, if it is a Python entry point,
+    the version of its distribution and the size and modification time of the
+    nearest ``ocrd-tool.json`` files in its package (which also covers editable installs,
+    where neither the script nor the version change).
+    """
+    path_stat = stat(path)
+    key = f'{path}:{path_stat.st_size}:{path_stat.st_mtime_ns}'
+    for dist in importlib_metadata.distributions():
+        entry_point = next((ep for ep in dist.entry_points
+                            if ep.group == 'console_scripts' and ep.name == executable), None)
+        if entry_point is None:
+            continue
+        key += f':{dist.metadata["Name"]}=={dist.version}'
+        for tool_json in _find_ocrd_tool_jsons(entry_point.value.split(':')[0].strip()):
+            tool_json_stat = stat(tool_json)
+            key += f':{tool_json}:{tool_json_stat.st_size}:{tool_json_stat.st_mtime_ns}'
+        break
+    return key
+
+def _find_ocrd_tool_jsons(module):
+    """
+    Find the ``ocrd-tool.json`` files closest to Python ``module`` (in its directory
+    or that of a parent package, or else in their immediate subdirectories),
+    without importing anything.
+    """
+    package, *submodules = module.split('.')
+    try:
+        spec = find_spec(package)
+    except (ImportError, ValueError):
+        return []
+    if not spec or not spec.submodule_search_locations:
+        return []
+    package_dir = Path(next(iter(spec.submodule_search_locations)))
+    module_dir = package_dir.joinpath(*submodules[:-1])
+    for directory in [module_dir] + list(module_dir.parents):
+        if (directory / 'ocrd-tool.json').exists():
+            return [directory / 'ocrd-tool.json']
+        tool_jsons = sorted(directory.glob('*/ocrd-tool.json'))
+        if tool_jsons:
+            return tool_jsons
+        if directory == package_dir:
+            break
+    return []
+
 @lru_cache()
 def get_moduledir(executable):
     moduledir = None
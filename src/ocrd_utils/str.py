@@ -8,7 +8,6 @@ from typing import List, Union
 from .constants import REGEX_FILE_ID, SPARKLINE_CHARS
 from .deprecate import deprecation_warning
 from warnings import warn
-from numpy import array_split
 
 __all__ = [
     'assert_file_grp_cardinality',
@@ -245,6 +244,7 @@ def partition_list(lst, chunks, chunk_index=None):
     #  which are problematic in the ocr-d scope
     if chunks > len(lst):
         raise ValueError("Amount of chunks bigger than list size")
+    from numpy import array_split
     ret = [x.tolist() for x in array_split(lst, chunks)]
     if chunk_index is not None:
         return [ret[chunk_index]]
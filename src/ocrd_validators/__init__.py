@@ -3,6 +3,7 @@ Validators for various OCR-D related data structures.
 """
 __all__ = [
     'ParameterValidator',
+    'get_parameter_validator',
     'WorkspaceValidator',
     'PageValidator',
     'OcrdToolValidator',
@@ -15,14 +16,22 @@ __all__ = [
     'OcrdNetworkMessageValidator'
 ]
 
-from .parameter_validator import ParameterValidator
-from .workspace_validator import WorkspaceValidator
-from .page_validator import PageValidator
-from .ocrd_tool_validator import OcrdToolValidator
-from .resource_list_validator import OcrdResourceListValidator
-from .ocrd_zip_validator import OcrdZipValidator
-from .xsd_validator import XsdValidator
-from .xsd_mets_validator import XsdMetsValidator
-from .xsd_page_validator import XsdPageValidator
-from .processing_server_config_validator import ProcessingServerConfigValidator
-from .ocrd_network_message_validator import OcrdNetworkMessageValidator
+from ocrd_utils import lazy_attributes
+
+# Validators are only imported on first access
+_LAZY_ATTRIBUTES = {
+    'ParameterValidator': '.parameter_validator',
+    'get_parameter_validator': '.parameter_validator',
+    'WorkspaceValidator': '.workspace_validator',
+    'PageValidator': '.page_validator',
+    'OcrdToolValidator': '.ocrd_tool_validator',
+    'OcrdResourceListValidator': '.resource_list_validator',
+    'OcrdZipValidator': '.ocrd_zip_validator',
+    'XsdValidator': '.xsd_validator',
+    'XsdMetsValidator': '.xsd_mets_validator',
+    'XsdPageValidator': '.xsd_page_validator',
+    'ProcessingServerConfigValidator': '.processing_server_config_validator',
+    'OcrdNetworkMessageValidator': '.ocrd_network_message_validator',
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
@@ -1,6 +1,9 @@
 """
 Validate parameters against ocrd-tool.json.
 """
+import json
+from functools import lru_cache
+
 from .json_validator import JsonValidator, DefaultValidatingDraft6Validator
 
 #
@@ -32,17 +35,31 @@ class ParameterValidator(JsonValidator):
         required = []
         if ocrd_tool is None:
             ocrd_tool = {}
-        if 'parameters' not in ocrd_tool:
-            ocrd_tool['parameters'] = {}
-        p = ocrd_tool['parameters']
-        for n in p:
-            if 'required' in p[n]:
-                if p[n]['required']:
-                    required.append(n)
-                del(p[n]['required'])
+        p = {}
+        # (copy, because the tool description must not lose its 'required' flags)
+        for n, param in ocrd_tool.get('parameters', {}).items():
+            if param.get('required', False):
+                required.append(n)
+            p[n] = {k: v for k, v in param.items() if k != 'required'}
         super(ParameterValidator, self).__init__({
             "type": "object",
             "required": required,
             "additionalProperties": False,
             "properties": p
         }, DefaultValidatingDraft6Validator)
+
+
+def get_parameter_validator(ocrd_tool):
+    """
+    Get a :py:class:`ParameterValidator` for ``ocrd_tool``, reusing the
+    compiled schema of previous calls with an identical tool description
+    (for the 32 most recently used tool descriptions).
+
+    Arguments:
+        ocrd_tool (dict): Parsed ``ocrd-tool.json`` (of a single tool).
+    """
+    return _get_parameter_validator(json.dumps(ocrd_tool, sort_keys=True))
+
+@lru_cache(maxsize=32)
+def _get_parameter_validator(ocrd_tool_json):
+    return ParameterValidator(json.loads(ocrd_tool_json))
@@ -5,7 +5,14 @@ import re
 from traceback import format_exc
 from pathlib import Path
 
-from ocrd_utils import getLogger, MIMETYPE_PAGE, pushd_popd, is_local_filename, DEFAULT_METS_BASENAME
+from ocrd_utils import (
+    getLogger,
+    image_headers_from_files,
+    is_local_filename,
+    pushd_popd,
+    DEFAULT_METS_BASENAME,
+    MIMETYPE_PAGE,
+)
 from ocrd_models import ValidationReport
 from ocrd_modelfactory import page_from_file
 
@@ -202,17 +209,37 @@ class WorkspaceValidator():
         Validate image height and PAGE imageHeight match
         """
         self.log.info('_validate_dimension')
+        pages = []
         for f in self.mets.find_files(mimetype=MIMETYPE_PAGE, **self.find_kwargs):
             if not f.local_filename and not self.download:
                 self.log.warning("Not available locally and 'download' is not set: %s", f)
                 continue
             self.workspace.download_file(f)
-            page = page_from_file(f).get_Page()
-            _, _, exif = self.workspace.image_from_page(page, f.pageId)
-            if page.imageHeight != exif.height:
-                self.report.add_error("PAGE '%s': @imageHeight != image's actual height (%s != %s)" % (f.ID, page.imageHeight, exif.height))
-            if page.imageWidth != exif.width:
-                self.report.add_error("PAGE '%s': @imageWidth != image's actual width (%s != %s)" % (f.ID, page.imageWidth, exif.width))
+            pages.append((f, page_from_file(f).get_Page()))
+        dimensions = self._image_dimensions([page.imageFilename for _, page in pages])
+        for (f, page), (width, height) in zip(pages, dimensions):
+            if page.imageHeight != height:
+                self.report.add_error("PAGE '%s': @imageHeight != image's actual height (%s != %s)" % (f.ID, page.imageHeight, height))
+            if page.imageWidth != width:
+                self.report.add_error("PAGE '%s': @imageWidth != image's actual width (%s != %s)" % (f.ID, page.imageWidth, width))
+
+    def _image_dimensions(self, image_filenames):
+        """
+        Get pixel width and height of the images ``image_filenames``,
+        reading only the file headers (in parallel) where possible.
+        """
+        with pushd_popd(self.workspace.directory):
+            local = [is_local_filename(image_filename) and Path(image_filename).is_file()
+                     for image_filename in image_filenames]
+            headers = iter(image_headers_from_files([
+                image_filename for image_filename, is_local in zip(image_filenames, local) if is_local]))
+        dimensions = []
+        for image_filename, is_local in zip(image_filenames, local):
+            header = next(headers) if is_local else None
+            if header is None:
+                header = self.workspace.resolve_image_exif(image_filename)
+            dimensions.append((header.width, header.height))
+        return dimensions
 
     def _validate_multipage(self):
         """
@@ -321,11 +348,11 @@ class WorkspaceValidator():
             pcgts = page_from_file(f)
             page = pcgts.get_Page()
             if 'dimension' in self.page_checks:
-                _, _, exif = self.workspace.image_from_page(page, f.pageId)
-                if page.imageHeight != exif.height:
-                    self.report.add_error("PAGE '%s': @imageHeight != image's actual height (%s != %s)" % (f.ID, page.imageHeight, exif.height))
-                if page.imageWidth != exif.width:
-                    self.report.add_error("PAGE '%s': @imageWidth != image's actual width (%s != %s)" % (f.ID, page.imageWidth, exif.width))
+                (width, height), = self._image_dimensions([page.imageFilename])
+                if page.imageHeight != height:
+                    self.report.add_error("PAGE '%s': @imageHeight != image's actual height (%s != %s)" % (f.ID, page.imageHeight, height))
+                if page.imageWidth != width:
+                    self.report.add_error("PAGE '%s': @imageWidth != image's actual width (%s != %s)" % (f.ID, page.imageWidth, width))
             if 'imagefilename' in self.page_checks:
                 imageFilename = page.imageFilename
                 if not self.mets.find_files(url=imageFilename):
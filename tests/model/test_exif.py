@@ -12,6 +12,7 @@ from tests.base import (
 )
 
 from ocrd_models import OcrdExif
+from ocrd_models import ocrd_exif
 
 
 @pytest.mark.parametrize("path,width,height,xResolution,yResolution,resolution,resolutionUnit,photometricInterpretation,compression", [
@@ -54,6 +55,32 @@ def test_ocrd_exif(path, width, height, xResolution, yResolution, resolution, re
     assert ocrd_exif.compression == compression
 
 
+@pytest.mark.parametrize("fmt,save_kwargs,xResolution,yResolution,resolutionUnit", [
+    ('PNG', {'dpi': (300, 300)}, 118, 118, 'cm'),
+    ('PNG', {}, 1, 1, 'inches'),
+    ('TIFF', {'dpi': (300, 150)}, 300, 150, 'inches'),
+    ('TIFF', {'resolution': 40, 'resolution_unit': 3}, 40, 40, 'cm'),
+    ('JPEG', {'dpi': (72, 72)}, 72, 72, 'inches'),
+    ('JPEG', {}, 1, 1, 'inches'),
+])
+def test_ocrd_exif_in_process(tmp_path, monkeypatch, fmt, save_kwargs, xResolution, yResolution, resolutionUnit):
+    """Pixel density of common formats is read without running identify (consistently)"""
+    def no_identify(*args, **kwargs):
+        raise AssertionError('identify must not be called')
+    monkeypatch.setattr(ocrd_exif, 'run', no_identify)
+    path = tmp_path / ('img.' + fmt.lower())
+    Image.new('L', (30, 20)).save(path, format=fmt, **save_kwargs)
+    with Image.open(path) as img:
+        exif = OcrdExif(img)
+        # in-memory image (without file) yields the same result
+        img.filename = ''
+        assert OcrdExif(img).to_xml() == exif.to_xml()
+    assert (exif.width, exif.height) == (30, 20)
+    assert exif.xResolution == xResolution
+    assert exif.yResolution == yResolution
+    assert exif.resolutionUnit == resolutionUnit
+
+
 def test_ocrd_exif_serialize_xml():
     with Image.open(assets.path_to('SBB0000F29300010000/data/OCR-D-IMG/FILE_0001_IMAGE.tif')) as img:
         exif = OcrdExif(img)
@@ -8,10 +8,15 @@ from ocrd_modelfactory import page_from_image
 from ocrd_models.ocrd_page_generateds import TextTypeSimpleType
 from ocrd_models.ocrd_page import (
     AlternativeImageType,
+    BaselineType,
+    CoordsType,
     PcGtsType,
     PageType,
+    TableRegionType,
+    TextEquivType,
     TextRegionType,
     TextLineType,
+    OrderedGroupType,
     OrderedGroupIndexedType,
     UnorderedGroupIndexedType,
     ReadingOrderType,
@@ -21,6 +26,7 @@ from ocrd_models.ocrd_page import (
 
     parseString,
     parse,
+    parseEtree,
     to_xml
 )
 
@@ -107,6 +113,173 @@ def test_parse_string_succeeds():
     assert parseString(simple_page, silence=True) is not None
 
 
+def test_parse_string_no_validation(capsys):
+    """parseString with validate=False yields the same tree, but no warnings"""
+    faulty_page = simple_page.replace('conf="1"', 'conf="1.5"')
+    pcgts = parseString(faulty_page, silence=True)
+    assert 'Value "1.5"' in capsys.readouterr().err
+    pcgts_fast = parseString(faulty_page, silence=True, validate=False)
+    assert capsys.readouterr().err == ''
+    assert pcgts_fast.get_Page().get_TextRegion()[0].get_TextLine()[0].get_Word()[0].get_TextEquiv()[0].conf == 1.5
+    assert to_xml(pcgts_fast) == to_xml(pcgts)
+
+
+def test_parse_etree_share_tree(tmp_path):
+    path = tmp_path / 'page.xml'
+    path.write_text(simple_page, encoding='utf-8')
+    pcgts, _, mapping, _ = parseEtree(str(path), silence=True)
+    pcgts_shared, tree_shared, mapping_shared, reverse_mapping_shared = parseEtree(str(path), silence=True, share_tree=True)
+    assert to_xml(pcgts_shared) == to_xml(pcgts)
+    assert len(mapping_shared) == len(mapping) == len(reverse_mapping_shared)
+    line = pcgts_shared.get_Page().get_TextRegion()[0].get_TextLine()[0]
+    # the tree is the parsed one, not an exported copy
+    assert mapping_shared[id(line)] is line.gds_elementtree_node_
+    assert tree_shared is line.gds_elementtree_node_.getroottree().getroot()
+    nodes = tree_shared.xpath('//pc:TextLine', namespaces={'pc': tree_shared.nsmap[None]})
+    assert [reverse_mapping_shared[node] for node in nodes] == [
+        id(obj) for obj in pcgts_shared.get_Page().get_AllTextLines()]
+    assert reverse_mapping_shared[nodes[0]] == id(line)
+
+
+def test_parse_string_depth():
+    pcgts_full = parseString(simple_page, silence=True)
+    pcgts = parseString(simple_page, silence=True, depth='region')
+    region = pcgts.get_Page().get_TextRegion()[0]
+    assert region.get_Coords().points == '113,365 919,365 919,439 113,439'
+    assert 'TextLine' not in region.__dict__
+    assert to_xml(pcgts) == to_xml(pcgts_full)
+    line = region.get_TextLine()[0]
+    assert line.parent_object_ is region
+    assert line.get_Word()[0].get_TextEquiv()[0].Unicode == 'Berliniſche'
+    assert to_xml(pcgts) == to_xml(pcgts_full)
+    with pytest.raises(ValueError, match="depth must be one of"):
+        parseString(simple_page, silence=True, depth='block')
+
+
+def test_parse_string_depth_validation(capsys):
+    faulty_page = simple_page.replace('conf="1"', 'conf="1.5"')
+    pcgts = parseString(faulty_page, silence=True, depth='region')
+    assert capsys.readouterr().err == ''
+    word = pcgts.get_Page().get_TextRegion()[0].get_TextLine()[0].get_Word()[0]
+    assert word.get_TextEquiv()[0].conf == 1.5
+    assert any('Value "1.5"' in message for message in pcgts.gds_collector_.get_messages())
+    pcgts = parseString(faulty_page, silence=True, validate=False, depth='region')
+    word = pcgts.get_Page().get_TextRegion()[0].get_TextLine()[0].get_Word()[0]
+    assert word.get_TextEquiv()[0].conf == 1.5
+
+
+def test_parse_string_depth_verbatim():
+    # untouched subtrees are written as they were read (here: unusual attribute order)
+    as_xml = to_xml(parseString(simple_page, silence=True)).replace(
+        '<pc:Coords points="114,368 442,368 442,437 114,437"/>',
+        '<pc:Coords conf="0.5" points="114,368 442,368 442,437 114,437"/>')
+    pcgts = parseString(as_xml.encode('utf-8'), silence=True, depth='line')
+    assert to_xml(pcgts) == as_xml
+    # built subtrees are exported as usual
+    pcgts.get_Page().get_TextRegion()[0].get_TextLine()[0].get_Word()[0].set_id('w1')
+    assert '<pc:Coords points="114,368 442,368 442,437 114,437" conf="0.5"/>' in to_xml(pcgts)
+
+
+def test_get_by_id():
+    pcgts = parseString(simple_page, silence=True)
+    word = pcgts.get_by_id('w_w1aab1b1b2b1b1ab1')
+    assert isinstance(word, WordType)
+    assert word.parent_object_ is pcgts.get_by_id('tl_1')
+    assert pcgts.get_by_id('foo') is None
+    # index gets updated after structural changes via setters
+    region = TextRegionType(id='r_2')
+    region.add_TextLine(TextLineType(id='tl_2'))
+    pcgts.get_Page().add_TextRegion(region)
+    assert pcgts.get_by_id('r_2') is region
+    assert pcgts.get_by_id('tl_2').parent_object_ is region
+    word.set_id('w_1')
+    assert pcgts.get_by_id('w_w1aab1b1b2b1b1ab1') is None
+    assert pcgts.get_by_id('w_1') is word
+    # changes without IDs keep the index
+    ids = pcgts.gds_id_index_
+    word.add_TextEquiv(TextEquivType(Unicode='foo'))
+    word.set_Coords(word.get_Coords())
+    assert pcgts.gds_id_index_ is ids
+    # removing elements with IDs drops it
+    region.set_TextLine([])
+    assert pcgts.get_by_id('tl_2') is None
+    assert pcgts.get_by_id('r_2') is region
+    # deferred elements get built when needed
+    pcgts = parseString(simple_page, silence=True, depth='region')
+    assert pcgts.get_by_id('w_w1aab1b1b2b1b1ab1').parent_object_.id == 'tl_1'
+
+
+def test_invalidate_alternative_image_no_validation():
+    pcgts = parseString(simple_page, silence=True, validate=False)
+    region = pcgts.get_Page().get_TextRegion()[0]
+    region.add_AlternativeImage(AlternativeImageType(filename='region.png', comments='cropped'))
+    region.set_Coords(region.get_Coords())
+    assert region.get_AlternativeImage() == []
+
+
+def test_points_array():
+    pcgts = parseString(simple_page, silence=True)
+    region = pcgts.get_Page().get_TextRegion()[0]
+    coords = region.get_Coords()
+    points = coords.get_points_array()
+    assert points.dtype == 'int32'
+    assert points.tolist() == [[113, 365], [919, 365], [919, 439], [113, 439]]
+    assert coords.get_points_array() is points
+    coords.set_points('0,0 10,0 10,10')
+    assert coords.get_points_array().tolist() == [[0, 0], [10, 0], [10, 10]]
+    coords.points = '0.5,0 10,0 10,10'
+    assert coords.get_points_array().dtype == 'float64'
+    region.add_AlternativeImage(AlternativeImageType(filename='region.png', comments='cropped'))
+    coords.set_points(points[::-1])
+    assert coords.points == '113,439 919,439 919,365 113,365'
+    assert coords.get_points_array().tolist() == points[::-1].tolist()
+    assert region.get_AlternativeImage() == []
+    line = region.get_TextLine()[0]
+    line.set_Baseline(BaselineType(points='0,0 10,0'))
+    assert line.get_Baseline().get_points_array().tolist() == [[0, 0], [10, 0]]
+    assert 'points="113,439 919,439 919,365 113,365"' in to_xml(pcgts)
+    with pytest.raises(ValueError, match="Invalid points"):
+        CoordsType(points='1,2 3').get_points_array()
+
+
+def test_to_xml_incremental():
+    page_str = to_xml(parseString(simple_page, silence=True), skip_declaration=True)
+    # unchanged elements are written as parsed (i.e. without normalizing dates or numbers)
+    page_str = page_str.replace('.041000+02:00', '.041+02:00').replace('conf="1."', 'conf="1.00"')
+    pcgts = parseString(page_str.encode('utf-8'), silence=True)
+    assert to_xml(pcgts, incremental=True, skip_declaration=True) == page_str
+    page = pcgts.get_Page()
+    region = page.get_TextRegion()[0]
+    word = region.get_TextLine()[0].get_Word()[0]
+    word.get_TextEquiv()[0].set_Unicode('Berlinische')
+    assert region.gds_changed_ and page.gds_changed_
+    page.add_AlternativeImage(AlternativeImageType(filename='page.png', comments='binarized'))
+    page.set_orientation(0.5)
+    as_xml = to_xml(pcgts, incremental=True)
+    assert as_xml == to_xml(pcgts).replace('.041000+02:00', '.041+02:00')
+    assert '<pc:Unicode>Berlinische</pc:Unicode>' in as_xml
+    assert '<pc:AlternativeImage filename="page.png" comments="binarized"/>' in as_xml
+    # not recorded, so still written as parsed
+    word.get_Coords().points = '0,0 1,0 1,1 0,1'
+    assert '0,0 1,0 1,1 0,1' not in to_xml(pcgts, incremental=True)
+    assert '0,0 1,0 1,1 0,1' in to_xml(pcgts)
+
+
+def test_to_xml_escaping():
+    pcgts = parseString(simple_page, silence=True)
+    word = pcgts.get_Page().get_TextRegion()[0].get_TextLine()[0].get_Word()[0]
+    word.set_comments('say "a<b" & \'c\'')
+    word.get_TextEquiv()[0].set_Unicode('a<b & c>d <![CDATA[<e>]]>')
+    as_xml = to_xml(pcgts)
+    assert as_xml.startswith('<?xml version="1.0" encoding="UTF-8"?>\n<pc:PcGts ')
+    assert to_xml(pcgts, skip_declaration=True).startswith('<pc:PcGts ')
+    assert 'comments="say &quot;a&lt;b&quot; &amp; \'c\'"' in as_xml
+    assert '<pc:Unicode>a&lt;b &amp; c&gt;d <![CDATA[<e>]]></pc:Unicode>' in as_xml
+    word = parseString(as_xml.encode('utf-8'), silence=True).get_Page().get_TextRegion()[0].get_TextLine()[0].get_Word()[0]
+    assert word.get_comments() == 'say "a<b" & \'c\''
+    assert word.get_TextEquiv()[0].get_Unicode() == 'a<b & c>d <e>'
+
+
 def test_delete_region():
     pcgts = parseString(simple_page, silence=True)
     assert len(pcgts.get_Page().get_TextRegion()) == 1
@@ -301,6 +474,30 @@ def test_all_regions_with_reading_order():
     assert len(pg.get_AllRegions(classes=['Text'], order='reading-order', depth=1)) == 17
 
 
+def test_get_all_regions_nested_order():
+    # arrange
+    pg = PageType(imageFilename='page.tif')
+    table = TableRegionType(id='t1')
+    table.add_TextRegion(TextRegionType(id='t1_c1'))
+    table.add_TextRegion(TextRegionType(id='t1_c2'))
+    table.get_TextRegion()[0].add_TextRegion(TextRegionType(id='t1_c1_r1'))
+    pg.add_TextRegion(TextRegionType(id='r1'))
+    pg.add_TableRegion(table)
+    pg.add_TextRegion(TextRegionType(id='r2'))
+    og = OrderedGroupType(id='ro')
+    for index, region_id in enumerate(['r2', 't1_c2', 'r1', 't1_c1']):
+        og.add_RegionRefIndexed(RegionRefIndexedType(index=index, regionRef=region_id))
+    pg.set_ReadingOrder(ReadingOrderType(OrderedGroup=og))
+
+    # assert
+    # document order: class by class (Table before Text), depth-first
+    assert [r.id for r in pg.get_AllRegions()] == ['t1', 't1_c1', 't1_c1_r1', 't1_c2', 'r1', 'r2']
+    assert [r.id for r in pg.get_AllRegions(depth=2)] == ['t1', 't1_c1', 't1_c2', 'r1', 'r2']
+    assert [r.id for r in pg.get_AllRegions(classes=['Text'], depth=1)] == ['r1', 'r2']
+    assert [r.id for r in pg.get_AllRegions(order='reading-order')] == ['r2', 't1_c2', 'r1', 't1_c1', 't1', 't1_c1_r1']
+    assert [r.id for r in pg.get_AllRegions(order='reading-order-only', depth=1)] == ['r2', 'r1']
+
+
 def test_get_unordered_group_children():
     # arrange
     with open(assets.path_to('gutachten/data/TEMP1/PAGE_TEMP1.xml'), 'r') as f:
@@ -409,6 +606,24 @@ def test_get_all_alternative_image_paths():
     # assert len(pcgts.get_AllAlternativeImagePaths(word=False)) == 37
 
 
+def test_get_all_alternative_image_paths_word_glyph():
+    pcgts = parseString(simple_page, silence=True)
+    page = pcgts.get_Page()
+    page.add_AlternativeImage(AlternativeImageType(filename='page.png'))
+    region = page.get_TextRegion()[0]
+    region.add_AlternativeImage(AlternativeImageType(filename='region.png'))
+    word = region.get_TextLine()[0].get_Word()[0]
+    word.add_AlternativeImage(AlternativeImageType(filename='word.png'))
+    glyph = GlyphType(id='g_1', AlternativeImage=[AlternativeImageType(filename='glyph.png')])
+    word.add_Glyph(glyph)
+    assert pcgts.get_AllAlternativeImagePaths() == ['page.png', 'region.png', 'word.png', 'glyph.png']
+    assert pcgts.get_AllAlternativeImagePaths(region=False, word=False) == ['page.png', 'glyph.png']
+    # deferred elements do not need to be built
+    pcgts = parseString(to_xml(pcgts).encode('utf-8'), silence=True, depth='region')
+    assert pcgts.get_AllAlternativeImagePaths(page=False) == ['region.png', 'word.png', 'glyph.png']
+    assert 'TextLine' not in pcgts.get_Page().get_TextRegion()[0].__dict__
+
+
 def test_get_AllAlternativeImages():
     with open(assets.path_to('kant_aufklaerung_1784-complex/data/OCR-D-OCR-OCRO-fraktur-SEG-LINE-tesseract-ocropy-DEWARP/OCR-D-OCR-OCRO-fraktur-SEG-LINE-tesseract-ocropy-DEWARP_0001.xml'), 'r') as f:
         pcgts = parseString(f.read().encode('utf8'), silence=True)
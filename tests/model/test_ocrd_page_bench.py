@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+
+from pytest import fixture, main, mark
+
+from ocrd_models.ocrd_page import (
+    BaselineType,
+    CoordsType,
+    GlyphType,
+    MetadataType,
+    OrderedGroupType,
+    PageType,
+    PcGtsType,
+    ReadingOrderType,
+    RegionRefIndexedType,
+    TableRegionType,
+    TextEquivType,
+    TextLineType,
+    TextRegionType,
+    WordType,
+    parse,
+    parseEtree,
+    to_xml
+)
+from ocrd_modelfactory import pages_from_files
+from ocrd_utils import points_from_polygon, polygon_from_points
+
+# a newspaper-like page with glyph-level annotation
+REGIONS = 20
+LINES_PER_REGION = 20
+WORDS_PER_LINE = 8
+GLYPHS_PER_WORD = 5
+
+def _coords(x, y, w, h):
+    return CoordsType(points=points_from_polygon([[x, y], [x + w, y], [x + w, y + h], [x, y + h]]))
+
+def _build_page():
+    pcgts = PcGtsType(pcGtsId='bench', Metadata=MetadataType(
+        Creator='OCR-D', Created='2024-01-01T00:00:00', LastChange='2024-01-01T00:00:00'))
+    page = PageType(imageFilename='page.tif', imageWidth=5000, imageHeight=7000)
+    pcgts.set_Page(page)
+    group = OrderedGroupType(id='ro')
+    page.set_ReadingOrder(ReadingOrderType(OrderedGroup=group))
+    for r in range(REGIONS):
+        y0 = 100 + 300 * r
+        region = TextRegionType(id='r%d' % r, type_='paragraph', Coords=_coords(100, y0, 4000, 290))
+        group.add_RegionRefIndexed(RegionRefIndexedType(index=r, regionRef=region.id))
+        page.add_TextRegion(region)
+        for l in range(LINES_PER_REGION):
+            y = y0 + 14 * l
+            line = TextLineType(id='%s_l%d' % (region.id, l), Coords=_coords(100, y, 4000, 13),
+                                Baseline=BaselineType(points='100,%d 4100,%d' % (y + 10, y + 10)))
+            region.add_TextLine(line)
+            for w in range(WORDS_PER_LINE):
+                word = WordType(id='%s_w%d' % (line.id, w), Coords=_coords(100 + 500 * w, y, 450, 13))
+                line.add_Word(word)
+                for g in range(GLYPHS_PER_WORD):
+                    glyph = GlyphType(id='%s_g%d' % (word.id, g), Coords=_coords(100 + 500 * w + 90 * g, y, 80, 13))
+                    glyph.add_TextEquiv(TextEquivType(Unicode='abcde'[g], conf=0.9))
+                    word.add_Glyph(glyph)
+                word.add_TextEquiv(TextEquivType(Unicode='abcde', conf=0.9))
+            line.add_TextEquiv(TextEquivType(Unicode=' '.join(['abcde'] * WORDS_PER_LINE), conf=0.9))
+        region.add_TextEquiv(TextEquivType(Unicode='abcde'))
+    return pcgts
+
+@fixture(name='glyph_page', scope='module')
+def _fixture_glyph_page(tmp_path_factory):
+    path = tmp_path_factory.mktemp('page') / 'page.xml'
+    path.write_text(to_xml(_build_page()), encoding='utf-8')
+    yield str(path)
+
+@mark.benchmark(group="page-parse")
+def test_parse_validate(benchmark, glyph_page):
+    benchmark(parse, glyph_page, silence=True)
+
+@mark.benchmark(group="page-parse")
+def test_parse_no_validate(benchmark, glyph_page):
+    pcgts = benchmark(parse, glyph_page, silence=True, validate=False)
+    assert to_xml(pcgts) == to_xml(parse(glyph_page, silence=True))
+
+@fixture(name='glyph_pages', scope='module')
+def _fixture_glyph_pages(tmp_path_factory, glyph_page):
+    directory = tmp_path_factory.mktemp('pages')
+    with open(glyph_page, encoding='utf-8') as f:
+        as_xml = f.read()
+    paths = []
+    for i in range(8):
+        path = directory / ('page%d.xml' % i)
+        path.write_text(as_xml, encoding='utf-8')
+        paths.append(str(path))
+    yield paths
+
+@mark.benchmark(group="page-parse-batch")
+def test_pages_from_files_serial(benchmark, glyph_pages):
+    assert len(benchmark(lambda: list(pages_from_files(glyph_pages)))) == len(glyph_pages)
+
+@mark.benchmark(group="page-parse-batch")
+def test_pages_from_files_workers(benchmark, glyph_pages):
+    pages = benchmark(lambda: list(pages_from_files(glyph_pages, workers=4)))
+    assert [to_xml(pcgts) for pcgts in pages] == [to_xml(parse(path, silence=True)) for path in glyph_pages]
+
+@mark.benchmark(group="page-parse-etree")
+def test_parse_etree(benchmark, glyph_page):
+    benchmark(parseEtree, glyph_page, silence=True)
+
+@mark.benchmark(group="page-parse-etree")
+def test_parse_etree_share_tree(benchmark, glyph_page):
+    _, _, mapping, _ = benchmark(parseEtree, glyph_page, silence=True, share_tree=True)
+    assert len(mapping) == len(parseEtree(glyph_page, silence=True)[2])
+
+@mark.benchmark(group="page-roundtrip")
+def test_roundtrip(benchmark, glyph_page):
+    benchmark(lambda: to_xml(parse(glyph_page, silence=True)))
+
+@mark.benchmark(group="page-roundtrip")
+def test_roundtrip_region_depth(benchmark, glyph_page):
+    as_xml = benchmark(lambda: to_xml(parse(glyph_page, silence=True, depth='region')))
+    with open(glyph_page, encoding='utf-8') as f:
+        assert as_xml == f.read()
+
+@mark.benchmark(group="page-serialize")
+def test_to_xml(benchmark, glyph_page):
+    pcgts = parse(glyph_page, silence=True)
+    as_xml = benchmark(to_xml, pcgts)
+    with open(glyph_page, encoding='utf-8') as f:
+        assert as_xml == f.read()
+
+@mark.benchmark(group="page-serialize")
+def test_to_xml_incremental(benchmark, glyph_page):
+    pcgts = parse(glyph_page, silence=True)
+    page = pcgts.get_Page()
+    page.set_orientation(0.5)
+    page.get_TextRegion()[0].get_TextLine()[0].get_Word()[0].get_TextEquiv()[0].set_Unicode('abcdf')
+    as_xml = benchmark(to_xml, pcgts, incremental=True)
+    assert as_xml == to_xml(pcgts)
+
+@mark.benchmark(group="page-traverse")
+def test_get_all_alternative_image_paths(benchmark, glyph_page):
+    pcgts = parse(glyph_page, silence=True)
+    assert benchmark(pcgts.get_AllAlternativeImagePaths) == []
+
+@mark.benchmark(group="page-traverse")
+def test_get_all_regions_reading_order(benchmark):
+    # a page with many nested regions (table cells)
+    page = PageType(imageFilename='page.tif')
+    group = OrderedGroupType(id='ro')
+    page.set_ReadingOrder(ReadingOrderType(OrderedGroup=group))
+    for t in range(50):
+        table = TableRegionType(id='t%d' % t)
+        page.add_TableRegion(table)
+        for c in range(20):
+            table.add_TextRegion(TextRegionType(id='%s_c%d' % (table.id, c)))
+    for index, region in enumerate(page.get_AllRegions()):
+        group.add_RegionRefIndexed(RegionRefIndexedType(index=index, regionRef=region.id))
+    assert len(benchmark(page.get_AllRegions, order='reading-order')) == 50 * 21
+
+@mark.benchmark(group="page-traverse")
+def test_get_by_id_and_change(benchmark, glyph_page):
+    pcgts = parse(glyph_page, silence=True)
+    ids = [line.id for line in pcgts.get_Page().get_AllTextLines()]
+    def lookup_and_change():
+        for id_ in ids:
+            pcgts.get_by_id(id_).add_TextEquiv(TextEquivType(Unicode='abcde'))
+    benchmark(lookup_and_change)
+
+@mark.benchmark(group="page-coords")
+def test_polygon_from_points(benchmark, glyph_page):
+    coords = [glyph.get_Coords() for line in parse(glyph_page, silence=True).get_Page().get_AllTextLines()
+              for word in line.get_Word() for glyph in word.get_Glyph()]
+    benchmark(lambda: [polygon_from_points(c.points) for c in coords])
+
+@mark.benchmark(group="page-coords")
+def test_get_points_array(benchmark, glyph_page):
+    coords = [glyph.get_Coords() for line in parse(glyph_page, silence=True).get_Page().get_AllTextLines()
+              for word in line.get_Word() for glyph in word.get_Glyph()]
+    benchmark(lambda: [c.get_points_array() for c in coords])
+
+if __name__ == '__main__':
+    main([__file__])
@@ -10,6 +10,7 @@ from tests.data import DummyProcessor, DummyProcessorWithRequiredParameters, Dum
 from ocrd_utils import MIMETYPE_PAGE, pushd_popd, initLogging, disableLogging
 from ocrd.resolver import Resolver
 from ocrd.processor.base import Processor, run_processor, run_cli
+from ocrd.processor.helpers import _page_ids_to_process
 
 from unittest import mock
 import pytest
@@ -132,6 +133,78 @@ class TestProcessor(TestCase):
                           output_file_grp="OCR-D-OUT")
             assert len(ws.mets.find_all_files(fileGrp="OCR-D-OUT")) == 2
 
+    def test_run_output_profile_page(self):
+        with pushd_popd(tempdir=True) as tempdir:
+            ws = self.resolver.workspace_from_nothing(directory=tempdir)
+            ws.add_file('GRP1', mimetype=MIMETYPE_PAGE, ID='foobar1', pageId='phys_0001')
+            ws.add_file('GRP1', mimetype=MIMETYPE_PAGE, ID='foobar2', pageId='phys_0002')
+            metrics_file = Path(tempdir, 'metrics.jsonl')
+            with mock.patch.dict(environ, {'OCRD_PROFILE': 'PAGE', 'OCRD_PROFILE_PAGE_FILE': str(metrics_file)}):
+                run_processor(DummyProcessorWithOutput, workspace=ws,
+                              input_file_grp="GRP1",
+                              output_file_grp="OCR-D-OUT")
+            assert len(ws.mets.find_all_files(fileGrp="OCR-D-OUT")) == 2
+            metrics = [json.loads(line) for line in metrics_file.read_text().splitlines()]
+            assert [m['page_id'] for m in metrics] == ['phys_0001', 'phys_0002']
+            assert all(m['output_bytes'] == len('CONTENT') for m in metrics)
+
+    def test_run_output_profile_page_prom(self):
+        with pushd_popd(tempdir=True) as tempdir:
+            ws = self.resolver.workspace_from_nothing(directory=tempdir)
+            ws.add_file('GRP1', mimetype=MIMETYPE_PAGE, ID='foobar1', pageId='phys_0001')
+            ws.add_file('GRP1', mimetype=MIMETYPE_PAGE, ID='foobar2', pageId='phys\\0002')
+            metrics_file = Path(tempdir, 'metrics.prom')
+            with mock.patch.dict(environ, {'OCRD_PROFILE': 'PAGE', 'OCRD_PROFILE_PAGE_FILE': str(metrics_file)}):
+                run_processor(DummyProcessorWithOutput, workspace=ws,
+                              input_file_grp="GRP1",
+                              output_file_grp="OCR-D-OUT")
+            metrics = metrics_file.read_text()
+            assert 'page_id="phys_0001"' in metrics
+            # label values are escaped
+            assert 'page_id="phys\\\\0002"' in metrics
+
+    def test_run_output_profile_page_prom_failed(self):
+        with pushd_popd(tempdir=True) as tempdir:
+            ws = self.resolver.workspace_from_nothing(directory=tempdir)
+            ws.add_file('GRP1', mimetype=MIMETYPE_PAGE, ID='foobar1', pageId='phys_0001')
+            ws.add_file('GRP1', mimetype=MIMETYPE_PAGE, ID='foobar2', pageId='phys_0002')
+            # the second page fails
+            ws.add_file('OCR-D-OUT', mimetype=MIMETYPE_PAGE, ID='OCR-D-OUT_phys_0002', pageId='phys_0002')
+            metrics_file = Path(tempdir, 'metrics.prom')
+            with mock.patch.dict(environ, {'OCRD_PROFILE': 'PAGE', 'OCRD_PROFILE_PAGE_FILE': str(metrics_file)}):
+                with pytest.raises(Exception, match='already exists'):
+                    run_processor(DummyProcessorWithOutput, workspace=ws,
+                                  input_file_grp="GRP1",
+                                  output_file_grp="OCR-D-OUT")
+            # the pages completed before are still reported
+            metrics = metrics_file.read_text()
+            assert 'page_id="phys_0001"' in metrics
+            assert 'page_id="phys_0002"' not in metrics
+
+    def test_page_ids_to_process(self):
+        with pushd_popd(tempdir=True) as tempdir:
+            ws = self.resolver.workspace_from_nothing(directory=tempdir)
+            ws.add_file('GRP1', mimetype=MIMETYPE_PAGE, ID='foobar1', pageId='phys_0001')
+            ws.add_file('GRP2', mimetype=MIMETYPE_PAGE, ID='foobar2', pageId='phys_0001')
+            ws.add_file('GRP2', mimetype=MIMETYPE_PAGE, ID='foobar3', pageId='phys_0002')
+            processor = DummyProcessorWithOutput(ws, input_file_grp="GRP1,GRP2")
+            # pages only present in the second input fileGrp count, too
+            assert _page_ids_to_process(processor) == ['phys_0001', 'phys_0002']
+            processor.page_id = 'phys_0002'
+            assert _page_ids_to_process(processor) == ['phys_0002']
+
+    def test_run_output_profile_page_pageless(self):
+        with pushd_popd(tempdir=True) as tempdir:
+            ws = self.resolver.workspace_from_nothing(directory=tempdir)
+            ws.add_file('GRP1', mimetype=MIMETYPE_PAGE, ID='foobar1', pageId='phys_0001')
+            ws.add_file('GRP1', mimetype=MIMETYPE_PAGE, ID='foobar2', pageId=None)
+            with mock.patch.dict(environ, {'OCRD_PROFILE': 'PAGE'}):
+                with pytest.raises(ValueError, match='foobar2'):
+                    run_processor(DummyProcessorWithOutput, workspace=ws,
+                                  input_file_grp="GRP1",
+                                  output_file_grp="OCR-D-OUT")
+            assert not ws.mets.find_all_files(fileGrp="OCR-D-OUT")
+
     def test_run_output_overwrite(self):
         with pushd_popd(tempdir=True) as tempdir:
             ws = self.resolver.workspace_from_nothing(directory=tempdir)
@@ -244,5 +317,55 @@ class TestProcessor(TestCase):
         r = self.capture_out_err()
         assert 'ERROR ocrd.processor.base - found no page phys_0001 in file group GRP1' in r.err
 
+    def test_instance_caching(self):
+        from ocrd.processor.helpers import processor_pool
+        processor_pool.clear()
+        proc1 = run_processor(DummyProcessor,
+                              input_file_grp='OCR-D-SEG-PAGE',
+                              parameter={'baz': 'quux'},
+                              resolver=self.resolver,
+                              workspace=self.workspace,
+                              instance_caching=True)
+        proc2 = run_processor(DummyProcessor,
+                              input_file_grp='OCR-D-SEG-PAGE',
+                              parameter={'baz': 'quux'},
+                              resolver=self.resolver,
+                              workspace=self.workspace,
+                              instance_caching=True)
+        assert proc1 is proc2
+        assert proc2.workspace is None
+        proc3 = run_processor(DummyProcessor,
+                              input_file_grp='OCR-D-SEG-PAGE',
+                              parameter={'baz': 'bar'},
+                              resolver=self.resolver,
+                              workspace=self.workspace,
+                              instance_caching=True)
+        assert proc3 is not proc1
+        info = processor_pool.cache_info()
+        assert (info.hits, info.misses, info.currsize, info.busy) == (1, 2, 2, 0)
+        processor_pool.clear()
+
+def test_processor_pool_exclusive_and_evict():
+    from ocrd.processor.helpers import ProcessorPool
+    shutdowns = []
+    class SetupProcessor(DummyProcessor):
+        def setup(self):
+            self.model = object()
+        def shutdown(self):
+            shutdowns.append(self)
+    pool = ProcessorPool(maxsize=1)
+    proc1 = pool.checkout(SetupProcessor, {'baz': 'quux'})
+    proc2 = pool.checkout(SetupProcessor, {'baz': 'quux'})
+    assert proc1 is not proc2
+    assert proc1.model is not proc2.model
+    pool.checkin(proc1)
+    pool.checkin(proc2)
+    assert shutdowns == [proc1]
+    assert pool.checkout(SetupProcessor, {'baz': 'quux'}) is proc2
+    assert pool.cache_info().hits == 1
+    assert pool.cache_info().misses == 2
+    with pytest.raises(ValueError, match='not checked out'):
+        pool.checkin(proc1)
+
 if __name__ == "__main__":
     main(__file__)
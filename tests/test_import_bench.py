@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+
+import sys
+from subprocess import run
+
+from pytest import main, mark
+
+def _import(code):
+    run([sys.executable, '-c', code], check=True)
+
+@mark.benchmark(group="import")
+def test_import_python(benchmark):
+    benchmark(_import, 'pass')
+
+@mark.benchmark(group="import")
+def test_import_ocrd(benchmark):
+    benchmark(_import, 'import ocrd')
+
+@mark.benchmark(group="import")
+def test_import_processor_cli(benchmark):
+    benchmark(_import, 'from ocrd import Processor\nfrom ocrd.decorators import ocrd_cli_options, ocrd_cli_wrap_processor')
+
+@mark.benchmark(group="import")
+def test_import_processor_dummy(benchmark):
+    benchmark(_import, 'from ocrd.processor.builtin.dummy_processor import cli')
+
+if __name__ == '__main__':
+    main([__file__])
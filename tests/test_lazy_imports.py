@@ -0,0 +1,72 @@
+import sys
+from subprocess import run
+
+from pytest import main, mark, raises
+
+# modules which must not be loaded just for defining a processor CLI
+HEAVY_MODULES = [
+    'cv2',
+    'numpy',
+    'PIL.Image',
+    'requests',
+    'jsonschema',
+    'fastapi',
+    'pika',
+    'ocrd_network.processing_worker',
+    'ocrd_models.ocrd_page_generateds',
+    'ocrd.workspace',
+]
+
+def _loaded_modules(code):
+    result = run([sys.executable, '-c', code + '\nimport sys\nprint("\\n".join(sys.modules))'],
+                 capture_output=True, text=True, check=True)
+    return result.stdout.split('\n')
+
+@mark.parametrize('code', [
+    'import ocrd',
+    'import ocrd_utils',
+    'import ocrd_models',
+    'import ocrd_validators',
+    'import ocrd_network',
+    'from ocrd import Processor\nfrom ocrd.decorators import ocrd_cli_options, ocrd_cli_wrap_processor',
+])
+def test_no_heavy_imports(code):
+    loaded = _loaded_modules(code)
+    assert [module for module in HEAVY_MODULES if module in loaded] == []
+
+def test_lazy_attributes():
+    import ocrd
+    import ocrd_models
+    import ocrd_utils
+    from ocrd.workspace import Workspace
+    from ocrd_models.ocrd_exif import OcrdExif
+    from ocrd_utils.image import crop_image
+    assert ocrd.Workspace is Workspace
+    assert ocrd_models.OcrdExif is OcrdExif
+    assert ocrd_utils.crop_image is crop_image
+    assert 'crop_image' in dir(ocrd_utils)
+    for name in ocrd.__all__:
+        assert getattr(ocrd, name)
+    with raises(AttributeError):
+        ocrd_utils.no_such_function
+
+@mark.parametrize('code', [
+    'import ocrd; ocrd.workspace.Workspace',
+    'import ocrd; ocrd.processor.Processor',
+    'import ocrd; ocrd.resolver.Resolver',
+    'import ocrd_utils; ocrd_utils.image.crop_image',
+])
+def test_lazy_submodules(code):
+    # submodules are still available as attributes after importing the package
+    _loaded_modules(code)
+
+def test_star_import():
+    namespace = {}
+    exec('from ocrd_utils import *', namespace)
+    assert 'crop_image' in namespace
+    assert 'polygon_from_points' in namespace
+    assert 'getLogger' in namespace
+    assert 'config' in namespace
+
+if __name__ == '__main__':
+    main([__file__])
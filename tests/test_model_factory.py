@@ -1,11 +1,18 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from PIL import Image
+
 from tests.base import TestCase, main, assets, create_ocrd_file, create_ocrd_file_with_defaults
 
 from ocrd_utils import MIMETYPE_PAGE
 from ocrd_models import OcrdMets
+from ocrd_models.ocrd_page import to_xml
 from ocrd_modelfactory import (
     exif_from_filename,
     page_from_image,
-    page_from_file
+    page_from_file,
+    pages_from_files
 )
 
 SAMPLE_IMG = assets.path_to('kant_aufklaerung_1784/data/OCR-D-IMG/INPUT_0017.tif')
@@ -18,6 +25,20 @@ class TestModelFactory(TestCase):
         with self.assertRaisesRegex(Exception, "Must pass 'image_filename' to 'exif_from_filename'"):
             exif_from_filename(None)
 
+    def test_exif_from_filename_cached(self):
+        with TemporaryDirectory() as tempdir:
+            path = Path(tempdir, 'img.png')
+            Image.new('L', (30, 20)).save(path, dpi=(300, 300))
+            exif = exif_from_filename(path)
+            self.assertEqual(exif.resolution, 118)
+            # changes to the result do not affect the cache
+            exif.resolution = 1
+            self.assertEqual(exif_from_filename(path).resolution, 118)
+            # changes to the file do
+            Image.new('L', (40, 20)).save(path)
+            self.assertEqual(exif_from_filename(path).width, 40)
+            self.assertEqual(exif_from_filename(path).resolution, 1)
+
     def test_page_from_file(self):
         f = create_ocrd_file_with_defaults(mimetype='image/tiff', local_filename=SAMPLE_IMG, ID='file1')
         self.assertEqual(f.mimetype, 'image/tiff')
@@ -44,6 +65,25 @@ class TestModelFactory(TestCase):
         with self.assertRaisesRegex(ValueError, "Unsupported mimetype"):
             page_from_file(create_ocrd_file_with_defaults(local_filename=__file__, mimetype='foo/bar'))
 
+    def test_pages_from_files(self):
+        with TemporaryDirectory() as tempdir:
+            paths = []
+            for i in range(5):
+                path = Path(tempdir, 'page%d.xml' % i)
+                pcgts = page_from_file(SAMPLE_PAGE)
+                pcgts.set_pcGtsId('page%d' % i)
+                path.write_text(to_xml(pcgts), encoding='utf-8')
+                paths.append(str(path))
+            files = [create_ocrd_file_with_defaults(mimetype=MIMETYPE_PAGE, local_filename=path) for path in paths[:2]]
+            for workers in [None, 2]:
+                pages = list(pages_from_files(files + paths[2:], workers=workers))
+                self.assertEqual([p.pcGtsId for p in pages], ['page%d' % i for i in range(5)])
+                self.assertEqual(to_xml(pages[4]), Path(paths[4]).read_text(encoding='utf-8'))
+                region = pages[0].get_Page().get_TextRegion()[0]
+                self.assertIs(region.get_TextLine()[0].parent_object_, region)
+            with self.assertRaisesRegex(FileNotFoundError, "no-existe"):
+                list(pages_from_files(paths + ['no-existe.xml'], workers=2))
+
     def test_imports_from_generateds(self):
         from ocrd_models.ocrd_page import MetadataItemType
 
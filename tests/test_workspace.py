@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from os import chdir, curdir, walk, stat, chmod, umask
+from os import chdir, curdir, walk, stat, chmod, umask, utime
 import shutil
 import logging
 from stat import filemode
@@ -10,6 +10,7 @@ from pathlib import Path
 from gzip import open as gzip_open
 
 from PIL import Image
+from psutil import Process
 import numpy as np
 
 import pytest
@@ -25,11 +26,18 @@ from ocrd_models import (
     OcrdMets
 )
 from ocrd_models.ocrd_page import parseString
-from ocrd_models.ocrd_page import TextRegionType, CoordsType, AlternativeImageType
-from ocrd_utils import polygon_mask, xywh_from_polygon, bbox_from_polygon, points_from_polygon
+from ocrd_models.ocrd_page import TextRegionType, CoordsType, AlternativeImageType, BorderType
+from ocrd_utils import (
+    polygon_mask,
+    xywh_from_polygon,
+    bbox_from_polygon,
+    points_from_polygon,
+    coordinates_of_segment,
+    coordinates_for_segment,
+)
 from ocrd_modelfactory import page_from_file
 from ocrd.resolver import Resolver
-from ocrd.workspace import Workspace
+from ocrd.workspace import Workspace, ImageCache, derivation_cache, _prune_cache_dir
 from ocrd.workspace_backup import WorkspaceBackupManager
 from ocrd_validators import WorkspaceValidator
 
@@ -437,6 +445,49 @@ def test_save_image_file(plain_workspace):
     assert plain_workspace.save_image_file(img, 'page1_img', 'IMG', 'page1', 'image/jpeg')
 
 
+def test_save_image_file_options(plain_workspace, monkeypatch):
+    monkeypatch.setenv('OCRD_IMAGE_SAVE_OPTIONS', '{"tiff": {"compression": "tiff_lzw"}}')
+    workspace = Workspace(plain_workspace.resolver, plain_workspace.directory, mets=plain_workspace.mets)
+    img = Image.fromarray(np.random.default_rng(0).integers(0, 256, (100, 80, 3), dtype=np.uint8))
+    tif_path = workspace.save_image_file(img, 'page1_tif', 'IMG', 'page1', 'image/tiff')
+    with Image.open(Path(workspace.directory, tif_path)) as tif:
+        assert tif.info['compression'] == 'tiff_lzw'
+    # WebP is lossless by default
+    webp_path = workspace.save_image_file(img, 'page1_webp', 'IMG', 'page1', 'image/webp')
+    assert webp_path == 'IMG/page1_webp.webp'
+    assert np.array_equal(np.array(Image.open(Path(workspace.directory, webp_path))), np.array(img))
+
+
+def test_save_image_file_threads(plain_workspace, monkeypatch):
+    monkeypatch.setenv('OCRD_IMAGE_SAVE_THREADS', '2')
+    images = [Image.new('L', (200, 100), i) for i in range(10)]
+    for i, img in enumerate(images):
+        plain_workspace.save_image_file(img, 'page%d_img' % i, 'IMG', 'page%d' % i)
+    # implicitly waits for the file being written
+    assert plain_workspace._resolve_image_as_pil('IMG/page3_img.png').getpixel((0, 0)) == 3
+    # regardless of how the path is written
+    plain_workspace.wait_image_files(Path(plain_workspace.directory, 'IMG', '.', 'page4_img.png'))
+    assert plain_workspace._image_save_path('IMG/page4_img.png') not in plain_workspace._image_save_futures
+    plain_workspace.save_mets()
+    assert plain_workspace._image_save_executor is None
+    for i in range(10):
+        with Image.open(Path(plain_workspace.directory, 'IMG', 'page%d_img.png' % i)) as img:
+            assert img.getpixel((0, 0)) == i
+    # encoding errors surface when waiting, without leaving the file behind
+    plain_workspace.save_image_file(Image.new('RGBA', (10, 10)), 'bad_img', 'IMG', 'bad', 'image/jpeg')
+    with pytest.raises(OSError):
+        plain_workspace.wait_image_files()
+    assert not list(plain_workspace.find_files(file_id='bad_img'))
+    assert not Path(plain_workspace.directory, 'IMG', 'bad_img.jpg').exists()
+
+
+def test_save_image_file_error(plain_workspace):
+    with pytest.raises(OSError):
+        plain_workspace.save_image_file(Image.new('RGBA', (10, 10)), 'bad_img', 'IMG', 'bad', 'image/jpeg')
+    assert not list(plain_workspace.find_files(file_id='bad_img'))
+    assert not Path(plain_workspace.directory, 'IMG', 'bad_img.jpg').exists()
+
+
 @pytest.fixture(name='workspace_kant_aufklaerung')
 def _fixture_workspace_kant_aufklaerung(tmp_path):
     copytree(assets.path_to('kant_aufklaerung_1784/data/'), str(tmp_path))
@@ -585,6 +636,137 @@ def test_deskewing(plain_workspace):
     reg_array2 = np.array(reg_image2) > 0
     assert 0.98 < np.sum(reg_array == reg_array2) / reg_array.size <= 1.0
 
+def test_image_from_segment_as_array(plain_workspace):
+    poly = [[100, 100], [300, 100], [300, 150], [200, 150], [200, 200], [100, 200]]
+    image = polygon_mask(Image.new('L', (400, 300), 100), poly)
+    assert plain_workspace.save_image_file(image, 'foo0', 'IMG')
+    pcgts = page_from_file(next(plain_workspace.mets.find_files(ID='foo0')))
+    page = pcgts.get_Page()
+    region = TextRegionType(id='nonrect',
+                            Coords=CoordsType(points=points_from_polygon(poly)))
+    page.add_TextRegion(region)
+    page_image, page_coords, _ = plain_workspace.image_from_page(page, 'page1')
+    for kwargs in [dict(fill=0), dict(), dict(transparency=True), dict(fill='white')]:
+        reg_image, reg_coords = plain_workspace.image_from_segment(
+            region, page_image, page_coords, **kwargs)
+        reg_array, reg_coords2 = plain_workspace.image_from_segment(
+            region, page_image, page_coords, as_array=True, **kwargs)
+        assert isinstance(reg_array, np.ndarray)
+        assert np.array_equal(np.array(reg_image), reg_array)
+        assert np.all(reg_coords['transform'] == reg_coords2['transform'])
+        # from array parent image
+        reg_array2, _ = plain_workspace.image_from_segment(
+            region, np.array(page_image), page_coords, as_array=True, **kwargs)
+        assert np.array_equal(reg_array, reg_array2)
+    # with deskewing
+    region.set_orientation(-5.0)
+    reg_image, reg_coords = plain_workspace.image_from_segment(region, page_image, page_coords)
+    reg_array, reg_coords2 = plain_workspace.image_from_segment(region, page_image, page_coords, as_array=True)
+    assert 'deskewed' in reg_coords2['features']
+    assert np.array_equal(np.array(reg_image), reg_array)
+    assert np.all(reg_coords['transform'] == reg_coords2['transform'])
+
+
+def test_image_lazy_decoding(plain_workspace, monkeypatch):
+    image = Image.fromarray(np.random.default_rng(42).integers(0, 256, (1500, 1000, 3), dtype=np.uint8))
+    img_path = Path(plain_workspace.directory, 'page.tif')
+    image.save(img_path)
+    plain_workspace.add_file('IMG', file_id='page', local_filename=img_path, mimetype='image/tiff', page_id='page1')
+    page = page_from_file(next(plain_workspace.mets.find_files(ID='page'))).get_Page()
+    poly = [[100, 100], [300, 100], [300, 150], [200, 150], [200, 200], [100, 200]]
+    region = TextRegionType(id='nonrect',
+                            Coords=CoordsType(points=points_from_polygon(poly)))
+    page.add_TextRegion(region)
+
+    monkeypatch.setenv('OCRD_LAZY_IMAGE_SIZE', '1')
+    page_image, page_coords, _ = plain_workspace.image_from_page(page, 'page1')
+    assert page_image.tile # not decoded
+    reg_image, _ = plain_workspace.image_from_segment(region, page_image, page_coords)
+    reg_array, _ = plain_workspace.image_from_segment(region, page_image, page_coords, as_array=True)
+    assert page_image.tile # still not decoded
+    assert plain_workspace.images_decoded == 1
+    # the undecoded image does not keep its file open
+    open_files = [f.path for f in Process().open_files()]
+    assert str(img_path.resolve()) not in open_files
+    assert page_image.fp.fileno() >= 0
+    page_image.fp.close()
+    assert np.array_equal(np.array(page_image), np.array(image))
+    open_files = [f.path for f in Process().open_files()]
+    assert str(img_path.resolve()) not in open_files
+
+    monkeypatch.setenv('OCRD_LAZY_IMAGE_SIZE', '0')
+    page_image, page_coords, _ = plain_workspace.image_from_page(page, 'page1')
+    assert not page_image.tile
+    assert plain_workspace.images_decoded == 2
+    reg_image2, _ = plain_workspace.image_from_segment(region, page_image, page_coords)
+    assert np.array_equal(np.array(reg_image), np.array(reg_image2))
+    assert np.array_equal(reg_array, np.array(reg_image2))
+
+
+def test_image_from_page_scaled(plain_workspace, tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+    image = Image.fromarray(np.random.default_rng(42).integers(0, 256, (1500, 1000), dtype=np.uint8))
+    img_path = Path(plain_workspace.directory, 'page.jpg')
+    image.save(img_path, dpi=(300, 300))
+    plain_workspace.add_file('IMG', file_id='page', local_filename=img_path, mimetype='image/jpeg', page_id='page1')
+    page = page_from_file(next(plain_workspace.mets.find_files(ID='page'))).get_Page()
+    page.set_Border(BorderType(Coords=CoordsType(points=points_from_polygon(
+        [[100, 200], [900, 200], [900, 1400], [100, 1400]]))))
+    poly = [[200, 400], [600, 400], [600, 600], [200, 600]]
+    region = TextRegionType(id='r1', Coords=CoordsType(points=points_from_polygon(poly)))
+    page.add_TextRegion(region)
+
+    page_image, page_coords, page_image_info = plain_workspace.image_from_page(page, 'page1', dpi=75)
+    assert page_image_info.resolution == 300
+    assert page_coords['scale'] == 0.25
+    assert 'scaled' in page_coords['features'].split(',')
+    assert page_image.size == (200, 300)
+    # transform stays consistent with the scaled image
+    assert np.array_equal(coordinates_of_segment(region, page_image, page_coords),
+                          [[25, 50], [125, 50], [125, 100], [25, 100]])
+    reg_image, reg_coords = plain_workspace.image_from_segment(region, page_image, page_coords)
+    assert reg_image.size == (100, 50)
+    assert np.array_equal(coordinates_for_segment([[0, 0], [100, 50]], reg_image, reg_coords),
+                          [[200, 400], [600, 600]])
+    # pyramid level got stored beside the other caches, and is used by other workspaces, too
+    assert len(list((tmp_path / 'cache' / 'ocrd' / 'pyramid').glob('*.2.png'))) == 1
+    assert plain_workspace.images_decoded == 1
+    plain_workspace.save_mets()
+    workspace = Workspace(plain_workspace.resolver, plain_workspace.directory)
+    page_image2, _, _ = workspace.image_from_page(page, 'page1', scale=0.25)
+    assert workspace.images_decoded == 0
+    assert np.array_equal(np.array(page_image), np.array(page_image2))
+    # close to direct downscaling of the full image
+    full_image, _, _ = plain_workspace.image_from_page(page, 'page1')
+    direct = full_image.resize((200, 300), Image.BICUBIC)
+    assert np.abs(np.array(page_image, dtype=int) - np.array(direct, dtype=int)).mean() < 20
+
+    with pytest.raises(ValueError):
+        plain_workspace.image_from_page(page, 'page1', scale=0.5, dpi=150)
+
+
+def test_image_from_page_scaled_cache_disabled(plain_workspace, tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+    monkeypatch.setenv('OCRD_MAX_PYRAMID_CACHE', '0')
+    img_path = Path(plain_workspace.directory, 'page.png')
+    Image.new('L', (1000, 1500), 128).save(img_path)
+    plain_workspace.add_file('IMG', file_id='page', local_filename=img_path, mimetype='image/png', page_id='page1')
+    page = page_from_file(next(plain_workspace.mets.find_files(ID='page'))).get_Page()
+    page_image, _, _ = plain_workspace.image_from_page(page, 'page1', scale=0.25)
+    assert page_image.size == (250, 375)
+    assert not (tmp_path / 'cache' / 'ocrd' / 'pyramid').exists()
+
+
+def test_prune_cache_dir(tmp_path):
+    for i in range(5):
+        (tmp_path / ('%d.0.png' % i)).write_bytes(b'x' * 100)
+        utime(tmp_path / ('%d.0.png' % i), ns=(i * 10 ** 9, i * 10 ** 9))
+    (tmp_path / 'tmp_in_progress.png').write_bytes(b'x' * 1000)
+    _prune_cache_dir(tmp_path, '*.*.png', 250)
+    # least recently used first, but not files in progress
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['3.0.png', '4.0.png', 'tmp_in_progress.png']
+
+
 def test_downsample_16bit_image(plain_workspace):
     # arrange image
     img_path = Path(plain_workspace.directory, '16bit.tif')
@@ -602,6 +784,91 @@ def test_downsample_16bit_image(plain_workspace):
     assert pil_after.mode == 'L'
 
 
+def test_image_cache(plain_workspace, monkeypatch):
+    monkeypatch.setattr(plain_workspace.image_cache, '_maxsize', 1 << 20)
+    img_path = Path(plain_workspace.directory, 'cached.png')
+    Image.new('L', (40, 30), 255).save(img_path)
+    plain_workspace.add_file('IMG', file_id='cached', local_filename=img_path, mimetype='image/png', page_id=None)
+
+    img1 = plain_workspace._resolve_image_as_pil(img_path)
+    img1.putpixel((0, 0), 0)
+    img2 = plain_workspace._resolve_image_as_pil(img_path)
+    assert plain_workspace.images_decoded == 1
+    assert plain_workspace.image_cache.cache_info().hits == 1
+    # callers get independent copies
+    assert img2.getpixel((0, 0)) == 255
+    assert img2.format == 'PNG'
+
+    # file changes on disk invalidate the entry
+    Image.new('L', (20, 10), 0).save(img_path)
+    img3 = plain_workspace._resolve_image_as_pil(img_path)
+    assert img3.size == (20, 10)
+    assert plain_workspace.images_decoded == 2
+
+
+def test_image_cache_disabled(plain_workspace):
+    img_path = Path(plain_workspace.directory, 'uncached.png')
+    Image.new('L', (40, 30), 255).save(img_path)
+    plain_workspace.add_file('IMG', file_id='uncached', local_filename=img_path, mimetype='image/png', page_id=None)
+
+    img1 = plain_workspace._resolve_image_as_pil(img_path)
+    img2 = plain_workspace._resolve_image_as_pil(img_path)
+    assert img2 is not img1
+    assert plain_workspace.images_decoded == 2
+    assert plain_workspace.image_cache.currsize == 0
+
+
+def test_image_cache_nbytes():
+    assert ImageCache.nbytes(Image.new('1', (80, 10))) == 800
+    assert ImageCache.nbytes(Image.new('L', (80, 10))) == 800
+    assert ImageCache.nbytes(Image.new('I;16', (80, 10))) == 1600
+    assert ImageCache.nbytes(Image.new('RGB', (80, 10))) == 3200
+    assert ImageCache.nbytes(np.zeros((10, 80), dtype=bool)) == 800
+    # 1 MiB
+    cache = ImageCache(1)
+    assert cache.put('a', Image.new('1', (1024, 1024)))
+    assert not cache.put('b', Image.new('RGB', (1024, 1024)))
+    assert cache.get('a').size == (1024, 1024)
+    assert cache.get('b') is None
+
+
+def test_image_derivation_cache(plain_workspace, monkeypatch):
+    monkeypatch.setattr(derivation_cache, '_maxsize', 64)
+    derivation_cache.clear()
+    poly = [[100, 100], [300, 100], [300, 150], [200, 150], [200, 200], [100, 200]]
+    image = polygon_mask(Image.new('L', (400, 300)), poly)
+    assert plain_workspace.save_image_file(image, 'foo0', 'IMG')
+    pcgts = page_from_file(next(plain_workspace.mets.find_files(ID='foo0')))
+    page = pcgts.get_Page()
+    region = TextRegionType(id='nonrect',
+                            Coords=CoordsType(points=points_from_polygon(poly)),
+                            orientation=-3.0)
+    page.add_TextRegion(region)
+
+    page_image, page_coords, _ = plain_workspace.image_from_page(page, 'page1')
+    reg_image, reg_coords = plain_workspace.image_from_segment(region, page_image, page_coords, fill=0)
+    assert derivation_cache.cache_info().hits == 0
+    page_image2, page_coords2, _ = plain_workspace.image_from_page(page, 'page1')
+    reg_image2, reg_coords2 = plain_workspace.image_from_segment(region, page_image2, page_coords2, fill=0)
+    assert derivation_cache.cache_info().hits == 2
+    assert plain_workspace.images_decoded == 1
+    assert list(reg_image.getdata()) == list(reg_image2.getdata())
+    assert np.all(reg_coords['transform'] == reg_coords2['transform'])
+    assert reg_coords['features'] == reg_coords2['features']
+    # results are copies
+    assert reg_image2 is not reg_image
+    assert reg_coords2['transform'] is not reg_coords['transform']
+    # different arguments or annotations do not hit
+    plain_workspace.image_from_segment(region, page_image2, page_coords2, fill=255)
+    region.set_orientation(None)
+    plain_workspace.image_from_segment(region, page_image2, page_coords2, fill=0)
+    assert derivation_cache.cache_info().hits == 2
+    # untracked parent images are not cached
+    plain_workspace.image_from_segment(region, page_image2.copy(), page_coords2, fill=0)
+    assert derivation_cache.cache_info().images == 4
+    derivation_cache.clear()
+
+
 def test_mets_permissions(plain_workspace):
     plain_workspace.save_mets()
     mets_path = join(plain_workspace.directory, 'mets.xml')
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+from os import chdir, curdir
+from os.path import abspath
+
+import numpy as np
+from PIL import Image
+from pytest import fixture, main, mark
+
+from ocrd.resolver import Resolver
+from ocrd_modelfactory import page_from_file
+from ocrd_models.ocrd_page import TextRegionType, TextLineType, CoordsType
+from ocrd_utils import points_from_polygon
+
+REGIONS = 50
+LINES = 5
+
+@fixture(name='page_workspace')
+def _fixture_page_workspace(tmp_path):
+    ws = Resolver().workspace_from_nothing(directory=tmp_path)
+    prev_dir = abspath(curdir)
+    chdir(tmp_path)
+    rng = np.random.default_rng(0)
+    image = Image.fromarray(rng.integers(128, 256, (3500, 2500), dtype=np.uint8))
+    ws.save_image_file(image, 'page', 'IMG')
+    page = page_from_file(next(ws.mets.find_files(ID='page'))).get_Page()
+    # 10 rows x 5 columns of regions, each with some (non-rectangular) lines
+    for i in range(REGIONS):
+        x0, y0 = 100 + 460 * (i % 5), 100 + 330 * (i // 5)
+        region = TextRegionType(id='r%d' % i, Coords=CoordsType(points=points_from_polygon(
+            [[x0, y0], [x0 + 440, y0], [x0 + 440, y0 + 300], [x0, y0 + 300]])))
+        for j in range(LINES):
+            y = y0 + 60 * j
+            region.add_TextLine(TextLineType(id='r%d_l%d' % (i, j), Coords=CoordsType(points=points_from_polygon(
+                [[x0, y], [x0 + 430, y + 5], [x0 + 440, y + 55], [x0 + 10, y + 50]]))))
+        page.add_TextRegion(region)
+    page_image, page_coords, _ = ws.image_from_page(page, 'page1')
+    yield ws, page, page_image, page_coords
+    chdir(prev_dir)
+
+def _extract_lines(workspace, page, page_image, page_coords, as_array):
+    for region in page.get_TextRegion():
+        region_image, region_coords = workspace.image_from_segment(
+            region, page_image, page_coords, as_array=as_array)
+        for line in region.get_TextLine():
+            workspace.image_from_segment(
+                line, region_image, region_coords, as_array=as_array)
+
+@mark.benchmark(group="segment-extraction")
+def test_extract_lines_pil(benchmark, page_workspace):
+    benchmark(_extract_lines, *page_workspace, False)
+
+@mark.benchmark(group="segment-extraction")
+def test_extract_lines_array(benchmark, page_workspace):
+    benchmark(_extract_lines, *page_workspace, True)
+
+@mark.benchmark(group="segment-extraction")
+def test_extract_word_large_page(benchmark, tmp_path):
+    ws = Resolver().workspace_from_nothing(directory=tmp_path)
+    page_image = Image.new('L', (7000, 10000), 200)
+    page_coords = {'transform': np.eye(3), 'angle': 0, 'features': ''}
+    word = TextLineType(id='w', Coords=CoordsType(points=points_from_polygon(
+        [[3000, 5000], [3100, 5002], [3100, 5030], [3000, 5032]])))
+    benchmark(ws.image_from_segment, word, page_image, page_coords)
+
+if __name__ == '__main__':
+    main([__file__])
@@ -1,6 +1,30 @@
-from pytest import main
-from PIL import Image
-from ocrd_utils.image import rotate_image
+from pytest import main, mark
+from PIL import Image, ImageChops, ImageStat
+import numpy as np
+from ocrd_models import OcrdExif
+from ocrd_models.ocrd_page import CoordsType, GlyphType
+from ocrd_utils.image import (
+    array_from_polygon,
+    bbox_from_polygon,
+    coordinates_for_segment,
+    coordinates_for_segments,
+    coordinates_of_segment,
+    coordinates_of_segments,
+    crop_image,
+    decode_region,
+    image_from_polygon,
+    image_header_from_file,
+    image_headers_from_files,
+    points_from_polygon,
+    points_from_polygons,
+    polygon_mask,
+    polygon_from_points,
+    polygons_from_points,
+    region_decodable,
+    rotate_coordinates,
+    rotate_image,
+    shift_coordinates,
+)
 
 def test_32bit_fill():
     img = Image.new('F', (200, 100), 1)
@@ -9,5 +33,149 @@ def test_32bit_fill():
 def test_max_image_pixels():
     assert Image.MAX_IMAGE_PIXELS == 40_000 ** 2
 
+def _image_from_polygon_full(image, polygon, fill='background', transparency=False):
+    # the original algorithm: mask and measure the full image
+    mask = polygon_mask(image, polygon)
+    if fill == 'none' or fill is None:
+        new_image = image.copy()
+    else:
+        if fill == 'background':
+            background = ImageStat.Stat(image, mask=mask)
+            if len(background.bands) > 1:
+                background = tuple(background.median)
+            else:
+                background = background.median[0]
+        else:
+            background = fill
+        new_image = Image.new(image.mode, image.size, background)
+        new_image.paste(image, mask=mask)
+    if image.mode in ['RGBA', 'LA']:
+        new_image.putalpha(ImageChops.darker(mask, image.getchannel('A')))
+    elif transparency and image.mode in ['RGB', 'L']:
+        new_image.putalpha(mask)
+    return new_image
+
+def _random_polygons(rng, width, height, number=50):
+    # some exceeding the image, and (like the first) some
+    # filled beyond the last row or column despite the outline
+    return [np.array([[14, 39], [49, 59], [25, 46], [50, 36]])] + [
+        rng.integers([-10, -10], [width + 10, height + 10], (rng.integers(3, 9), 2))
+        for _ in range(number)]
+
+@mark.parametrize('mode', ['1', 'L', 'RGB', 'RGBA'])
+@mark.parametrize('fill', ['background', 'white', 0])
+@mark.parametrize('polygon', [
+    [[10, 10], [90, 20], [50, 60], [20, 40]],
+    # exceeding the image
+    [[-10, 30], [80, 5], [130, 70]],
+    # touching the right and bottom edge
+    [[60, 20], [119, 40], [90, 79]],
+    # filled beyond the last row despite the outline
+    [[14, 39], [49, 59], [25, 46], [50, 36]],
+])
+def test_array_from_polygon(mode, fill, polygon):
+    rng = np.random.default_rng(42)
+    img = Image.fromarray(rng.integers(0, 256, (80, 120, 4), dtype=np.uint8), mode='RGBA').convert(mode)
+    for polygon in [np.array(polygon)] + _random_polygons(rng, img.width, img.height):
+        expected = np.array(crop_image(_image_from_polygon_full(img, polygon, fill=fill),
+                                       box=bbox_from_polygon(polygon)))
+        assert np.array_equal(array_from_polygon(img, polygon, fill=fill), expected)
+        assert np.array_equal(array_from_polygon(np.array(img), polygon, fill=fill), expected)
+
+@mark.parametrize('mode', ['1', 'L', 'P', 'RGB', 'RGBA', 'LA'])
+@mark.parametrize('fill', ['background', 'white', 'none'])
+@mark.parametrize('transparency', [False, True])
+def test_image_from_polygon(mode, fill, transparency):
+    rng = np.random.default_rng(42)
+    img = Image.fromarray(rng.integers(0, 256, (80, 120, 4), dtype=np.uint8), mode='RGBA').convert(mode)
+    if fill == 'white' and mode in ['1', 'P']:
+        fill = 1
+    for polygon in _random_polygons(rng, img.width, img.height):
+        expected = _image_from_polygon_full(img, polygon, fill=fill, transparency=transparency)
+        masked = image_from_polygon(img, polygon, fill=fill, transparency=transparency)
+        assert masked.mode == expected.mode
+        assert np.array_equal(np.array(masked), np.array(expected))
+        # cropping first (only within the image) must not change the result
+        # (as long as the last row and column are masked too):
+        bbox = bbox_from_polygon(polygon)
+        if bbox[0] < 0 or bbox[1] < 0 or bbox[2] > img.width or bbox[3] > img.height:
+            continue
+        mask_bbox = (bbox[0], bbox[1], min(bbox[2] + 1, img.width), min(bbox[3] + 1, img.height))
+        cropped = image_from_polygon(decode_region(img, mask_bbox), polygon - np.array(bbox[:2]),
+                                     fill=fill, transparency=transparency)
+        cropped = cropped.crop((0, 0, bbox[2] - bbox[0], bbox[3] - bbox[1]))
+        assert np.array_equal(np.array(cropped), np.array(crop_image(expected, box=bbox)))
+
+def test_polygons_from_points():
+    polygons, lengths = polygons_from_points(['1,2 3,4 5,6', '10,20 30,40 50,60 70,80'])
+    assert polygons.shape == (7, 2)
+    assert list(lengths) == [3, 4]
+    assert polygons[3].tolist() == polygon_from_points('10,20 30,40 50,60 70,80')[0]
+    assert points_from_polygons(np.split(polygons, [3])) == ['1,2 3,4 5,6', '10,20 30,40 50,60 70,80']
+    assert points_from_polygons([]) == []
+    assert coordinates_for_segments([], None, {'transform': np.eye(3)}) == []
+    assert coordinates_of_segments([], None, {'transform': np.eye(3)}) == []
+
+def test_coordinates_of_for_segments():
+    rng = np.random.default_rng(42)
+    glyphs = [GlyphType(id='g%d' % i, Coords=CoordsType(points=points_from_polygon(
+        rng.integers(0, 3000, (rng.integers(3, 8), 2))))) for i in range(100)]
+    transform = shift_coordinates(np.eye(3), np.array([-100, -200]))
+    transform = rotate_coordinates(transform, 3.7, np.array([1000, 1500]))
+    coords = {'transform': transform}
+    polygons = coordinates_of_segments(glyphs, None, coords)
+    assert len(polygons) == len(glyphs)
+    for glyph, polygon in zip(glyphs, polygons):
+        assert np.array_equal(polygon, coordinates_of_segment(glyph, None, coords))
+    points = points_from_polygons(coordinates_for_segments(polygons, None, coords))
+    for polygon, points in zip(polygons, points):
+        assert points == points_from_polygon(coordinates_for_segment(polygon, None, coords))
+
+@mark.parametrize('mode,ext', [('1', 'tif'), ('L', 'tif'), ('RGB', 'tif'), ('RGBA', 'tif'),
+                               ('L', 'bmp'), ('RGB', 'bmp'), ('RGB', 'ppm'), ('L', 'png')])
+def test_decode_region(tmp_path, mode, ext):
+    rng = np.random.default_rng(42)
+    img = Image.fromarray(rng.integers(0, 256, (301, 203, 4), dtype=np.uint8), mode='RGBA').convert(mode)
+    img.save(tmp_path / ('image.' + ext))
+    for box in [(10, 20, 150, 200), (-5, 290, 50, 320), (3, 300, 5, 301)]:
+        lazy = Image.open(tmp_path / ('image.' + ext))
+        assert region_decodable(lazy) == (ext != 'png')
+        region = decode_region(lazy, box)
+        assert region.mode == img.mode
+        assert np.array_equal(np.array(region), np.array(img.crop(box)))
+        if ext != 'png':
+            # original still not decoded
+            assert lazy.tile
+
+@mark.parametrize('fmt,save_kwargs', [
+    ('PNG', {'dpi': (300, 300)}), ('PNG', {}),
+    ('TIFF', {'dpi': (300, 150)}), ('TIFF', {'resolution': 40, 'resolution_unit': 3}),
+    ('TIFF', {'compression': 'tiff_lzw'}),
+    ('JPEG', {'dpi': (72, 96)}), ('JPEG', {'progressive': True}),
+    ('JPEG2000', {'dpi': (300, 300)}),
+])
+def test_image_header_from_file(tmp_path, fmt, save_kwargs):
+    path = tmp_path / ('image.' + fmt.lower())
+    Image.new('RGB', (203, 301)).save(path, format=fmt, **save_kwargs)
+    header = image_header_from_file(path)
+    # consistent with OcrdExif
+    with Image.open(path) as img:
+        exif = OcrdExif(img)
+    assert header == (exif.width, exif.height, exif.xResolution, exif.yResolution, exif.resolutionUnit)
+    assert header.width == 203
+    assert header.height == 301
+
+def test_image_headers_from_files(tmp_path):
+    paths = []
+    for i in range(10):
+        paths.append(tmp_path / ('image%d.png' % i))
+        Image.new('L', (10 + i, 20)).save(paths[-1])
+    paths.append(tmp_path / 'image.bmp')
+    Image.new('L', (10, 20)).save(paths[-1])
+    headers = image_headers_from_files(paths, max_workers=4)
+    assert [header.width for header in headers[:-1]] == list(range(10, 20))
+    # unsupported format
+    assert headers[-1] is None
+
 if __name__ == '__main__':
     main([__file__])
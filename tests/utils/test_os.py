@@ -2,11 +2,16 @@ from tempfile import mkdtemp
 from tests.base import TestCase, main, assets
 from shutil import rmtree
 from pathlib import Path
-from os import environ as ENV, getcwd
+from os import environ as ENV, getcwd, utime
+from importlib import invalidate_caches
+from types import SimpleNamespace
 from os.path import expanduser, join
 import sys
+from unittest import mock
 
+from ocrd_utils.introspect import importlib_metadata
 from ocrd_utils.os import (
+    _dump_ocrd_tool_json,
     list_resource_candidates,
     redirect_stderr_and_stdout_to_file,
     guess_media_type,
@@ -62,5 +67,55 @@ class TestOsUtils(TestCase):
             print('four', file=sys.stderr)
         assert Path(fname).read_text(encoding='utf-8') == 'one\ntwo\nthree\nfour\n'
 
+    def test_dump_ocrd_tool_json_cache(self):
+        cache_dir = Path(self.tempdir_path, 'ocrd', 'ocrd-tool')
+        with mock.patch.dict(ENV, {'XDG_CACHE_HOME': self.tempdir_path}):
+            ocrd_tool = _dump_ocrd_tool_json('ocrd-dummy')
+            assert ocrd_tool['executable'] == 'ocrd-dummy'
+            assert len(list(cache_dir.glob('*.json'))) == 1
+            # reused without running the executable
+            with mock.patch('ocrd_utils.os.run', side_effect=AssertionError):
+                assert _dump_ocrd_tool_json('ocrd-dummy') == ocrd_tool
+            # but not after an upgrade of its distribution
+            dist = next(dist for dist in importlib_metadata.distributions() if dist.metadata['Name'] == 'ocrd')
+            upgraded = mock.Mock(entry_points=dist.entry_points, metadata=dist.metadata, version='999.0.0')
+            with mock.patch.object(importlib_metadata, 'distributions', return_value=[upgraded]):
+                assert _dump_ocrd_tool_json('ocrd-dummy') == ocrd_tool
+            assert len(list(cache_dir.glob('*.json'))) == 2
+            # and not at all if disabled
+            rmtree(cache_dir)
+            with mock.patch.dict(ENV, {'OCRD_TOOL_JSON_CACHE': 'false'}):
+                assert _dump_ocrd_tool_json('ocrd-dummy') == ocrd_tool
+            assert not cache_dir.exists()
+
+    def test_dump_ocrd_tool_json_cache_editable(self):
+        # editable install: ocrd-tool.json in a subdirectory of the entry point's package
+        package_dir = Path(self.tempdir_path, 'src', 'ocrd_editable')
+        Path(package_dir, 'data').mkdir(parents=True)
+        Path(package_dir, '__init__.py').write_text('')
+        Path(package_dir, 'cli.py').write_text('')
+        tool_json = Path(package_dir, 'data', 'ocrd-tool.json')
+        tool_json.write_text('{"executable": "ocrd-editable"}')
+        script = Path(self.tempdir_path, 'ocrd-editable')
+        script.write_text('')
+        entry_point = SimpleNamespace(group='console_scripts', name='ocrd-editable', value='ocrd_editable.cli:cli')
+        dist = SimpleNamespace(entry_points=[entry_point], metadata={'Name': 'ocrd_editable'}, version='1.0')
+        def dump_json(*args, **kwargs):
+            return SimpleNamespace(stdout=tool_json.read_text())
+        with mock.patch.dict(ENV, {'XDG_CACHE_HOME': self.tempdir_path}), \
+             mock.patch.object(sys, 'path', [str(package_dir.parent)] + sys.path), \
+             mock.patch.object(importlib_metadata, 'distributions', return_value=[dist]), \
+             mock.patch('ocrd_utils.os.which', return_value=str(script)), \
+             mock.patch('ocrd_utils.os.run', side_effect=dump_json) as run:
+            invalidate_caches()
+            assert _dump_ocrd_tool_json('ocrd-editable') == {'executable': 'ocrd-editable'}
+            assert _dump_ocrd_tool_json('ocrd-editable') == {'executable': 'ocrd-editable'}
+            assert run.call_count == 1
+            # editing ocrd-tool.json invalidates the cache
+            tool_json.write_text('{"executable": "ocrd-editable", "version": "1.1"}')
+            utime(tool_json, ns=(0, 0))
+            assert _dump_ocrd_tool_json('ocrd-editable')['version'] == '1.1'
+            assert run.call_count == 2
+
 if __name__ == '__main__':
     main(__file__)
@@ -1,5 +1,5 @@
 from tests.base import TestCase, main
-from ocrd_validators import ParameterValidator
+from ocrd_validators import ParameterValidator, get_parameter_validator
 
 class TestParameterValidator(TestCase):
 
@@ -66,6 +66,26 @@ def test_min_max():
     assert not report.is_valid
     assert 'is less than or equal to the minimum of' in report.errors[0]
 
+def test_required_not_mutated():
+    ocrd_tool = {"parameters": {"foo": {"type": "string", "required": True}}}
+    for _ in range(2):
+        report = ParameterValidator(ocrd_tool).validate({})
+        assert not report.is_valid
+        assert "'foo' is a required property" in report.errors[0]
+    assert ocrd_tool["parameters"]["foo"]["required"]
+
+def test_get_parameter_validator():
+    ocrd_tool = {"parameters": {"foo": {"type": "string", "default": "bar"}}}
+    validator = get_parameter_validator(ocrd_tool)
+    assert get_parameter_validator(dict(ocrd_tool)) is validator
+    assert get_parameter_validator({"parameters": {}}) is not validator
+    obj = {}
+    assert validator.validate(obj).is_valid
+    assert obj == {"foo": "bar"}
+    # the cache is bounded
+    for i in range(100):
+        get_parameter_validator({"parameters": {"foo%d" % i: {"type": "string"}}})
+    assert get_parameter_validator(ocrd_tool) is not validator
 
 
 if __name__ == '__main__':